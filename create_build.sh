@@ -21,6 +21,7 @@ mkdir -p "${RELEASE_DIR}"
 # Copy main application
 echo "📄 Copying main application..."
 cp src/devscan_pro.py "${BUILD_DIR}/${PACKAGE_NAME}/"
+cp src/devscan_service.py "${BUILD_DIR}/${PACKAGE_NAME}/"
 
 # Copy existing documentation
 echo "📝 Copying documentation..."
@@ -86,7 +87,7 @@ cat > "${BUILD_DIR}/${PACKAGE_NAME}/QUICK_START.md" << 'QSEOF'
 
 ## System Requirements
 - Ubuntu 18.04+ or compatible Linux
-- Python 3.6+
+- Python 3.8+
 - Tkinter
 
 ## Support
@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import time
+_IMPORTS_STARTED = time.perf_counter()
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 import subprocess
@@ -10,39 +12,473 @@ import platform
 import json
 import shutil
 import hashlib
-import requests
 import uuid
+import random
+import math
+import mmap
+import re
+import argparse
+import shlex
+import select
+import signal
+import heapq
+import tempfile
+import zlib
+import struct
+import lzma
+import contextlib
+import atexit
+import logging
+import base64
+import hmac
+import fcntl
+import resource
+import functools
+import itertools
+import csv
+import queue
+import textwrap
+from html import escape as html_escape
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
+_IMPORTS_FINISHED = time.perf_counter()
 
-class LicenseValidator:
+APP_NAME = "DevScan Pro"
+APP_VERSION = "1.0.0"
+
+# Per-user state (probe cache, scan history)
+APP_DATA_DIR = Path.home() / ".devscan_pro"
+
+logger = logging.getLogger("devscan_pro")
+
+# Ubuntu-specific tools list: (command, name, category, check_type)
+TOOL_CATALOG = [
+    # System Information
+    ("lsb_release -a", "Ubuntu Version", "System", "version"),
+    ("uname -r", "Kernel Version", "System", "version"),
+
+    # Programming Languages
+    ("python3 --version", "Python 3", "Programming", "version"),
+    ("python --version", "Python", "Programming", "version"),
+    ("node --version", "Node.js", "Programming", "version"),
+    ("npm --version", "npm", "Programming", "version"),
+    ("npx --version", "npx", "Programming", "version"),
+    ("java -version 2>&1", "Java", "Programming", "version"),
+    ("php --version", "PHP", "Programming", "version"),
+    ("go version", "Go", "Programming", "version"),
+    ("ruby --version", "Ruby", "Programming", "version"),
+    ("perl --version", "Perl", "Programming", "version"),
+    ("rustc --version", "Rust", "Programming", "version"),
+
+    # Build Tools
+    ("git --version", "Git", "Build Tools", "version"),
+    ("make --version", "GNU Make", "Build Tools", "version"),
+    ("gcc --version", "GCC", "Build Tools", "version"),
+    ("g++ --version", "G++", "Build Tools", "version"),
+    ("cmake --version", "CMake", "Build Tools", "version"),
+    ("pip --version", "pip", "Build Tools", "version"),
+    ("pip3 --version", "pip3", "Build Tools", "version"),
+
+    # Containers & Virtualization
+    ("docker --version", "Docker", "Containers", "version"),
+    ("docker-compose --version", "Docker Compose", "Containers", "version"),
+    ("podman --version", "Podman", "Containers", "version"),
+    ("kubectl version --client", "Kubernetes CLI", "Containers", "version"),
+    ("vagrant --version", "Vagrant", "Containers", "version"),
+
+    # Editors & IDEs
+    ("code --version", "VS Code", "Editors", "version"),
+    ("vim --version", "Vim", "Editors", "version"),
+    ("nano --version", "Nano", "Editors", "version"),
+    ("emacs --version", "Emacs", "Editors", "version"),
+
+    # Databases
+    ("psql --version", "PostgreSQL", "Databases", "version"),
+    ("mysql --version", "MySQL", "Databases", "version"),
+    ("sqlite3 --version", "SQLite", "Databases", "version"),
+    ("mongod --version", "MongoDB", "Databases", "version"),
+
+    # System Tools
+    ("curl --version", "cURL", "System", "version"),
+    ("wget --version", "Wget", "System", "version"),
+    ("ssh -V", "SSH", "System", "version"),
+    ("rsync --version", "rsync", "System", "version"),
+    ("tar --version", "tar", "System", "version"),
+
+    # Package Managers
+    ("apt --version", "APT", "System", "version"),
+    ("snap --version", "Snap", "System", "version"),
+    ("flatpak --version", "Flatpak", "System", "version"),
+
+    # Networking
+    ("netstat --version", "netstat", "Networking", "version"),
+    ("ip --version", "iproute2", "Networking", "version"),
+    ("nmap --version", "Nmap", "Networking", "version"),
+
+    # Development Tools
+    ("gitk --version", "Gitk", "Build Tools", "version"),
+    ("git-gui --version", "Git GUI", "Build Tools", "version"),
+    ("meld --version", "Meld", "Editors", "version"),
+]
+
+# Tool to package mappings
+TOOL_PACKAGES = {
+    # Programming Languages
+    "Python 3": {"package": "python3", "manager": "apt"},
+    "Python": {"package": "python", "manager": "apt"},
+    "Node.js": {"package": "nodejs", "manager": "apt"},
+    "npm": {"package": "npm", "manager": "apt"},
+    "npx": {"package": "npm", "manager": "apt"},  # Comes with npm
+    "Java": {"package": "default-jdk", "manager": "apt"},
+    "PHP": {"package": "php", "manager": "apt"},
+    "Go": {"package": "golang", "manager": "apt"},
+    "Ruby": {"package": "ruby", "manager": "apt"},
+    "Perl": {"package": "perl", "manager": "apt"},
+    "Rust": {"package": "rustc", "manager": "apt"},
+
+    # Build Tools
+    "Git": {"package": "git", "manager": "apt"},
+    "GNU Make": {"package": "make", "manager": "apt"},
+    "GCC": {"package": "gcc", "manager": "apt"},
+    "G++": {"package": "g++", "manager": "apt"},
+    "CMake": {"package": "cmake", "manager": "apt"},
+    "pip": {"package": "python3-pip", "manager": "apt"},
+    "pip3": {"package": "python3-pip", "manager": "apt"},
+
+    # Containers & Virtualization
+    "Docker": {"package": "docker.io", "manager": "apt"},
+    "Docker Compose": {"package": "docker-compose", "manager": "apt"},
+    "Podman": {"package": "podman", "manager": "apt"},
+    "Kubernetes CLI": {"package": "kubectl", "manager": "snap"},
+    "Vagrant": {"package": "vagrant", "manager": "apt"},
+
+    # Editors & IDEs
+    "VS Code": {"package": "code", "manager": "snap"},
+    "Vim": {"package": "vim", "manager": "apt"},
+    "Nano": {"package": "nano", "manager": "apt"},
+    "Emacs": {"package": "emacs", "manager": "apt"},
+
+    # Databases
+    "PostgreSQL": {"package": "postgresql", "manager": "apt"},
+    "MySQL": {"package": "mysql-server", "manager": "apt"},
+    "SQLite": {"package": "sqlite3", "manager": "apt"},
+    "MongoDB": {"package": "mongodb", "manager": "apt"},
+
+    # System Tools
+    "cURL": {"package": "curl", "manager": "apt"},
+    "Wget": {"package": "wget", "manager": "apt"},
+    "rsync": {"package": "rsync", "manager": "apt"},
+    "tar": {"package": "tar", "manager": "apt"},
+
+    # Package Managers
+    "APT": {"package": "apt", "manager": "apt"},
+    "Snap": {"package": "snapd", "manager": "apt"},
+    "Flatpak": {"package": "flatpak", "manager": "apt"},
+
+    # Networking
+    "netstat": {"package": "net-tools", "manager": "apt"},
+    "iproute2": {"package": "iproute2", "manager": "apt"},
+    "Nmap": {"package": "nmap", "manager": "apt"},
+
+    # Development Tools
+    "Gitk": {"package": "git", "manager": "apt"},  # Comes with git
+    "Git GUI": {"package": "git", "manager": "apt"},  # Comes with git
+    "Meld": {"package": "meld", "manager": "apt"},
+}
+
+class Tracer:
+    """Collects spans as Chrome trace events (open the file in chrome://tracing or Perfetto)
+
+    Disabled by default; span() then returns a shared no-op context manager.
+    """
     def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.threads = {}
+        self.pid = os.getpid()
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def _span(self, name, category, args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            thread = threading.current_thread()
+            self.threads[thread.ident] = thread.name
+            # list.append is atomic, spans may end on any thread
+            self.events.append({
+                "name": name, "cat": category, "ph": "X", "pid": self.pid, "tid": thread.ident,
+                "ts": round((start - self._origin) * 1e6, 1), "dur": round((end - start) * 1e6, 1),
+                "args": args
+            })
+
+    def span(self, name, category="app", **args):
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(name, category, args)
+
+    def save(self, filename):
+        metadata = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                    for tid, name in self.threads.items()]
+        with open(filename, 'w') as f:
+            json.dump({"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}, f)
+
+_NO_SPAN = contextlib.nullcontext()
+TRACER = Tracer()
+
+def traced(name, category, describe=None):
+    """Decorator wrapping a function in a TRACER span; describe(*args, **kwargs) supplies span args"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with TRACER.span(name, category, **(describe(*args, **kwargs) if describe else {})):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class StateStore:
+    """Small JSON state file that several processes can share safely
+
+    Values are kept in memory and written back in batches: changes within
+    flush_delay seconds share one write. Each write takes an exclusive flock,
+    re-reads the file so keys changed by other processes survive, applies
+    this process' changed keys and pending increments, fsyncs a temp file and
+    renames it over the old one.
+    """
+    def __init__(self, path, flush_delay=1.0, lock_path=None):
+        self.path = Path(path)
+        self.lock_path = Path(lock_path) if lock_path else self.path.with_name(self.path.name + '.lock')
+        self.flush_delay = flush_delay
+        self.data = {}
+        self._dirty = set()
+        self._deltas = {}
+        self._lock = threading.RLock()
+        self._timer = None
+        self.load()
+        atexit.register(self.close)
+
+    @contextlib.contextmanager
+    def _file_lock(self, mode):
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def load(self):
+        """Re-read the file, keeping changes that have not been flushed yet"""
+        with self._lock:
+            with self._file_lock(fcntl.LOCK_SH):
+                data = self._read()
+            self._apply_pending(data)
+            self.data = data
+        return bool(data)
+
+    def _apply_pending(self, data):
+        for key in self._dirty:
+            data[key] = self.data[key]
+        for key, delta in self._deltas.items():
+            data[key] = data.get(key, 0) + delta
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self.data.get(key, default)
+
+    def update(self, values):
+        with self._lock:
+            changed = [key for key, value in values.items() if self.data.get(key) != value]
+            for key in changed:
+                self.data[key] = values[key]
+                self._dirty.add(key)
+                self._deltas.pop(key, None)
+            if changed:
+                self._schedule_flush()
+
+    def increment(self, key, amount=1):
+        """Add to a counter; concurrent increments from other processes are not lost"""
+        with self._lock:
+            self.data[key] = self.data.get(key, 0) + amount
+            if key not in self._dirty:
+                self._deltas[key] = self._deltas.get(key, 0) + amount
+            self._schedule_flush()
+            return self.data[key]
+
+    def _schedule_flush(self):
+        if self.flush_delay <= 0:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write pending changes to disk now"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty and not self._deltas:
+                return
+            try:
+                with self._file_lock(fcntl.LOCK_EX):
+                    data = self._read()
+                    self._apply_pending(data)
+                    tmp_file = self.path.with_name(self.path.name + f'.{os.getpid()}.tmp')
+                    with open(tmp_file, 'w') as f:
+                        json.dump(data, f, indent=2)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_file, self.path)
+                    dir_fd = os.open(self.path.parent, os.O_RDONLY)
+                    try:
+                        os.fsync(dir_fd)
+                    finally:
+                        os.close(dir_fd)
+            except OSError as e:
+                logger.warning("Could not save %s: %s", self.path, e)
+                return
+            self.data = data
+            self._dirty.clear()
+            self._deltas.clear()
+
+    def clear(self):
+        """Forget all values and remove the file"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self.data = {}
+            self._dirty.clear()
+            self._deltas.clear()
+            try:
+                with self._file_lock(fcntl.LOCK_EX):
+                    if self.path.exists():
+                        self.path.unlink()
+            except OSError as e:
+                logger.warning("Could not remove %s: %s", self.path, e)
+
+    def close(self):
+        """Flush and drop the exit hook, so closed stores do not pile up in atexit"""
+        self.flush()
+        atexit.unregister(self.close)
+
+# RSA public key of the license server, offline tokens must be signed with its private key.
+# Set to the PEM "PUBLIC KEY" of the key pair that signs the tokens; None disables offline
+# tokens and background revalidation, and every activation is checked online.
+LICENSE_PUBLIC_KEY_PEM = None
+
+# DER DigestInfo prefix for SHA-256 (RFC 8017, section 9.2)
+_SHA256_DIGEST_INFO = bytes.fromhex("3031300d060960864801650304020105000420")
+
+def rsa_verify_sha256(message, signature, public_key):
+    """Verify an RSASSA-PKCS1-v1_5 SHA-256 signature with an (n, e) public key"""
+    n, e = public_key
+    size = (n.bit_length() + 7) // 8
+    if len(signature) != size:
+        return False
+    value = int.from_bytes(signature, 'big')
+    if value >= n:
+        return False
+    encoded = pow(value, e, n).to_bytes(size, 'big')
+    digest_info = _SHA256_DIGEST_INFO + hashlib.sha256(message).digest()
+    expected = b"\x00\x01" + b"\xff" * (size - len(digest_info) - 3) + b"\x00" + digest_info
+    return hmac.compare_digest(encoded, expected)
+
+def _der_read(data, offset, expected_tag):
+    """Read one DER element with the given tag, return (contents, offset after it)"""
+    if data[offset] != expected_tag:
+        raise ValueError(f"expected DER tag {expected_tag:#x}, got {data[offset]:#x}")
+    length = data[offset + 1]
+    offset += 2
+    if length & 0x80:
+        size = length & 0x7f
+        length = int.from_bytes(data[offset:offset + size], 'big')
+        offset += size
+    if offset + length > len(data):
+        raise ValueError("truncated DER element")
+    return data[offset:offset + length], offset + length
+
+def parse_rsa_public_key(pem):
+    """(n, e) from a PEM "PUBLIC KEY" (SubjectPublicKeyInfo) or "RSA PUBLIC KEY" (PKCS#1)"""
+    lines = [line.strip() for line in pem.strip().splitlines()]
+    if len(lines) < 3 or not lines[0].startswith("-----BEGIN ") or not lines[-1].startswith("-----END "):
+        raise ValueError("not a PEM public key")
+    der = base64.b64decode("".join(lines[1:-1]))
+    if "RSA PUBLIC KEY" not in lines[0]:
+        spki, _ = _der_read(der, 0, 0x30)
+        _, offset = _der_read(spki, 0, 0x30)  # AlgorithmIdentifier
+        bits, _ = _der_read(spki, offset, 0x03)
+        der = bits[1:]  # skip the unused-bits byte
+    sequence, _ = _der_read(der, 0, 0x30)
+    n, offset = _der_read(sequence, 0, 0x02)
+    e, _ = _der_read(sequence, offset, 0x02)
+    return int.from_bytes(n, 'big'), int.from_bytes(e, 'big')
+
+# (n, e) of LICENSE_PUBLIC_KEY_PEM
+LICENSE_PUBLIC_KEY = parse_rsa_public_key(LICENSE_PUBLIC_KEY_PEM) if LICENSE_PUBLIC_KEY_PEM else None
+
+def parse_token_time(value):
+    """Aware UTC datetime from an ISO 8601 token timestamp, naive times are taken as UTC"""
+    moment = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=datetime.timezone.utc)
+    return moment.astimezone(datetime.timezone.utc)
+
+def _b64url_decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+def license_key_digest(license_key):
+    return hashlib.sha256(license_key.strip().upper().encode('utf-8')).hexdigest()
+
+class LicenseValidator:
+    def __init__(self, public_key=None, max_offline_days=30, revalidate_interval=24 * 3600):
         # CHANGE TO YOUR SERVER
         self.validation_url = "https://clearwatercodes.com/license_manager/api/validate"
         self.activation_url = "https://clearwatercodes.com/license_manager/api/validate"  # Same endpoint
         self.app_name = "DevScan_Pro"
         self.license_file = Path.home() / ".devscan_pro_license.json"
+        # Written only on activation, so flushed immediately
+        self.store = StateStore(self.license_file, flush_delay=0, lock_path=APP_DATA_DIR / "license.lock")
+        # Signed tokens from the server let activation skip the network for max_offline_days;
+        # while licensed, the server is asked again every revalidate_interval in the background
+        self.public_key = public_key if public_key is not None else LICENSE_PUBLIC_KEY
+        self.max_offline_days = max_offline_days
+        self.revalidate_interval = revalidate_interval
+        self._revalidation_timer = None
+        # Called (from the revalidation thread) when the server reports the license revoked
+        self.on_revoked = None
                            
+    @traced("license validate", "license")
     def validate_license(self, license_key):
         """Validate license against your server"""
+        token = self.verify_cached_token(license_key)
+        if token:
+            self.start_background_revalidation(license_key)
+            return True, "✅ License valid (verified offline)", token.get('customer', '')
         try:
-            # Add system fingerprint to prevent key sharing
-            system_fingerprint = self.get_system_fingerprint()
-            
-            response = requests.post(
-                self.validation_url,
-                json={
-                    "key": license_key,
-                    "app_name": self.app_name,
-                    "system_id": system_fingerprint  # Add fingerprint
-                },
-                timeout=10
-            )
+            response = self._request_validation(license_key)
             
             if response.status_code == 200:
                 result = response.json()
                 if result['valid']:
                     # Save successful validation
                     self._save_license_info(license_key, result)
+                    self.start_background_revalidation(license_key)
                     return True, "✅ License activated! Premium features unlocked.", result.get('customer', '')
                 else:
                     return False, f"❌ {result.get('message', 'Invalid license')}", None
@@ -56,6 +492,96 @@ class LicenseValidator:
                 return True, offline_msg, "Offline User"
             return False, f"❌ Connection failed: {str(e)}", None
     
+    def _request_validation(self, license_key):
+        # Only needed when contacting the server, keep it off the startup path
+        import requests
+
+        # Add system fingerprint to prevent key sharing
+        system_fingerprint = self.get_system_fingerprint()
+        
+        return requests.post(
+            self.validation_url,
+            json={
+                "key": license_key,
+                "app_name": self.app_name,
+                "system_id": system_fingerprint  # Add fingerprint
+            },
+            timeout=10
+        )
+    
+    def verify_token(self, token, license_key):
+        """Return the payload of a server-signed token for this key and machine, or None
+
+        Tokens are base64url(payload JSON) + "." + base64url(RSA SHA-256 signature of the
+        first part). The payload carries the key digest, system_id, customer, issued and expires
+        (ISO 8601, compared in UTC).
+        """
+        if not self.public_key or not token:
+            return None
+        try:
+            payload_part, signature_part = token.split('.')
+            if not rsa_verify_sha256(payload_part.encode('ascii'), _b64url_decode(signature_part),
+                                     self.public_key):
+                return None
+            payload = json.loads(_b64url_decode(payload_part))
+            if payload.get('key') != license_key_digest(license_key):
+                return None
+            if payload.get('system_id') != self.get_system_fingerprint():
+                return None
+            now = datetime.datetime.now(datetime.timezone.utc)
+            issued = parse_token_time(payload['issued'])
+            if now - issued > datetime.timedelta(days=self.max_offline_days):
+                return None
+            if payload.get('expires') and now > parse_token_time(payload['expires']):
+                return None
+            return payload
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return None
+    
+    def verify_cached_token(self, license_key):
+        info = self.get_license_info()
+        return self.verify_token(info.get('token'), license_key) if info else None
+    
+    def start_background_revalidation(self, license_key):
+        """Re-check the license with the server once revalidate_interval has passed since the last check"""
+        if self._revalidation_timer is not None or not self.public_key:
+            return
+        delay = 0
+        try:
+            last_valid = datetime.datetime.fromisoformat(self.get_license_info()['last_validation'])
+            elapsed = (datetime.datetime.now() - last_valid).total_seconds()
+            delay = max(0, self.revalidate_interval - elapsed)
+        except (TypeError, KeyError, ValueError):
+            pass
+        self._revalidation_timer = threading.Timer(delay, self._revalidate, args=(license_key,))
+        self._revalidation_timer.daemon = True
+        self._revalidation_timer.start()
+    
+    def stop_background_revalidation(self):
+        if self._revalidation_timer is not None:
+            self._revalidation_timer.cancel()
+            self._revalidation_timer = None
+    
+    @traced("license revalidate", "license")
+    def _revalidate(self, license_key):
+        self._revalidation_timer = None
+        try:
+            response = self._request_validation(license_key)
+            if response.status_code == 200:
+                result = response.json()
+                if result['valid']:
+                    self._save_license_info(license_key, result)
+                else:
+                    # Revoked: drop the cached token so it is not accepted offline any more
+                    self.store.clear()
+                    if self.on_revoked:
+                        self.on_revoked()
+                    return
+        except Exception:
+            # Offline: the cached token stays valid until it ages out
+            pass
+        self.start_background_revalidation(license_key)
+    
     def _save_license_info(self, license_key, validation_result):
         """Save license info for offline validation"""
         license_data = {
@@ -63,20 +589,19 @@ class LicenseValidator:
             'last_validation': datetime.datetime.now().isoformat(),
             'customer': validation_result.get('customer', ''),
             'expires': validation_result.get('expires', ''),
+            'token': validation_result.get('token', ''),
             'app_name': self.app_name
         }
         
-        with open(self.license_file, 'w') as f:
-            json.dump(license_data, f, indent=2)
+        self.store.update(license_data)
     
     def _check_offline_validation(self, license_key, grace_hours=24):
         """Check if license was recently validated offline"""
         try:
-            if not self.license_file.exists():
+            if not self.store.load():
                 return False, "No offline license found"
             
-            with open(self.license_file, 'r') as f:
-                license_data = json.load(f)
+            license_data = self.store.data
             
             # Check if it's the same license key
             if license_data.get('license_key') != license_key:
@@ -97,9 +622,8 @@ class LicenseValidator:
     def get_license_info(self):
         """Get stored license information"""
         try:
-            if self.license_file.exists():
-                with open(self.license_file, 'r') as f:
-                    return json.load(f)
+            if self.store.load():
+                return dict(self.store.data)
         except:
             return None
     
@@ -107,7 +631,7 @@ class LicenseValidator:
         """Remove license file (for testing)"""
         try:
             if self.license_file.exists():
-                self.license_file.unlink()
+                self.store.clear()
                 return True
         except:
             return False
@@ -132,111 +656,2819 @@ class LicenseValidator:
             # Final fallback - less secure but better than nothing
             return hashlib.md5(str(uuid.getnode()).encode()).hexdigest()
 
+def write_installation_script(filename, missing_tools, tool_packages=None):
+    """Generate bash installation script"""
+    if tool_packages is None:
+        tool_packages = TOOL_PACKAGES
+    with open(filename, 'w') as f:
+        f.write("#!/bin/bash\n")
+        f.write(f"# DevScan Pro - Installation Script\n")
+        f.write(f"# Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"# Tools to install: {len(missing_tools)}\n")
+        f.write("#\n")
+        f.write("# WARNING: This script will install software on your system.\n")
+        f.write("# Review the commands below before running.\n")
+        f.write("# Run with: bash " + os.path.basename(filename) + "\n")
+        f.write("\n")
+        f.write("set -e  # Exit on any error\n")
+        f.write("\n")
+        f.write('echo "🔧 DevScan Pro - Automated Tool Installation"\n')
+        f.write('echo "==========================================="\n')
+        f.write('echo ""\n')
+        f.write("\n")
+        
+        # Group tools by package manager
+        tools_by_manager = {}
+        for tool_name in missing_tools:
+            if tool_name in tool_packages:
+                package_info = tool_packages[tool_name]
+                manager = package_info["manager"]
+                package = package_info["package"]
+                
+                if manager not in tools_by_manager:
+                    tools_by_manager[manager] = []
+                tools_by_manager[manager].append((tool_name, package))
+        
+        # Update package lists first
+        f.write('# Update package lists\n')
+        f.write('echo "Updating package lists..."\n')
+        f.write('sudo apt update\n')
+        f.write('echo ""\n')
+        f.write("\n")
+        
+        # Install tools by package manager
+        for manager, tools in tools_by_manager.items():
+            if manager == "apt":
+                f.write(f'# Install APT packages\n')
+                f.write(f'echo "Installing APT packages..."\n')
+                packages = " ".join([pkg for _, pkg in tools])
+                f.write(f'sudo apt install -y {packages}\n')
+                f.write('echo ""\n')
+                f.write("\n")
+                
+            elif manager == "snap":
+                f.write(f'# Install Snap packages\n')
+                f.write(f'echo "Installing Snap packages..."\n')
+                for tool_name, package in tools:
+                    f.write(f'sudo snap install {package}\n')
+                f.write('echo ""\n')
+                f.write("\n")
+                
+            elif manager in ["pip", "pip3"]:
+                f.write(f'# Install Python packages via {manager}\n')
+                f.write(f'echo "Installing Python packages..."\n')
+                for tool_name, package in tools:
+                    f.write(f'{manager} install {package}\n')
+                f.write('echo ""\n')
+                f.write("\n")
+        
+        # Special cases and post-installation steps
+        f.write('# Special installation steps\n')
+        f.write('echo "Running special installation steps..."\n')
+        f.write("\n")
+        
+        # Node.js special handling (often needs setup)
+        if "Node.js" in missing_tools:
+            f.write('# Install Node.js (alternative method if needed)\n')
+            f.write('if ! command -v node &> /dev/null; then\n')
+            f.write('    echo "Installing Node.js via NodeSource..."\n')
+            f.write('    curl -fsSL https://deb.nodesource.com/setup_lts.x | sudo -E bash -\n')
+            f.write('    sudo apt-get install -y nodejs\n')
+            f.write('fi\n')
+            f.write("\n")
+        
+        # Docker special handling
+        if "Docker" in missing_tools:
+            f.write('# Install Docker (official method)\n')
+            f.write('if ! command -v docker &> /dev/null; then\n')
+            f.write('    echo "Installing Docker..."\n')
+            f.write('    # Add Docker\'s official GPG key\n')
+            f.write('    sudo apt-get install -y ca-certificates curl\n')
+            f.write('    sudo install -m 0755 -d /etc/apt/keyrings\n')
+            f.write('    sudo curl -fsSL https://download.docker.com/linux/ubuntu/gpg -o /etc/apt/keyrings/docker.asc\n')
+            f.write('    sudo chmod a+r /etc/apt/keyrings/docker.asc\n')
+            f.write('    \n')
+            f.write('    # Add the repository to Apt sources\n')
+            f.write('    echo "deb [arch=$(dpkg --print-architecture) signed-by=/etc/apt/keyrings/docker.asc] https://download.docker.com/linux/ubuntu $(. /etc/os-release && echo "$VERSION_CODENAME") stable" | \\\n')
+            f.write('    sudo tee /etc/apt/sources.list.d/docker.list > /dev/null\n')
+            f.write('    sudo apt-get update\n')
+            f.write('    sudo apt-get install -y docker-ce docker-ce-cli containerd.io docker-buildx-plugin docker-compose-plugin\n')
+            f.write('fi\n')
+            f.write("\n")
+        
+        f.write('echo ""\n')
+        f.write('echo "✅ Installation completed!"\n')
+        f.write('echo "Run \\\"devscan_pro.py\\\" to verify all installations."\n')
+        
+    # Make the script executable
+    os.chmod(filename, 0o755)
+
+def read_load_average():
+    """Read the 1-minute load average, or None if unavailable"""
+    try:
+        with open('/proc/loadavg', 'r') as f:
+            return float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+def detect_system_version():
+    """Get Ubuntu version information"""
+    try:
+        result = subprocess.run(['lsb_release', '-d'], capture_output=True, text=True)
+        if result.returncode == 0:
+            return result.stdout.split(':')[1].strip()
+    except:
+        pass
+    return platform.version()
+
+def report_header(app_name, version, vendor, system_version, license_info=None, export_type=None):
+    """Everything in a JSON report before the tools list"""
+    report = {
+        "app": app_name,
+        "version": version,
+        "vendor": vendor,
+        "generated": datetime.datetime.now().isoformat(),
+        "system": {
+            "ubuntu": system_version,
+            "hostname": platform.node(),
+            "architecture": platform.machine(),
+            "python_version": platform.python_version()
+        },
+    }
+    if export_type is not None:
+        report["export_type"] = export_type
+    if license_info is not None:
+        report["license"] = license_info
+    return report
+
+def report_summary(total, installed_count):
+    return {
+        "total": total,
+        "installed": installed_count,
+        "missing": total - installed_count,
+        "installation_rate": round((installed_count/total)*100, 1) if total else 0
+    }
+
+def tool_record(name, tool_version, status, category):
+    return {
+        "name": name,
+        "version": str(tool_version),
+        "status": status,
+        "category": category
+    }
+
+def build_json_report(results, app_name, version, vendor, system_version, license_info=None, export_type=None):
+    """Build the JSON report structure shared by the GUI and headless exports"""
+    report = report_header(app_name, version, vendor, system_version, license_info, export_type)
+    report["tools"] = [tool_record(*result) for result in results]
+    installed_count = sum(1 for _, _, status, _ in results if status == "installed")
+    report["summary"] = report_summary(len(results), installed_count)
+    return report
+
+def diff_results(old_results, new_results):
+    """Compare two result lists by tool name"""
+    old = {name: (version, status, category) for name, version, status, category in old_results}
+    new = {name: (version, status, category) for name, version, status, category in new_results}
+    diff = {"added": [], "removed": [], "changed": []}
+    for name, (version, status, category) in new.items():
+        if name not in old:
+            diff["added"].append({"name": name, "version": version, "status": status, "category": category})
+        elif old[name][:2] != (version, status):
+            diff["changed"].append({
+                "name": name,
+                "category": category,
+                "old_version": old[name][0],
+                "new_version": version,
+                "old_status": old[name][1],
+                "new_status": status
+            })
+    for name, (version, status, category) in old.items():
+        if name not in new:
+            diff["removed"].append({"name": name, "version": version, "status": status, "category": category})
+    return diff
+
+# EXPORT PIPELINE
+class ReportSink:
+    """One output format of the export pipeline
+
+    open() is called first, then write() for every result tuple in order,
+    then close() with the report summary. Each sink runs in its own thread.
+    A sink that has nothing to write sets skipped instead of creating its file.
+    """
+    extension = None
+
+    def __init__(self, filename, context):
+        self.filename = filename
+        self.context = context
+        self.file = None
+        self.skipped = False
+
+    def open(self):
+        self.file = open(self.filename, 'w')
+
+    def write(self, result):
+        pass
+
+    def close(self, summary):
+        if self.file:
+            self.file.close()
+
+class TextReportSink(ReportSink):
+    extension = "txt"
+
+    def open(self):
+        super().open()
+        self.categories = {}
+
+    def write(self, result):
+        name, version, status, category = result
+        status_icon = "✅" if status == "installed" else "❌"
+        self.categories.setdefault(category, []).append(f"{status_icon} {name}: {version}\n")
+
+    def close(self, summary):
+        f, context = self.file, self.context
+        f.write(f"{context['app_name']} - {context.get('title', 'Development Tools Report')}\n")
+        f.write("=" * 60 + "\n")
+        f.write(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"System: {context['system_version']}\n")
+        f.write(f"Architecture: {platform.machine()}\n")
+        if context.get('license_status'):
+            f.write(f"License: {context['license_status']}\n")
+        f.write("=" * 60 + "\n\n")
+        for category, lines in self.categories.items():
+            f.write(f"\n{category.upper()}:\n")
+            f.write("-" * 40 + "\n")
+            f.writelines(lines)
+        f.write(f"\n\nSUMMARY:\n")
+        f.write("-" * 40 + "\n")
+        f.write(f"Total tools checked: {summary['total']}\n")
+        f.write(f"Installed: {summary['installed']}\n")
+        f.write(f"Missing: {summary['missing']}\n")
+        if summary['total']:
+            f.write(f"Installation rate: {summary['installation_rate']:.1f}%\n")
+        super().close(summary)
+
+class JsonReportSink(ReportSink):
+    """Streams the same document json.dump(build_json_report(...), indent=2) would produce"""
+    extension = "json"
+
+    def open(self):
+        super().open()
+        context = self.context
+        header = report_header(context['app_name'], context['version'], context['vendor'],
+                               context['system_version'], context.get('license_info'), context.get('export_type'))
+        self.file.write(json.dumps(header, indent=2)[:-2] + ',\n  "tools": [')
+        self.first = True
+
+    def write(self, result):
+        self.file.write(("\n" if self.first else ",\n") + textwrap.indent(json.dumps(tool_record(*result), indent=2), "    "))
+        self.first = False
+
+    def close(self, summary):
+        summary_json = textwrap.indent(json.dumps(summary, indent=2), "  ").lstrip()
+        self.file.write(("]" if self.first else "\n  ]") + f',\n  "summary": {summary_json}\n}}')
+        super().close(summary)
+
+class NdjsonReportSink(ReportSink):
+    """Appends the report as one compact line, like --headless --output report.ndjson"""
+    extension = "ndjson"
+
+    def open(self):
+        self.file = open(self.filename, 'a')
+        context = self.context
+        header = report_header(context['app_name'], context['version'], context['vendor'],
+                               context['system_version'], context.get('license_info'), context.get('export_type'))
+        self.file.write(json.dumps(header, separators=(',', ':'))[:-1] + ',"tools":[')
+        self.first = True
+
+    def write(self, result):
+        self.file.write(("" if self.first else ",") + json.dumps(tool_record(*result), separators=(',', ':')))
+        self.first = False
+
+    def close(self, summary):
+        self.file.write('],"summary":' + json.dumps(summary, separators=(',', ':')) + '}\n')
+        super().close(summary)
+
+class CsvReportSink(ReportSink):
+    extension = "csv"
+
+    def open(self):
+        self.file = open(self.filename, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["name", "version", "status", "category"])
+
+    def write(self, result):
+        self.writer.writerow(result)
+
+class InstallScriptSink(ReportSink):
+    extension = "sh"
+
+    def open(self):
+        self.missing_tools = []
+
+    def write(self, result):
+        name, version, status, category = result
+        if status == "not_installed" and name in TOOL_PACKAGES:
+            self.missing_tools.append(name)
+
+    def close(self, summary):
+        if not self.missing_tools:
+            # Nothing to install, leave no empty script behind
+            self.skipped = True
+            return
+        # Several reports (--render of a fleet) can miss the same tool
+        write_installation_script(self.filename, list(dict.fromkeys(self.missing_tools)))
+
+HTML_REPORT_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>%(title)s</title>
+<style>
+body { background: #2b2b2b; color: #fff; font: 14px Ubuntu, sans-serif; margin: 20px; }
+h1 { font-size: 20px; margin: 0 0 4px; }
+.meta, .summary { color: #ccc; margin-bottom: 12px; }
+.controls { display: flex; gap: 8px; margin-bottom: 10px; }
+input, select, button { background: #1e1e1e; color: #fff; border: 1px solid #555; padding: 4px 8px; }
+table { border-collapse: collapse; width: 100%%; background: #1e1e1e; }
+th { background: #3a3a3a; text-align: left; cursor: pointer; user-select: none; }
+th, td { padding: 4px 10px; border-bottom: 1px solid #333; }
+td.installed { color: #4CAF50; } td.not_installed { color: #f44336; }
+</style>
+</head>
+<body>
+<h1>%(title)s</h1>
+<div class="meta">%(meta)s</div>
+<div class="summary" id="summary"></div>
+<div class="controls">
+<input id="search" type="search" placeholder="Search tools, versions...">
+<select id="category"><option value="">All categories</option></select>
+<select id="status"><option value="">Any status</option><option value="1">Installed</option><option value="0">Missing</option></select>
+<button id="prev">&lt;</button><span id="page"></span><button id="next">&gt;</button>
+</div>
+<table><thead><tr><th data-col="0">Tool</th><th data-col="1">Version</th><th data-col="2">Status</th><th data-col="3">Category</th></tr></thead>
+<tbody id="rows"></tbody></table>
+<script id="data" type="application/json">["""
+
+HTML_REPORT_TAIL = """]</script>
+<script id="summary-data" type="application/json">%(summary)s</script>
+<script>
+(function () {
+  var rows = JSON.parse(document.getElementById("data").textContent);
+  var summary = JSON.parse(document.getElementById("summary-data").textContent);
+  var $ = function (id) { return document.getElementById(id); };
+  var PAGE = 500, page = 0, sortCol = 3, sortDir = 1, view = rows;
+  $("summary").textContent = summary.installed + " of " + summary.total + " tools installed (" +
+    summary.installation_rate + "%%), " + summary.missing + " missing";
+  var categories = {};
+  rows.forEach(function (r) { categories[r[3]] = 1; });
+  Object.keys(categories).sort().forEach(function (c) {
+    var o = document.createElement("option"); o.value = o.textContent = c; $("category").appendChild(o);
+  });
+  function update() {
+    var q = $("search").value.toLowerCase(), cat = $("category").value, st = $("status").value;
+    view = rows.filter(function (r) {
+      return (!cat || r[3] === cat) && (st === "" || String(r[2]) === st) &&
+        (!q || (r[0] + " " + r[1] + " " + r[3]).toLowerCase().indexOf(q) >= 0);
+    });
+    view.sort(function (a, b) { return a[sortCol] < b[sortCol] ? -sortDir : a[sortCol] > b[sortCol] ? sortDir : 0; });
+    page = 0; render();
+  }
+  function render() {
+    var pages = Math.max(1, Math.ceil(view.length / PAGE));
+    page = Math.min(Math.max(page, 0), pages - 1);
+    var html = [];
+    view.slice(page * PAGE, (page + 1) * PAGE).forEach(function (r) {
+      var cls = r[2] ? "installed" : "not_installed";
+      html.push("<tr><td>" + esc(r[0]) + "</td><td>" + esc(r[1]) + "</td><td class=" + cls + ">" +
+        (r[2] ? "\u2705 installed" : "\u274c missing") + "</td><td>" + esc(r[3]) + "</td></tr>");
+    });
+    $("rows").innerHTML = html.join("");
+    $("page").textContent = " " + (page + 1) + " / " + pages + " (" + view.length + " tools) ";
+  }
+  function esc(s) {
+    return String(s).replace(/[&<>"]/g, function (c) { return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]; });
+  }
+  $("search").oninput = $("category").onchange = $("status").onchange = update;
+  $("prev").onclick = function () { page--; render(); };
+  $("next").onclick = function () { page++; render(); };
+  Array.prototype.forEach.call(document.querySelectorAll("th"), function (th) {
+    th.onclick = function () {
+      var col = +th.getAttribute("data-col");
+      sortDir = col === sortCol ? -sortDir : 1; sortCol = col; update();
+    };
+  });
+  update();
+})();
+</script>
+</body>
+</html>
+"""
+
+class HtmlReportSink(ReportSink):
+    """Self-contained HTML dashboard: rows are embedded as compact JSON and sorted,
+    filtered and paged in the browser, so the file is streamed out row by row"""
+    extension = "html"
+
+    def open(self):
+        super().open()
+        context = self.context
+        meta = (f"Generated {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')} • "
+                f"{context['system_version']} • {platform.machine()}")
+        if context.get('license_status'):
+            meta += f" • {context['license_status']}"
+        self.file.write(HTML_REPORT_HEAD % {
+            "title": html_escape(f"{context['app_name']} - Development Tools Report"),
+            "meta": html_escape(meta)
+        })
+        self.first = True
+
+    def write(self, result):
+        name, version, status, category = result
+        row = json.dumps([str(name), str(version), 1 if status == "installed" else 0, str(category)],
+                         separators=(',', ':'))
+        # Keep "</script>" inside values from closing the data block
+        self.file.write(("" if self.first else ",\n") + row.replace("</", "<\\/"))
+        self.first = False
+
+    def close(self, summary):
+        self.file.write(HTML_REPORT_TAIL % {"summary": json.dumps(summary)})
+        super().close(summary)
+
+class ExportPipeline:
+    """Walks the results once and fans them out to several sinks writing concurrently
+
+    Results are handed over in chunks through bounded queues, so results can
+    be any iterable (e.g. a SnapshotReader) and memory stays bounded by the
+    slowest sink rather than the report size.
+    """
+    SINKS = {sink.extension: sink for sink in (TextReportSink, JsonReportSink, CsvReportSink,
+                                               NdjsonReportSink, HtmlReportSink, InstallScriptSink)}
+    CHUNK_SIZE = 256
+
+    def __init__(self, sinks, queue_size=16):
+        self.sinks = sinks
+        self.queue_size = queue_size
+
+    @classmethod
+    def for_formats(cls, directory, basename, formats, context):
+        sinks = [cls.SINKS[fmt](os.path.join(directory, f"{basename}.{fmt}"), context) for fmt in formats]
+        return cls(sinks)
+
+    @traced("export sink", "export", lambda self, sink, *args: {"file": sink.filename})
+    def _drain(self, sink, chunks, errors):
+        chunk = None
+        try:
+            sink.open()
+            while True:
+                chunk = chunks.get()
+                if isinstance(chunk, dict):
+                    sink.close(chunk)
+                    return
+                for result in chunk:
+                    sink.write(result)
+        except Exception as e:
+            errors.append((sink.filename, e))
+            # Keep consuming so the producer never blocks on a failed sink
+            while not isinstance(chunk, dict):
+                chunk = chunks.get()
+
+    @traced("export", "export", lambda self, results: {"formats": [sink.extension for sink in self.sinks]})
+    def run(self, results):
+        """Write every sink, return the filenames written (skipped sinks are left out)"""
+        errors = []
+        queues = [queue.Queue(self.queue_size) for _ in self.sinks]
+        threads = [threading.Thread(target=self._drain, args=(sink, chunks, errors), daemon=True)
+                   for sink, chunks in zip(self.sinks, queues)]
+        for thread in threads:
+            thread.start()
+        total = installed_count = 0
+        chunk = []
+        try:
+            for result in results:
+                chunk.append(result)
+                total += 1
+                if result[2] == "installed":
+                    installed_count += 1
+                if len(chunk) >= self.CHUNK_SIZE:
+                    for chunks in queues:
+                        chunks.put(chunk)
+                    chunk = []
+        finally:
+            for chunks in queues:
+                if chunk:
+                    chunks.put(chunk)
+                chunks.put(report_summary(total, installed_count))
+            for thread in threads:
+                thread.join()
+        if errors:
+            filename, error = errors[0]
+            raise OSError(f"Could not write {filename}: {error}")
+        return [sink.filename for sink in self.sinks if not sink.skipped]
+
+class ScanHistory:
+    """Keeps the most recent scans and per-tool probe timings on disk"""
+    def __init__(self, history_file=None, max_entries=20, max_samples=50):
+        self.history_file = Path(history_file) if history_file else APP_DATA_DIR / "scan_history.json"
+        self.max_entries = max_entries
+        self.max_samples = max_samples
+        self.entries = []
+        # tool name -> recent probe durations in seconds
+        self.timings = {}
+        # tool name -> resource usage of its last probe (see ProbeEngine.last_usage)
+        self.usage = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.history_file, 'r') as f:
+                data = json.load(f)
+            self.entries = data.get('scans', [])
+            self.timings = data.get('timings', {})
+            self.usage = data.get('usage', {})
+        except (OSError, ValueError):
+            self.entries = []
+            self.timings = {}
+            self.usage = {}
+
+    def save(self):
+        try:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.history_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump({'scans': self.entries, 'timings': self.timings, 'usage': self.usage}, f)
+            os.replace(tmp_file, self.history_file)
+        except OSError:
+            pass
+
+    def record(self, results, timings=None, usage=None):
+        """Append a scan (and its probe timings and resource usage) and drop the oldest ones beyond the limits"""
+        with self._lock:
+            entry = {
+                'timestamp': datetime.datetime.now().isoformat(),
+                'results': [list(r) for r in results]
+            }
+            if usage:
+                entry['usage'] = usage
+                self.usage.update(usage)
+            self.entries.append(entry)
+            del self.entries[:-self.max_entries]
+            for name, elapsed in (timings or {}).items():
+                samples = self.timings.setdefault(name, [])
+                samples.append(round(elapsed, 4))
+                del samples[:-self.max_samples]
+            self.save()
+
+    def timing_percentile(self, name, percentile=99, min_samples=5):
+        """Percentile of the recorded probe durations, or None without enough samples"""
+        with self._lock:
+            samples = sorted(self.timings.get(name, []))
+        if len(samples) < min_samples:
+            return None
+        index = max(0, math.ceil(len(samples) * percentile / 100.0) - 1)
+        return samples[index]
+
+    def latest(self):
+        with self._lock:
+            if not self.entries:
+                return None
+            entry = self.entries[-1]
+        return entry['timestamp'], [tuple(r) for r in entry['results']]
+
+    def diff_latest(self):
+        """Diff between the last two recorded scans, or None if there are fewer than two"""
+        with self._lock:
+            if len(self.entries) < 2:
+                return None
+            older, newer = self.entries[-2], self.entries[-1]
+        diff = diff_results([tuple(r) for r in older['results']], [tuple(r) for r in newer['results']])
+        diff["from"] = older['timestamp']
+        diff["to"] = newer['timestamp']
+        return diff
+
+def _encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _decode_varint(buf, offset):
+    value, shift = 0, 0
+    while True:
+        byte = buf[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+SNAPSHOT_MAGIC = b"DSPS"
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_COMPRESSION = {"none": 0, "zlib": 1, "lzma": 2}
+SNAPSHOT_VERSION_NUMBER = re.compile(r"\d+(?:\.\d+)*")
+
+def write_snapshot(filename, results, metadata=None, compression="zlib"):
+    """Write results as a compact binary snapshot (.dsps)
+
+    Layout: magic, format byte, compression byte, then the (optionally zlib/lzma
+    compressed) body: a string table of interned names, categories and version
+    fragments, a metadata block and one record per tool. Versions are stored as
+    prefix + varint-packed numeric components + suffix when that round-trips exactly.
+    """
+    strings, string_index = [], {}
+
+    def intern(text):
+        text = str(text)
+        if text not in string_index:
+            string_index[text] = len(strings)
+            strings.append(text)
+        return string_index[text]
+
+    metadata = metadata or {}
+    meta_refs = [(intern(key), intern(value)) for key, value in metadata.items()]
+    records = bytearray()
+    _encode_varint(len(results), records)
+    for name, version, status, category in results:
+        _encode_varint(intern(name), records)
+        _encode_varint(intern(category), records)
+        records.append(1 if status == "installed" else 0)
+        version = str(version)
+        match = SNAPSHOT_VERSION_NUMBER.search(version)
+        parts = match.group(0).split('.') if match else []
+        if parts and all(part == str(int(part)) for part in parts):
+            records.append(1)
+            _encode_varint(intern(version[:match.start()]), records)
+            _encode_varint(len(parts), records)
+            for part in parts:
+                _encode_varint(int(part), records)
+            _encode_varint(intern(version[match.end():]), records)
+        else:
+            records.append(0)
+            _encode_varint(intern(version), records)
+
+    body = bytearray()
+    _encode_varint(len(strings), body)
+    for text in strings:
+        encoded = text.encode('utf-8')
+        _encode_varint(len(encoded), body)
+        body += encoded
+    _encode_varint(len(meta_refs), body)
+    for key_ref, value_ref in meta_refs:
+        _encode_varint(key_ref, body)
+        _encode_varint(value_ref, body)
+    body += records
+
+    if compression == "zlib":
+        body = zlib.compress(bytes(body), 9)
+    elif compression == "lzma":
+        body = lzma.compress(bytes(body))
+    header = SNAPSHOT_MAGIC + bytes([SNAPSHOT_FORMAT, SNAPSHOT_COMPRESSION[compression]])
+    tmp_file = f"{filename}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_file, filename)
+
+class SnapshotReader:
+    """Reads a .dsps snapshot; uncompressed snapshots are memory-mapped and decoded lazily
+
+    A damaged snapshot raises ValueError, from the constructor or while iterating.
+    """
+    # What truncated or garbled bodies raise from the decoders and the varint reader
+    CORRUPTION_ERRORS = (zlib.error, lzma.LZMAError, IndexError, struct.error, UnicodeDecodeError)
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        self._mmap = None
+        try:
+            self._read_header()
+        except self.CORRUPTION_ERRORS as e:
+            self.close()
+            raise ValueError(f"{filename}: corrupt snapshot") from e
+        except ValueError:
+            self.close()
+            raise
+
+    def _read_header(self):
+        filename = self.filename
+        header = self._file.read(6)
+        if len(header) < 6 or header[:4] != SNAPSHOT_MAGIC:
+            raise ValueError(f"{filename} is not a DevScan snapshot")
+        if header[4] != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format {header[4]}")
+        compression = header[5]
+        if compression == SNAPSHOT_COMPRESSION["none"]:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buf, offset = self._mmap, 6
+        elif compression == SNAPSHOT_COMPRESSION["zlib"]:
+            self._buf, offset = zlib.decompress(self._file.read()), 0
+        elif compression == SNAPSHOT_COMPRESSION["lzma"]:
+            self._buf, offset = lzma.decompress(self._file.read()), 0
+        else:
+            raise ValueError(f"{filename}: unknown snapshot compression {compression}")
+
+        buf = self._buf
+        count, offset = _decode_varint(buf, offset)
+        self.strings = []
+        for _ in range(count):
+            length, offset = _decode_varint(buf, offset)
+            if offset + length > len(buf):
+                raise IndexError("string past the end of the snapshot")
+            self.strings.append(bytes(buf[offset:offset + length]).decode('utf-8'))
+            offset += length
+        count, offset = _decode_varint(buf, offset)
+        self.metadata = {}
+        for _ in range(count):
+            key_ref, offset = _decode_varint(buf, offset)
+            value_ref, offset = _decode_varint(buf, offset)
+            self.metadata[self.strings[key_ref]] = self.strings[value_ref]
+        self._record_count, self._records_offset = _decode_varint(buf, offset)
+
+    def __len__(self):
+        return self._record_count
+
+    def __iter__(self):
+        """Yield (name, version, status, category) tuples"""
+        try:
+            yield from self._records()
+        except self.CORRUPTION_ERRORS as e:
+            raise ValueError(f"{self.filename}: corrupt snapshot") from e
+
+    def _records(self):
+        buf, strings = self._buf, self.strings
+        offset = self._records_offset
+        for _ in range(self._record_count):
+            name_ref, offset = _decode_varint(buf, offset)
+            category_ref, offset = _decode_varint(buf, offset)
+            status = "installed" if buf[offset] else "not_installed"
+            kind = buf[offset + 1]
+            offset += 2
+            if kind:
+                prefix_ref, offset = _decode_varint(buf, offset)
+                count, offset = _decode_varint(buf, offset)
+                parts = []
+                for _ in range(count):
+                    part, offset = _decode_varint(buf, offset)
+                    parts.append(str(part))
+                suffix_ref, offset = _decode_varint(buf, offset)
+                version = strings[prefix_ref] + ".".join(parts) + strings[suffix_ref]
+            else:
+                version_ref, offset = _decode_varint(buf, offset)
+                version = strings[version_ref]
+            yield strings[name_ref], version, status, strings[category_ref]
+
+    def close(self):
+        self._buf = None
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def load_results(filename):
+    """Read result tuples from a .dsps snapshot or a JSON report"""
+    if str(filename).endswith('.dsps'):
+        with SnapshotReader(filename) as reader:
+            return list(reader)
+    with open(filename, 'r') as f:
+        report = json.load(f)
+    return [(t["name"], t["version"], t["status"], t["category"]) for t in report.get("tools", [])]
+
+class ProbeCache:
+    """Remembers probe results keyed by the fingerprint of the probed binary"""
+    def __init__(self, cache_file=None, max_age=3600):
+        self.cache_file = Path(cache_file) if cache_file else APP_DATA_DIR / "probe_cache.json"
+        self.max_age = max_age
+        self.entries = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        self._boot_id = self._read_boot_id()
+        self.load()
+
+    @staticmethod
+    def _read_boot_id():
+        # Outputs such as `uname -r` change across reboots without the binary changing
+        try:
+            with open('/proc/sys/kernel/random/boot_id', 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return ""
+
+    @staticmethod
+    def fingerprint(command, check_type="version"):
+        """Identify the binary a probe would run: resolved path, inode, size and mtime"""
+        executable = command if check_type == "which" else command.split()[0]
+        path = shutil.which(executable)
+        if not path:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [path, st.st_ino, st.st_size, st.st_mtime_ns]
+
+    def load(self):
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            if data.get('boot_id') == self._boot_id:
+                self.entries = data.get('entries', {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        """Write the cache back to disk if it changed"""
+        with self._lock:
+            if not self.dirty:
+                return
+            data = {'boot_id': self._boot_id, 'entries': dict(self.entries)}
+            self.dirty = False
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w') as f:
+                json.dump(data, f)
+        except OSError:
+            pass
+
+    def lookup(self, command, check_type, fingerprint):
+        """Return (version, status) if the cached entry is still valid"""
+        with self._lock:
+            entry = self.entries.get(f"{check_type}:{command}")
+        if not entry or entry['fingerprint'] != fingerprint:
+            return None
+        if time.time() - entry['timestamp'] > self.max_age:
+            return None
+        return entry['version'], entry['status']
+
+    def store(self, command, check_type, fingerprint, version, status):
+        with self._lock:
+            self.entries[f"{check_type}:{command}"] = {
+                'fingerprint': fingerprint,
+                'version': version,
+                'status': status,
+                'timestamp': time.time()
+            }
+            self.dirty = True
+
+class StaticVersionDetector:
+    """Reads tool versions from binaries and adjacent metadata files without executing them
+
+    Files are memory-mapped and searched in place, so multi-megabyte binaries and
+    manifests are never copied into Python memory.
+    """
+    GO_BUILDINFO_MAGIC = b"\xff Go buildinf:"
+    GO_ARCHES = {"x86_64": "amd64", "aarch64": "arm64", "i686": "386", "armv7l": "arm"}
+    GO_VERSION = re.compile(rb"(go1\.\d+(?:\.\d+)?(?:rc\d+|beta\d+)?)")
+    JAVA_RELEASE_VERSION = re.compile(rb'^JAVA_VERSION="([^"]+)"', re.MULTILINE)
+    RUST_MANIFEST_VERSION = re.compile(rb'\[pkg\.rustc\]\nversion = "([^"]+)"')
+    RUST_DRIVER_VERSION = re.compile(rb"(\d+\.\d+\.\d+(?:-[a-z]+)? \([0-9a-f]{7,9} \d{4}-\d{2}-\d{2}\))")
+
+    def __init__(self):
+        self.detectors = {
+            "Python 3": self.detect_python,
+            "Python": self.detect_python,
+            "Java": self.detect_java,
+            "Go": self.detect_go,
+            "Rust": self.detect_rust,
+        }
+
+    def detect(self, name, command):
+        """Version line for a catalog tool, or None to fall back to running its probe"""
+        detector = self.detectors.get(name)
+        if detector is None:
+            return None
+        try:
+            return detector(command.split()[0])
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _mmap_search(path, pattern, prefix=None):
+        """First group of pattern found in the file, searched through a read-only mapping
+
+        With a literal prefix, candidates are located with mmap.find() and only
+        checked by the regex at those offsets, which is much faster on large binaries.
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if prefix is None:
+                    match = pattern.search(mapped)
+                    return match.group(1).decode('utf-8', errors='replace') if match else None
+                offset = mapped.find(prefix)
+                while offset >= 0:
+                    # Lookbehinds still see the bytes before offset
+                    match = pattern.match(mapped, offset)
+                    if match:
+                        return match.group(1).decode('utf-8', errors='replace')
+                    offset = mapped.find(prefix, offset + 1)
+                return None
+
+    @staticmethod
+    def _is_elf(path):
+        with open(path, 'rb') as f:
+            return f.read(4) == b"\x7fELF"
+
+    @staticmethod
+    def _pyenv_version(pyenv_root):
+        """Version a pyenv shim would select: PYENV_VERSION, .python-version, then the global file"""
+        if os.environ.get('PYENV_VERSION'):
+            return os.environ['PYENV_VERSION'].split(':')[0]
+        directory = Path.cwd()
+        candidates = [directory / '.python-version'] + [d / '.python-version' for d in directory.parents]
+        candidates.append(pyenv_root / 'version')
+        for candidate in candidates:
+            try:
+                with open(candidate, 'r') as f:
+                    return f.readline().strip()
+            except OSError:
+                continue
+        return None
+
+    def _resolve(self, executable):
+        """Real ELF file behind an executable name, following symlinks and pyenv shims"""
+        path = shutil.which(executable)
+        if not path:
+            return None
+        real = os.path.realpath(path)
+        if self._is_elf(real):
+            return real
+        if os.path.basename(os.path.dirname(path)) == 'shims':
+            pyenv_root = Path(path).parent.parent
+            version = self._pyenv_version(pyenv_root)
+            if version and version != 'system':
+                candidate = pyenv_root / 'versions' / version / 'bin' / executable
+                if candidate.exists():
+                    return os.path.realpath(candidate)
+        return None
+
+    def detect_python(self, executable):
+        binary = self._resolve(executable)
+        if not binary:
+            return None
+        # PY_VERSION is a NUL-terminated string in the binary or libpython (possibly tail-merged
+        # into a longer string by the linker)
+        match = re.search(r"python(\d\.\d+)$", binary)
+        major_minor = re.escape(match.group(1)) if match else r"[23]\.\d+"
+        pattern = re.compile(rb"(?<![\d.])(" + major_minor.encode() + rb"\.\d+(?:(?:a|b|rc)\d+)?\+?)\x00")
+        lib_dir = Path(binary).parent.parent / 'lib'
+        lib_glob = f"libpython{match.group(1) if match else '*'}*.so*"
+        libraries = sorted(lib_dir.glob(lib_glob)) if lib_dir.is_dir() else []
+        prefix = match.group(1).encode() + b"." if match else None
+        for candidate in libraries + [Path(binary)]:
+            version = self._mmap_search(candidate, pattern, prefix)
+            if version:
+                return f"Python {version}"
+        return None
+
+    def detect_java(self, executable):
+        """Version from the release file of the JDK that the java on PATH belongs to"""
+        path = shutil.which(executable)
+        if not path:
+            return None
+        binary = os.path.realpath(path)
+        home = Path(binary).parent.parent
+        # JDK 8 ships the JRE's java under jre/bin
+        homes = [home, home.parent]
+        # JAVA_HOME only helps when it is where the java on PATH lives
+        java_home = os.environ.get('JAVA_HOME')
+        if java_home and binary in {os.path.realpath(Path(java_home, sub, 'bin', executable)) for sub in ('', 'jre')}:
+            homes.append(Path(java_home))
+        for home in homes:
+            release = home / 'release'
+            if release.is_file():
+                version = self._mmap_search(release, self.JAVA_RELEASE_VERSION)
+                if version:
+                    return f'java version "{version}"'
+        return None
+
+    def detect_go(self, executable):
+        binary = self._resolve(executable)
+        if not binary:
+            return None
+        goarch = self.GO_ARCHES.get(platform.machine(), platform.machine())
+        suffix = f"{platform.system().lower()}/{goarch}"
+        version_file = Path(binary).parent.parent / 'VERSION'
+        if version_file.is_file():
+            version = self._mmap_search(version_file, self.GO_VERSION)
+            if version:
+                return f"go version {version} {suffix}"
+        with open(binary, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                offset = mapped.find(self.GO_BUILDINFO_MAGIC)
+                if offset < 0:
+                    return None
+                # Go 1.18+ inlines the version as a varint-prefixed string after the 32-byte header
+                if mapped[offset + 15] & 0x2:
+                    length = mapped[offset + 32]
+                    if length < 0x80:
+                        version = bytes(mapped[offset + 33:offset + 33 + length]).decode('ascii', 'replace')
+                        return f"go version {version} {suffix}"
+                match = self.GO_VERSION.search(mapped)
+                return f"go version {match.group(1).decode()} {suffix}" if match else None
+
+    def detect_rust(self, executable):
+        path = shutil.which(executable)
+        if not path:
+            return None
+        real = Path(os.path.realpath(path))
+        if real.name.startswith('rustup'):
+            # rustup proxy: read the selected toolchain's sysroot instead
+            rustup_home = Path(os.environ.get('RUSTUP_HOME', Path.home() / '.rustup'))
+            toolchain = os.environ.get('RUSTUP_TOOLCHAIN')
+            if not toolchain:
+                settings = rustup_home / 'settings.toml'
+                toolchain = self._mmap_search(settings, re.compile(rb'default_toolchain = "([^"]+)"')) if settings.is_file() else None
+            if not toolchain:
+                return None
+            sysroot = rustup_home / 'toolchains' / toolchain
+        else:
+            sysroot = real.parent.parent
+        manifest = sysroot / 'lib' / 'rustlib' / 'multirust-channel-manifest.toml'
+        if manifest.is_file():
+            version = self._mmap_search(manifest, self.RUST_MANIFEST_VERSION)
+            if version:
+                return f"rustc {version}"
+        for driver in sorted((sysroot / 'lib').glob('librustc_driver-*.so')):
+            version = self._mmap_search(driver, self.RUST_DRIVER_VERSION)
+            if version:
+                return f"rustc {version}"
+        return None
+
+class VersionManagerIndex:
+    """Lists every toolchain version installed side by side by pyenv, nvm, sdkman, rustup and asdf
+
+    Directory listings are cached by mtime, so a rescan only re-reads directories
+    where versions were added or removed.
+    """
+    # (manager, root env var, default root, versions path, tool name or None for per-plugin dirs)
+    MANAGERS = [
+        ("pyenv", "PYENV_ROOT", ".pyenv", "versions", "Python"),
+        ("nvm", "NVM_DIR", ".nvm", "versions/node", "Node.js"),
+        ("rustup", "RUSTUP_HOME", ".rustup", "toolchains", "Rust"),
+        ("sdkman", "SDKMAN_DIR", ".sdkman", "candidates", None),
+        ("asdf", "ASDF_DATA_DIR", ".asdf", "installs", None),
+    ]
+    # sdkman candidates and asdf plugins that correspond to catalog tools
+    PLUGIN_TOOLS = {
+        "python": "Python", "nodejs": "Node.js", "node": "Node.js", "java": "Java",
+        "golang": "Go", "go": "Go", "ruby": "Ruby", "rust": "Rust", "php": "PHP", "perl": "Perl",
+    }
+    IGNORED_ENTRIES = {"current", "system", "envs"}
+    # Bumped when _list_dir changes what it counts, so stale listings are dropped
+    CACHE_FORMAT = 2
+
+    def __init__(self, cache_file=None):
+        self.cache_file = Path(cache_file) if cache_file else APP_DATA_DIR / "version_managers.json"
+        # directory -> [mtime_ns, sorted entry names]
+        self.listings = {}
+        self.dirty = False
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            if data.get('format') == self.CACHE_FORMAT:
+                self.listings = data['listings']
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.listings = {}
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w') as f:
+                json.dump({'format': self.CACHE_FORMAT, 'listings': self.listings}, f)
+            self.dirty = False
+        except OSError:
+            pass
+
+    def _list_dir(self, directory):
+        """Subdirectory names of directory, re-read only if its mtime changed
+
+        Symlinks are skipped: pyenv links each virtualenv (versions/<venv> -> <version>/envs/<venv>)
+        next to the real interpreters, and sdkman/nvm aliases point at versions already listed.
+        """
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            if self.listings.pop(directory, None) is not None:
+                self.dirty = True
+            return []
+        cached = self.listings.get(directory)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with os.scandir(directory) as entries:
+            names = sorted(e.name for e in entries
+                           if e.is_dir(follow_symlinks=False) and not e.name.startswith('.')
+                           and e.name not in self.IGNORED_ENTRIES)
+        self.listings[directory] = [mtime, names]
+        self.dirty = True
+        return names
+
+    @staticmethod
+    def _version_key(version):
+        return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", version)]
+
+    def index(self):
+        """Return {tool name: [(manager, [versions...]), ...]} for all installed managers"""
+        found = {}
+        for manager, env_var, default_root, versions_path, tool in self.MANAGERS:
+            root = os.path.join(os.environ.get(env_var) or str(Path.home() / default_root), versions_path)
+            if tool:
+                versions = self._list_dir(root)
+                if versions:
+                    found.setdefault(tool, []).append((manager, sorted(versions, key=self._version_key)))
+                continue
+            for plugin in self._list_dir(root):
+                versions = self._list_dir(os.path.join(root, plugin))
+                if versions:
+                    name = self.PLUGIN_TOOLS.get(plugin, plugin)
+                    found.setdefault(name, []).append((manager, sorted(versions, key=self._version_key)))
+        self.save()
+        return found
+
+    @staticmethod
+    def _matches(tool, names):
+        """Whether a manager tool (Python) belongs to a scanned catalog name (Python 3)"""
+        return tool in names or any(name.startswith(tool + " ") for name in names)
+
+    def results(self, categories=None, names=None):
+        """Result rows like "Python (pyenv)" (all when both filters are None)
+
+        With names, only tools matching a scanned tool name are kept; tools the catalog does not
+        know (sdkman's maven, asdf plugins) are kept when their category is in categories.
+        """
+        tool_categories = {name: category for _, name, category, _ in TOOL_CATALOG}
+        rows = []
+        for tool, managers in self.index().items():
+            category = tool_categories.get(tool, "Programming")
+            if names is not None:
+                if not (self._matches(tool, names)
+                        or (tool not in tool_categories and categories is not None and category in categories)):
+                    continue
+            elif categories is not None and category not in categories:
+                continue
+            for manager, versions in managers:
+                rows.append((f"{tool} ({manager})", ", ".join(versions), "installed", category))
+        return rows
+
+class ProjectScanner:
+    """Infers the tools a source tree needs from its manifest files
+
+    Directories are walked in parallel with os.scandir (no per-file stat), ignored
+    directories are pruned, and per-manifest results are cached by mtime.
+    """
+    IGNORED_DIRS = {".git", ".hg", ".svn", "node_modules", ".venv", "venv", "__pycache__",
+                    ".tox", ".nox", ".mypy_cache", ".pytest_cache", "target", "dist", "build"}
+    MANIFEST_TOOLS = {
+        "package.json": ["Node.js", "npm"],
+        "pyproject.toml": ["Python 3", "pip3"],
+        "setup.py": ["Python 3", "pip3"],
+        "requirements.txt": ["Python 3", "pip3"],
+        "Pipfile": ["Python 3", "pip3"],
+        "Cargo.toml": ["Rust"],
+        "go.mod": ["Go"],
+        "CMakeLists.txt": ["CMake", "GNU Make", "GCC", "G++"],
+        "Makefile": ["GNU Make"],
+        "Dockerfile": ["Docker"],
+        "Containerfile": ["Podman"],
+        "docker-compose.yml": ["Docker", "Docker Compose"],
+        "docker-compose.yaml": ["Docker", "Docker Compose"],
+        "compose.yaml": ["Docker", "Docker Compose"],
+        "Gemfile": ["Ruby"],
+        "composer.json": ["PHP"],
+        "pom.xml": ["Java"],
+        "build.gradle": ["Java"],
+        "Vagrantfile": ["Vagrant"],
+        ".tool-versions": [],
+    }
+    # asdf plugin names in .tool-versions
+    TOOL_VERSIONS_PLUGINS = {
+        "python": "Python 3", "nodejs": "Node.js", "golang": "Go", "rust": "Rust", "ruby": "Ruby",
+        "java": "Java", "php": "PHP", "perl": "Perl", "cmake": "CMake", "kubectl": "Kubernetes CLI",
+    }
+
+    def __init__(self, root, cache_file=None, workers=8):
+        self.root = os.path.abspath(root)
+        self.cache_file = Path(cache_file) if cache_file else APP_DATA_DIR / "project_manifests.json"
+        self.workers = workers
+        # manifest path -> [mtime_ns, size, tool names]
+        try:
+            with open(self.cache_file, 'r') as f:
+                self.cache = json.load(f)
+        except (OSError, ValueError):
+            self.cache = {}
+
+    def _is_manifest(self, name):
+        return name in self.MANIFEST_TOOLS or name.startswith("Dockerfile.")
+
+    def _scan_dir(self, directory):
+        """One directory level: (subdirectories to descend into, manifest paths)"""
+        subdirs, manifests = [], []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name == ".git":
+                            manifests.append(entry.path)
+                        elif entry.name not in self.IGNORED_DIRS:
+                            subdirs.append(entry.path)
+                    elif self._is_manifest(entry.name):
+                        manifests.append(entry.path)
+        except OSError:
+            pass
+        return subdirs, manifests
+
+    def find_manifests(self):
+        """Walk the tree in parallel and return every manifest path"""
+        manifests = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(self._scan_dir, self.root)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirs, found = future.result()
+                    manifests.extend(found)
+                    pending.update(pool.submit(self._scan_dir, subdir) for subdir in subdirs)
+        return manifests
+
+    def _tools_for(self, path):
+        name = os.path.basename(path)
+        if name == ".git":
+            return ["Git"]
+        if name == ".tool-versions":
+            tools = []
+            with open(path, 'r') as f:
+                for line in f:
+                    plugin = line.split('#', 1)[0].split()
+                    if plugin and plugin[0] in self.TOOL_VERSIONS_PLUGINS:
+                        tools.append(self.TOOL_VERSIONS_PLUGINS[plugin[0]])
+            return tools
+        return self.MANIFEST_TOOLS.get(name, ["Docker"])
+
+    def scan(self):
+        """Return {tool name: [manifest paths relative to the root]}"""
+        required = {}
+        seen = {}
+        for path in self.find_manifests():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            cached = self.cache.get(path)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                tools = cached[2]
+            else:
+                try:
+                    tools = self._tools_for(path)
+                except (OSError, UnicodeDecodeError):
+                    tools = []
+            seen[path] = [st.st_mtime_ns, st.st_size, tools]
+            for tool in tools:
+                required.setdefault(tool, []).append(os.path.relpath(path, self.root))
+
+        # Keep cache entries of other trees, replace this tree's entries
+        prefix = self.root.rstrip(os.sep) + os.sep
+        self.cache = {p: v for p, v in self.cache.items() if not p.startswith(prefix)}
+        self.cache.update(seen)
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w') as f:
+                json.dump(self.cache, f)
+        except OSError:
+            pass
+        return required
+
+    def required_tools(self):
+        """Catalog entries for the tools this project needs"""
+        required = self.scan()
+        return [tool for tool in TOOL_CATALOG if tool[1] in required]
+
+class IntegrityVerifier:
+    """Hashes the binaries behind catalog tools and checks them against dpkg or a saved baseline
+
+    Files are hashed (sha256 and md5, one pass over a memory map) in a thread
+    pool, and hashes are cached by inode, size and mtime so a rescan only
+    re-hashes files that changed. A file is "ok" when its md5 matches the
+    owning package's /var/lib/dpkg/info/<package>.md5sums entry or its sha256
+    matches the baseline, "modified" when either differs, and "unverified"
+    when neither knows it.
+    """
+    DPKG_INFO_DIR = "/var/lib/dpkg/info"
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, cache_file=None, baseline_file=None, workers=4):
+        self.cache_file = Path(cache_file) if cache_file else APP_DATA_DIR / "integrity_cache.json"
+        self.baseline_file = Path(baseline_file) if baseline_file else APP_DATA_DIR / "integrity_baseline.json"
+        self.workers = workers
+        # path -> [inode, size, mtime_ns, sha256, md5]
+        self.hashes = self._load(self.cache_file)
+        self.dirty = False
+
+    @staticmethod
+    def _load(path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save(path, data):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = path.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def resolve(tools):
+        """{tool name: real path} for tools whose command resolves to a file"""
+        paths = {}
+        for command, name, category, check_type in tools:
+            if check_type not in ("version", "which", "plugin"):
+                continue
+            # Package, file and env plugins name no executable
+            if check_type == "plugin" and PROBE_PLUGINS.strategy(name, category) != "path":
+                continue
+            executable = shutil.which(command if check_type == "which" else command.split()[0])
+            if executable:
+                paths[name] = os.path.realpath(executable)
+        return paths
+
+    def _hash_file(self, path):
+        sha256, md5 = hashlib.sha256(), hashlib.md5()
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    with memoryview(mapped) as view:
+                        for offset in range(0, size, self.CHUNK_SIZE):
+                            with view[offset:offset + self.CHUNK_SIZE] as chunk:
+                                sha256.update(chunk)
+                                md5.update(chunk)
+        return sha256.hexdigest(), md5.hexdigest()
+
+    def hash_files(self, paths):
+        """{path: (sha256, md5)}, re-hashing only files whose inode, size or mtime changed"""
+        result, stale = {}, []
+        for path in set(paths):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            key = [st.st_ino, st.st_size, st.st_mtime_ns]
+            cached = self.hashes.get(path)
+            if cached and cached[:3] == key:
+                result[path] = tuple(cached[3:])
+            else:
+                stale.append((path, key))
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                hashed = pool.map(lambda item: self._safe_hash(item[0]), stale)
+                for (path, key), digests in zip(stale, hashed):
+                    if digests:
+                        self.hashes[path] = key + list(digests)
+                        result[path] = digests
+            self.dirty = True
+        if self.dirty:
+            self._save(self.cache_file, self.hashes)
+            self.dirty = False
+        return result
+
+    def _safe_hash(self, path):
+        try:
+            return self._hash_file(path)
+        except OSError:
+            return None
+
+    def dpkg_md5sums(self, paths):
+        """{path: (package, md5)} for the paths listed in dpkg's md5sums files"""
+        wanted = {}
+        for path in paths:
+            relative = path.lstrip('/')
+            wanted[relative] = path
+            # usrmerge: dpkg may still list /usr/bin/x as bin/x
+            if relative.startswith('usr/'):
+                wanted.setdefault(relative[4:], path)
+        found = {}
+        try:
+            entries = sorted(os.scandir(self.DPKG_INFO_DIR), key=lambda entry: entry.name)
+        except OSError:
+            return found
+        for entry in entries:
+            if not entry.name.endswith('.md5sums'):
+                continue
+            package = entry.name[:-len('.md5sums')].split(':')[0]
+            try:
+                with open(entry.path, 'r', errors='replace') as f:
+                    for line in f:
+                        md5, _, relative = line.rstrip('\n').partition('  ')
+                        if relative in wanted:
+                            found[wanted[relative]] = (package, md5)
+            except OSError:
+                continue
+            if len(found) == len(set(wanted.values())):
+                break
+        return found
+
+    def save_baseline(self, tools):
+        """Record the current sha256 of every resolved binary as the trusted baseline"""
+        paths = self.resolve(tools)
+        digests = self.hash_files(paths.values())
+        baseline = {path: digests[path][0] for path in paths.values() if path in digests}
+        self._save(self.baseline_file, baseline)
+        return baseline
+
+    @traced("verify", "integrity", lambda self, tools: {"tools": len(tools)})
+    def verify(self, tools):
+        """One entry per resolved tool: name, path, sha256, package, status and what it was checked against"""
+        paths = self.resolve(tools)
+        digests = self.hash_files(paths.values())
+        packages = self.dpkg_md5sums(paths.values())
+        baseline = self._load(self.baseline_file)
+        report = []
+        for name, path in paths.items():
+            entry = {"name": name, "path": path, "sha256": None, "package": None,
+                     "status": "unreadable", "checked_against": None}
+            if path in digests:
+                sha256, md5 = digests[path]
+                entry["sha256"] = sha256
+                entry["status"] = "unverified"
+                if path in packages:
+                    entry["package"], expected_md5 = packages[path]
+                    entry["checked_against"] = "dpkg"
+                    entry["status"] = "ok" if md5 == expected_md5 else "modified"
+                if path in baseline and entry["status"] != "modified":
+                    entry["checked_against"] = "baseline" if entry["checked_against"] is None else "dpkg+baseline"
+                    entry["status"] = "ok" if sha256 == baseline[path] else "modified"
+            report.append(entry)
+        return report
+
+class ExternalCounter:
+    """Counts tuple-of-string keys in bounded memory by spilling sorted runs to temporary files"""
+    def __init__(self, max_keys=100000, tmp_dir=None):
+        self.max_keys = max_keys
+        self.tmp_dir = tmp_dir
+        self.counts = {}
+        self.runs = []
+
+    def add(self, key, count=1):
+        self.counts[key] = self.counts.get(key, 0) + count
+        if len(self.counts) >= self.max_keys:
+            self._spill()
+
+    def _spill(self):
+        run = tempfile.TemporaryFile('w+', encoding='utf-8', dir=self.tmp_dir)
+        for key in sorted(self.counts):
+            run.write(f"{json.dumps(key)}\t{self.counts[key]}\n")
+        run.seek(0)
+        self.runs.append(run)
+        self.counts = {}
+
+    @staticmethod
+    def _read_run(run):
+        for line in run:
+            key, count = line.rsplit('\t', 1)
+            yield tuple(json.loads(key)), int(count)
+
+    def items(self):
+        """Yield (key, total count) in key order, merging the spilled runs"""
+        streams = [self._read_run(run) for run in self.runs]
+        streams.append(iter(sorted(self.counts.items())))
+        current_key, total = None, 0
+        for key, count in heapq.merge(*streams):
+            if key != current_key:
+                if current_key is not None:
+                    yield current_key, total
+                current_key, total = key, 0
+            total += count
+        if current_key is not None:
+            yield current_key, total
+        for run in self.runs:
+            run.close()
+        self.runs = []
+        self.counts = {}
+
+class ReportAggregator:
+    """Merges many per-host JSON/NDJSON reports into fleet coverage, version and outlier stats
+
+    Reports are streamed one at a time; version counts spill to sorted runs on disk
+    and per-host totals go to a temporary file, so memory stays bounded no matter
+    how many hosts are merged.
+    """
+    REPORT_SUFFIXES = ('.json', '.ndjson', '.jsonl', '.dsps')
+
+    def __init__(self, top_versions=10, max_outliers=20, outlier_z=2.0, max_keys=100000):
+        self.top_versions = top_versions
+        self.max_outliers = max_outliers
+        self.outlier_z = outlier_z
+        self.max_keys = max_keys
+
+    def iter_paths(self, paths):
+        for path in paths:
+            if os.path.isdir(path):
+                for dirpath, _, filenames in os.walk(path):
+                    for filename in sorted(filenames):
+                        if filename.endswith(self.REPORT_SUFFIXES):
+                            yield os.path.join(dirpath, filename)
+            else:
+                yield path
+
+    def iter_reports(self, paths):
+        """Yield (host id, report) for every well-formed report in the given files and directories
+
+        Unreadable files, NDJSON lines that are not valid reports and corrupt snapshots
+        are logged and skipped; the rest of the fleet is still merged.
+        """
+        for path in self.iter_paths(paths):
+            try:
+                if path.endswith('.dsps'):
+                    with SnapshotReader(path) as reader:
+                        # Decoded up front so a corrupt body skips the whole host, not half of it
+                        report = {
+                            "system": {"hostname": reader.metadata.get("hostname")},
+                            "tools": [{"name": name, "version": version, "status": status, "category": category}
+                                      for name, version, status, category in reader]
+                        }
+                    yield self._host_id(report, path), report
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    if path.endswith(('.ndjson', '.jsonl')):
+                        for line_number, line in enumerate(f, 1):
+                            if not line.strip():
+                                continue
+                            where = f"{path}:{line_number}"
+                            try:
+                                report = self._check_report(json.loads(line))
+                            except ValueError as e:
+                                logger.warning("Skipping %s: %s", where, e)
+                                continue
+                            yield self._host_id(report, where), report
+                    else:
+                        report = self._check_report(json.load(f))
+                        yield self._host_id(report, path), report
+            except (OSError, ValueError) as e:
+                logger.warning("Skipping %s: %s", path, e)
+
+    @staticmethod
+    def _check_report(report):
+        """Return report if it has the shape aggregate() relies on, else raise ValueError"""
+        if not isinstance(report, dict):
+            raise ValueError("report is not a JSON object")
+        if not isinstance(report.get("system", {}), dict):
+            raise ValueError('"system" is not an object')
+        tools = report.get("tools", [])
+        if not isinstance(tools, list):
+            raise ValueError('"tools" is not a list')
+        for index, tool in enumerate(tools):
+            if not isinstance(tool, dict) or "name" not in tool:
+                raise ValueError(f'tool #{index} has no "name"')
+        return report
+
+    @staticmethod
+    def _host_id(report, fallback):
+        return report.get("system", {}).get("hostname") or fallback
+
+    def aggregate(self, paths):
+        hosts = 0
+        tool_stats = {}  # name -> [category, seen, installed]
+        versions = ExternalCounter(self.max_keys)
+        # Welford running mean/variance of installed tools per host
+        mean, m2 = 0.0, 0.0
+        with tempfile.TemporaryFile('w+', encoding='utf-8') as host_totals:
+            for host, report in self.iter_reports(paths):
+                installed = 0
+                for tool in report.get("tools", []):
+                    stats = tool_stats.setdefault(tool["name"], [tool.get("category", ""), 0, 0])
+                    stats[1] += 1
+                    if tool.get("status") == "installed":
+                        stats[2] += 1
+                        installed += 1
+                        versions.add((tool["name"], str(tool.get("version", ""))))
+                hosts += 1
+                delta = installed - mean
+                mean += delta / hosts
+                m2 += delta * (installed - mean)
+                host_totals.write(f"{json.dumps(host)}\t{installed}\n")
+
+            stddev = math.sqrt(m2 / hosts) if hosts else 0.0
+            outliers = []
+            host_totals.seek(0)
+            for line in host_totals:
+                host, installed = line.rsplit('\t', 1)
+                installed = int(installed)
+                z = (installed - mean) / stddev if stddev else 0.0
+                if abs(z) >= self.outlier_z:
+                    entry = (abs(z), json.loads(host), installed, round(z, 2))
+                    if len(outliers) < self.max_outliers:
+                        heapq.heappush(outliers, entry)
+                    else:
+                        heapq.heappushpop(outliers, entry)
+
+        distribution = {}
+        current_tool, top = None, []
+        for (tool, version), count in versions.items():
+            if tool != current_tool:
+                if current_tool is not None:
+                    distribution[current_tool] = self._top_list(top)
+                current_tool, top = tool, []
+            entry = (count, version)
+            if len(top) < self.top_versions:
+                heapq.heappush(top, entry)
+            else:
+                heapq.heappushpop(top, entry)
+        if current_tool is not None:
+            distribution[current_tool] = self._top_list(top)
+
+        return {
+            "hosts": hosts,
+            "generated": datetime.datetime.now().isoformat(),
+            "installed_per_host": {"mean": round(mean, 2), "stddev": round(stddev, 2)},
+            "tools": [
+                {
+                    "name": name,
+                    "category": category,
+                    "installed_hosts": installed,
+                    "coverage": round(installed / hosts * 100, 1) if hosts else 0
+                }
+                for name, (category, seen, installed) in sorted(tool_stats.items())
+            ],
+            "versions": distribution,
+            "outliers": [
+                {"host": host, "installed": installed, "z_score": z}
+                for _, host, installed, z in sorted(outliers, reverse=True)
+            ],
+        }
+
+    @staticmethod
+    def _top_list(top):
+        return [{"version": version, "hosts": count} for count, version in sorted(top, reverse=True)]
+
+def iter_report_results(paths):
+    """Stream result tuples out of existing snapshots and JSON/NDJSON reports (files or directories)
+
+    A single report file yields its rows unchanged. A fleet (several paths, a directory
+    or an NDJSON file of reports) prefixes each category with the report's host, so
+    the export sinks group and filter the rows per host. Malformed reports are skipped.
+    """
+    fleet = len(paths) > 1 or any(os.path.isdir(path) or path.endswith(('.ndjson', '.jsonl')) for path in paths)
+    for host, report in ReportAggregator().iter_reports(paths):
+        for tool in report.get("tools", []):
+            category = tool.get("category", "")
+            yield (tool["name"], str(tool.get("version", "")), tool.get("status", "not_installed"),
+                   f"{host} / {category}" if fleet else category)
+
+@functools.lru_cache(maxsize=256)
+def compile_version_regex(pattern):
+    return re.compile(pattern)
+
+def extract_version(output, pattern=None):
+    """First capture group (or whole match) of pattern in output, or output's first line"""
+    if pattern:
+        match = compile_version_regex(pattern).search(output)
+        if match:
+            return match.group(1) if match.groups() else match.group(0)
+    return output.strip().splitlines()[0] if output.strip() else None
+
+class ProbePluginRegistry:
+    """Third-party probes from ~/.devscan_pro/probes/<Category>/*.py and the
+    "devscan_pro.probes" entry point group (entry point name = category)
+
+    A plugin module defines PROBES, a list of dicts with "name", "strategy"
+    (path, package, file or env), the strategy's argument ("command", "package",
+    "path" or "env"), an optional "version_regex" and an optional "install"
+    mapping in TOOL_PACKAGES form. Modules are only imported when their
+    category is scanned. Tool names are unique: a probe whose name is already
+    built in or defined by a category loaded earlier is skipped with a warning.
+    """
+    ENTRY_POINT_GROUP = "devscan_pro.probes"
+    STRATEGIES = {"path": "command", "package": "package", "file": "path", "env": "env"}
+
+    def __init__(self, probe_dir=None):
+        self.probe_dir = Path(probe_dir) if probe_dir else APP_DATA_DIR / "probes"
+        self._entry_points = None
+        self._loaded = set()
+        self._tools = {}
+        # (category, tool name) -> probe spec
+        self._probes = {}
+        # tool name -> category that defined it
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def _plugin_entry_points(self):
+        if self._entry_points is None:
+            self._entry_points = []
+            try:
+                from importlib.metadata import entry_points
+                eps = entry_points()
+                if hasattr(eps, 'select'):
+                    self._entry_points = list(eps.select(group=self.ENTRY_POINT_GROUP))
+                else:
+                    self._entry_points = list(eps.get(self.ENTRY_POINT_GROUP, []))
+            except Exception as e:
+                logger.warning("Could not list probe entry points: %s", e)
+        return self._entry_points
+
+    def categories(self):
+        """Categories that have plugins, without importing any of them"""
+        found = set(ep.name for ep in self._plugin_entry_points())
+        try:
+            found.update(entry.name for entry in os.scandir(self.probe_dir) if entry.is_dir())
+        except OSError:
+            pass
+        return sorted(found)
+
+    def _load_category(self, category):
+        modules = []
+        category_dir = self.probe_dir / category
+        if category_dir.is_dir():
+            for path in sorted(category_dir.glob("*.py")):
+                try:
+                    spec = importlib.util.spec_from_file_location(f"devscan_pro_probes.{path.stem}", path)
+                    module = importlib.util.module_from_spec(spec)
+                    spec.loader.exec_module(module)
+                    modules.append((str(path), getattr(module, "PROBES", [])))
+                except Exception as e:
+                    logger.warning("Skipping probe plugin %s: %s", path, e)
+        for ep in self._plugin_entry_points():
+            if ep.name != category:
+                continue
+            try:
+                plugin = ep.load()
+                probes = getattr(plugin, "PROBES", plugin)
+                modules.append((ep.value, probes() if callable(probes) else probes))
+            except Exception as e:
+                logger.warning("Skipping probe plugin %s: %s", ep.value, e)
+
+        builtin = {tool[1] for tool in TOOL_CATALOG}
+        tools = []
+        for origin, probes in modules:
+            for spec in probes:
+                strategy = spec.get("strategy", "path")
+                argument = spec.get(self.STRATEGIES.get(strategy, ""))
+                if not spec.get("name") or not argument:
+                    logger.warning("Skipping invalid probe in %s: %s", origin, spec)
+                    continue
+                try:
+                    if spec.get("version_regex"):
+                        compile_version_regex(spec["version_regex"])
+                except re.error as e:
+                    logger.warning("Skipping probe %s in %s: bad version_regex: %s", spec['name'], origin, e)
+                    continue
+                # Results, history and the UI are keyed by tool name, so a name may only
+                # be defined once across the catalog and all plugin categories loaded so far
+                owner = self._names.get(spec["name"])
+                if owner is None and spec["name"] in builtin:
+                    owner = "the built-in catalog"
+                if owner is not None:
+                    logger.warning("Skipping probe %s in %s: already defined in %s", spec['name'], origin, owner)
+                    continue
+                self._names[spec["name"]] = category
+                self._probes[(category, spec["name"])] = dict(spec, strategy=strategy)
+                if spec.get("install"):
+                    TOOL_PACKAGES.setdefault(spec["name"], spec["install"])
+                tools.append((argument, spec["name"], category, "plugin"))
+        return tools
+
+    def tools(self, categories=None):
+        """Catalog entries for the plugins in the given categories (all if None)"""
+        wanted = self.categories() if categories is None else categories
+        result = []
+        with self._lock:
+            for category in wanted:
+                if category not in self._loaded:
+                    self._tools[category] = self._load_category(category)
+                    self._loaded.add(category)
+                result.extend(self._tools[category])
+        return result
+
+    def loaded_tools(self):
+        """Catalog entries of the categories imported so far"""
+        with self._lock:
+            return [tool for category in sorted(self._loaded) for tool in self._tools[category]]
+
+    def strategy(self, name, category):
+        """Strategy of a loaded plugin probe, None if unknown"""
+        spec = self._probes.get((category, name))
+        return spec["strategy"] if spec else None
+
+    def probe(self, name, category, engine, timeout):
+        """Run a plugin probe, return a (version, status, category) result"""
+        spec = self._probes[(category, name)]
+        strategy = spec["strategy"]
+        pattern = spec.get("version_regex")
+        if strategy == "path":
+            returncode, output = engine.run_probe(engine.prepare_command(spec["command"], "version"), timeout,
+                                                   usage_key=name)
+            if returncode != 0:
+                return "Not installed", "not_installed", category
+        elif strategy == "package":
+            returncode, output = engine.run_probe(
+                f"dpkg-query -W -f='${{db:Status-Status}} ${{Version}}\\n' {shlex.quote(spec['package'])}", timeout,
+                usage_key=name)
+            if returncode != 0 or not output.startswith("installed "):
+                return "Not installed", "not_installed", category
+            output = output.split(" ", 1)[1]
+        elif strategy == "file":
+            try:
+                with open(os.path.expanduser(spec["path"]), 'r', errors='replace') as f:
+                    output = f.read(65536)
+            except OSError:
+                return "Not installed", "not_installed", category
+        elif strategy == "env":
+            output = os.environ.get(spec["env"])
+            if output is None:
+                return "Not set", "not_installed", category
+        else:
+            return f"Error: unknown strategy {strategy}", "not_installed", category
+        return extract_version(output, pattern) or "Installed", "installed", category
+
+PROBE_PLUGINS = ProbePluginRegistry()
+
+def catalog_tools(categories=None):
+    """Built-in catalog plus plugin probes, optionally limited to some categories"""
+    builtin = [tool for tool in TOOL_CATALOG if categories is None or tool[2] in categories]
+    return builtin + PROBE_PLUGINS.tools(categories)
+
+def select_tools(categories=None, names=None):
+    """Catalog entries for a partial scan: the given categories and/or tool names (case-insensitive)
+
+    Only the plugins of the requested categories are imported; a tool name that is
+    neither built in nor from an already imported plugin loads all of them.
+    Raises ValueError naming the valid choices when a category or tool is unknown or nothing matches.
+    """
+    if categories:
+        valid = sorted({tool[2] for tool in TOOL_CATALOG} | set(PROBE_PLUGINS.categories()))
+        unknown = [category for category in categories if category not in valid]
+        if unknown:
+            raise ValueError(f"Unknown category: {', '.join(unknown)}\nValid categories: {', '.join(valid)}")
+        tools = catalog_tools(categories)
+    else:
+        tools = TOOL_CATALOG + PROBE_PLUGINS.loaded_tools()
+    if names:
+        wanted = {name.lower() for name in names}
+        known = {tool[1].lower() for tool in TOOL_CATALOG + PROBE_PLUGINS.loaded_tools()}
+        if not wanted <= known:
+            everything = catalog_tools()
+            valid = [tool[1] for tool in everything]
+            known = {name.lower() for name in valid}
+            unknown = [name for name in names if name.lower() not in known]
+            if unknown:
+                raise ValueError(f"Unknown tool: {', '.join(unknown)}\nValid tools: {', '.join(valid)}")
+            if not categories:
+                tools = everything
+        tools = [tool for tool in tools if tool[1].lower() in wanted]
+    if not tools:
+        if names and categories:
+            raise ValueError(f"No tool named {', '.join(names)} in {', '.join(categories)}")
+        raise ValueError(f"No tools in {', '.join(categories or names)}")
+    return tools
+
+def merge_results(existing, updates, categories=None):
+    """Merge a partial scan into a previous result set
+
+    Rows are updated by tool name in place and new tools are appended. Rows of
+    fully rescanned categories that the new scan no longer reports are dropped.
+    """
+    if categories:
+        updated = {row[0] for row in updates}
+        existing = [row for row in existing if row[3] not in categories or row[0] in updated]
+    position = {row[0]: index for index, row in enumerate(existing)}
+    merged = list(existing)
+    for row in updates:
+        if row[0] in position:
+            merged[position[row[0]]] = row
+        else:
+            position[row[0]] = len(merged)
+            merged.append(row)
+    return merged
+
+def _returncode(status):
+    """Popen-style return code of an os.wait4() status: the exit code, or -N if killed by signal N"""
+    if os.WIFEXITED(status):
+        return os.WEXITSTATUS(status)
+    return -os.WTERMSIG(status)
+
+class ScanCancelled(Exception):
+    """Raised by ProbeEngine.run_scan when the scan is cancelled, carries the partial results"""
+    def __init__(self, results=None):
+        super().__init__("Scan cancelled")
+        self.results = results or []
+
+class ProbeEngine:
+    """Runs tool probes, reusing cached results for binaries that have not changed"""
+    # Budgets used until enough timings have been recorded for a tool
+    DEFAULT_TIMEOUTS = {"which": 5}
+    DEFAULT_TIMEOUT = 10
+    # Search path and inherited variables of isolated probes
+    ISOLATED_PATH = "/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin"
+    ISOLATED_PASSTHROUGH = ("HOME", "USER", "LOGNAME", "TMPDIR")
+
+    def __init__(self, cache=None, history=None, output_limit=4096, exit_grace=0.5,
+                 min_deadline=0.3, deadline_factor=3.0, retry_factor=4.0, batch=False, static=False,
+                 version_managers=True, plugins=None, isolated=False):
+        self.cache = cache if cache is not None else ProbeCache()
+        self.plugins = plugins if plugins is not None else PROBE_PLUGINS
+        # Also report versions installed through pyenv, nvm, sdkman, rustup and asdf
+        self.version_index = VersionManagerIndex() if version_managers else None
+        # Read versions of supported tools from their files instead of running them
+        self.static_detector = StaticVersionDetector() if static else None
+        # Run all uncached probes from a single shell (see BatchProbeRunner)
+        self.batch = batch
+        # Learned deadlines: factor * p99 of past durations, never below min_deadline.
+        # A probe that misses it is retried once with retry_factor times the deadline.
+        self.history = history
+        self.min_deadline = min_deadline
+        self.deadline_factor = deadline_factor
+        self.retry_factor = retry_factor
+        self.last_timings = {}
+        # tool name -> CPU seconds, max RSS and page faults of its probe process tree
+        self.last_usage = {}
+        # Probes run in their own process group so a timeout or cancel kills the whole tree.
+        # Reentrant: cancel() runs in SIGINT/SIGTERM handlers, which interrupt the main
+        # thread possibly while it holds the lock in run_probe or _record_usage.
+        self._active = set()
+        self._active_lock = threading.RLock()
+        self._cancel_event = threading.Event()
+        # Bytes of stdout read before giving up on finding a line break
+        self.output_limit = output_limit
+        # How long a probe may keep running once its first line has been read
+        self.exit_grace = exit_grace
+        # Run probes with a fixed minimal environment instead of the user's; tools are
+        # still located through the real PATH (see resolve_command)
+        self.isolated = isolated
+        self.probe_env = self.probe_environment() if isolated else None
+
+    @staticmethod
+    def _kill_group(proc):
+        """Kill a probe together with every process it started, return its rusage if reaped here"""
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        if proc.returncode is not None:
+            return None
+        try:
+            _, status, usage = os.wait4(proc.pid, 0)
+        except ChildProcessError:
+            proc.wait()
+            return None
+        proc.returncode = _returncode(status)
+        return usage
+
+    @staticmethod
+    def _kill_session(proc):
+        """Kill every process in a probe's session, including process groups it made of its own
+
+        Batch probes run under timeout(1), which moves them out of the batch shell's group.
+        Without /proc only the probe's own group is killed.
+        """
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            pids = [int(pid) for pid in os.listdir("/proc") if pid.isdigit()]
+        except OSError:
+            return
+        for pid in pids:
+            try:
+                if os.getsid(pid) == proc.pid:
+                    os.kill(pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    @staticmethod
+    def _wait(proc, timeout):
+        """Popen.wait() that reaps the probe with os.wait4, return (returncode, rusage)
+
+        The rusage covers the probe and every descendant it waited for, e.g. the
+        JVM behind a wrapper script. The exit is awaited on a pidfd, so the probe
+        is reaped as soon as it exits; kernels without pidfd_open fall back to polling.
+        """
+        try:
+            pidfd = os.pidfd_open(proc.pid)
+        except (AttributeError, OSError):
+            pidfd = None
+        if pidfd is not None:
+            try:
+                ready, _, _ = select.select([pidfd], [], [], timeout)
+            finally:
+                os.close(pidfd)
+            if not ready:
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = _returncode(status)
+            return proc.returncode, usage
+        deadline = time.monotonic() + timeout
+        delay = 0.0005
+        while True:
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                proc.returncode = _returncode(status)
+                return proc.returncode, usage
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.02)
+
+    def _record_usage(self, name, usage):
+        """Add a probe's rusage to last_usage, summing retries of the same tool
+
+        ru_maxrss (kilobytes) starts at the scanner's own RSS, which the forked child
+        carries into exec, so a peak at or below that is only an upper bound (rss_upper_bound).
+        """
+        floor = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        with self._active_lock:
+            entry = self.last_usage.setdefault(name, {"cpu": 0.0, "max_rss_kb": 0, "rss_upper_bound": True,
+                                                      "major_faults": 0, "minor_faults": 0})
+            entry["cpu"] = round(entry["cpu"] + usage.ru_utime + usage.ru_stime, 4)
+            entry["max_rss_kb"] = max(entry["max_rss_kb"], usage.ru_maxrss)
+            entry["rss_upper_bound"] = entry["max_rss_kb"] <= floor
+            entry["major_faults"] += usage.ru_majflt
+            entry["minor_faults"] += usage.ru_minflt
+
+    def cancel(self):
+        """Stop the running scan and kill all in-flight probes (safe to call from a signal handler)"""
+        self._cancel_event.set()
+        with self._active_lock:
+            active = list(self._active)
+        for proc in active:
+            self._kill_session(proc)
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    @classmethod
+    def probe_environment(cls):
+        """Environment of isolated probes: fixed PATH, C locale and nothing that hooks tool startup
+
+        Variables such as BASH_ENV, PYTHONSTARTUP, JAVA_TOOL_OPTIONS or NODE_OPTIONS are dropped.
+        """
+        env = {key: os.environ[key] for key in cls.ISOLATED_PASSTHROUGH if key in os.environ}
+        env.update(PATH=cls.ISOLATED_PATH, LC_ALL="C", LANG="C", TERM="dumb")
+        return env
+
+    def resolve_command(self, command):
+        """In isolated mode, replace the leading program name with its path in the real PATH
+
+        Returns the command and the directory the program was found in, None if not resolved.
+        """
+        if not self.isolated:
+            return command, None
+        executable, separator, arguments = command.partition(' ')
+        if not executable or '/' in executable:
+            return command, None
+        path = shutil.which(executable)
+        if not path:
+            return command, None
+        return f"{shlex.quote(path)}{separator}{arguments}", os.path.dirname(path)
+
+    def prepare_command(self, command, check_type):
+        """Command line run for a catalog entry, with the tool resolved as the user would see it
+
+        The resolved tool's directory goes in front of the isolated PATH, so shebang lines
+        such as #!/usr/bin/env node (nvm) and version manager shims find their interpreter.
+        """
+        resolved, directory = self.resolve_command(command)
+        prepared = self.probe_command(resolved, check_type)
+        return f'PATH={shlex.quote(directory)}:"$PATH" {prepared}' if directory else prepared
+
+    def _read_first_line(self, proc, deadline):
+        """Read stdout incrementally until the first non-empty line, EOF or the byte cap"""
+        fd = proc.stdout.fileno()
+        buf = b""
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(proc.args, 0)
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(fd, 1024)
+            if not chunk:
+                return buf.strip().split(b"\n")[0], False
+            buf += chunk
+            stripped = buf.lstrip()
+            if b"\n" in stripped:
+                return stripped.split(b"\n", 1)[0], True
+            if len(buf) >= self.output_limit:
+                return stripped[:self.output_limit], True
+
+    def run_probe(self, command, timeout, capture=True, usage_key=None):
+        """Run a probe and return (returncode, first output line)
+
+        Only the first meaningful stdout line is read and decoded; after that the
+        pipe is closed and a chatty tool is stopped instead of being drained.
+        With usage_key, the probe's resource usage is recorded in last_usage under it.
+        Plugin strategies run their commands through here with the timeout check_tool gives them.
+        """
+        if self.is_cancelled():
+            raise ScanCancelled()
+        proc = subprocess.Popen(command, shell=True, stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL, start_new_session=True, env=self.probe_env)
+        with self._active_lock:
+            self._active.add(proc)
+        deadline = time.monotonic() + timeout
+        line, truncated = b"", False
+        usage = None
+        try:
+            if capture:
+                line, truncated = self._read_first_line(proc, deadline)
+                # Further writes by the tool now fail with SIGPIPE
+                proc.stdout.close()
+            wait_for = deadline - time.monotonic()
+            if truncated:
+                wait_for = min(wait_for, self.exit_grace)
+            try:
+                returncode, usage = self._wait(proc, max(wait_for, 0))
+            except subprocess.TimeoutExpired:
+                if not truncated:
+                    raise
+                usage = self._kill_group(proc)
+                returncode = 0
+        except subprocess.TimeoutExpired:
+            usage = self._kill_group(proc)
+            raise
+        finally:
+            if proc.stdout and not proc.stdout.closed:
+                proc.stdout.close()
+            with self._active_lock:
+                self._active.discard(proc)
+            if usage_key and usage:
+                self._record_usage(usage_key, usage)
+        if self.is_cancelled():
+            raise ScanCancelled()
+        # Killed by the closed pipe after printing its version line
+        if truncated and returncode in (-signal.SIGPIPE, 128 + signal.SIGPIPE):
+            returncode = 0
+        return returncode, line.decode('utf-8', errors='replace').strip()
+
+    def default_timeout(self, check_type):
+        return self.DEFAULT_TIMEOUTS.get(check_type, self.DEFAULT_TIMEOUT)
+
+    def probe_deadline(self, name, check_type="version"):
+        """Deadline for a probe learned from its recorded p99 duration"""
+        default = self.default_timeout(check_type)
+        p99 = self.history.timing_percentile(name) if self.history else None
+        if p99 is None:
+            return default
+        return min(default, max(self.min_deadline, p99 * self.deadline_factor))
+
+    def _timed_check(self, command, name, category, check_type):
+        """Run a probe under its learned deadline, retrying once with a longer budget on timeout"""
+        default = self.default_timeout(check_type)
+        deadline = self.probe_deadline(name, check_type)
+        start = time.monotonic()
+        result = self.check_tool(command, name, category, check_type, timeout=deadline)
+        if result[0] == "Timeout" and deadline < default and self.retry_factor:
+            start = time.monotonic()
+            result = self.check_tool(command, name, category, check_type,
+                                     timeout=min(default, deadline * self.retry_factor))
+        if result[0] != "Timeout":
+            self.last_timings[name] = time.monotonic() - start
+        return result
+
+    @staticmethod
+    def interpret_probe(check_type, returncode, output, category):
+        """Map a probe's exit code and first output line to a (version, status, category) result"""
+        if check_type == "version":
+            if returncode == 0:
+                return output, "installed", category
+            else:
+                return "Not installed", "not_installed", category
+
+        elif check_type == "package":
+            if returncode == 0:
+                return "Installed", "installed", category
+            else:
+                return "Not installed", "not_installed", category
+
+        elif check_type == "which":
+            if returncode == 0:
+                return f"Found: {output}", "installed", category
+            else:
+                return "Not in PATH", "not_installed", category
+
+        elif check_type == "service":
+            if returncode == 0:
+                return "Available", "installed", category
+            else:
+                return "Not available", "not_installed", category
+
+        elif check_type == "snap":
+            if returncode == 0:
+                return "Snap installed", "installed", category
+            else:
+                return "Snap not installed", "not_installed", category
+
+    @staticmethod
+    def probe_command(command, check_type):
+        """Shell command line actually run for a catalog entry"""
+        return f"which {command}" if check_type == "which" else command
+
+    @traced("probe", "probe", lambda self, command, name, *args, **kwargs: {"tool": name, "command": command})
+    def check_tool(self, command, name, category="System", check_type="version", timeout=None):
+        if timeout is None:
+            timeout = self.default_timeout(check_type)
+        try:
+            # Only version and which probes report output, the rest just need the exit code
+            if check_type == "plugin":
+                return self.plugins.probe(name, category, self, timeout)
+            returncode, output = self.run_probe(self.prepare_command(command, check_type), timeout,
+                                                 capture=check_type in ("version", "which"), usage_key=name)
+            return self.interpret_probe(check_type, returncode, output, category)
+        except subprocess.TimeoutExpired:
+            return "Timeout", "not_installed", category
+        except ScanCancelled:
+            raise
+        except Exception as e:
+            return f"Error: {str(e)}", "not_installed", category
+
+    @traced("scan", "scan", lambda self, tools, *args, **kwargs: {"tools": len(tools)})
+    def run_scan(self, tools, use_cache=True, on_result=None):
+        """Probe every tool, only re-running probes whose binary changed since the last scan
+
+        on_result, if given, is called with each result tuple as soon as it is known.
+        """
+        self._cancel_event.clear()
+        self.last_timings = {}
+        self.last_usage = {}
+        results = [None] * len(tools)
+        fingerprints = [None] * len(tools)
+        pending = []
+        for index, (command, name, category, check_type) in enumerate(tools):
+            fingerprints[index] = self.cache.fingerprint(command, check_type)
+            # Output may differ under the isolated environment, keep the two apart in the cache
+            if self.isolated and fingerprints[index]:
+                fingerprints[index] = fingerprints[index] + ["isolated"]
+            # Plugin probes may not run a binary at all, there is nothing to fingerprint
+            cached = None
+            if use_cache and check_type != "plugin":
+                cached = self.cache.lookup(command, check_type, fingerprints[index])
+            if cached:
+                version, status = cached
+                results[index] = (name, version, status, category)
+                if on_result:
+                    on_result(results[index])
+            else:
+                pending.append(index)
+
+        if self.static_detector:
+            pending = self._detect_static(tools, pending, fingerprints, results, on_result)
+
+        # Entries that run the same binary with the same arguments are probed once
+        pending, aliases = self._dedupe_aliases(tools, pending)
+
+        try:
+            if self.batch and pending:
+                # Plugin probes run in-process, after the batched shell probes
+                batched = [index for index in pending if tools[index][3] != "plugin"]
+                plugin = [index for index in pending if tools[index][3] == "plugin"]
+                pending = batched + plugin
+                probed = itertools.chain(BatchProbeRunner(self).run([tools[index] for index in batched]),
+                                         (self._timed_check(*tools[index]) for index in plugin))
+            else:
+                probed = (self._timed_check(*tools[index]) for index in pending)
+            for probed_index, (version, status, _) in zip(pending, probed):
+                for index in [probed_index] + aliases.get(probed_index, []):
+                    command, name, category, check_type = tools[index]
+                    # Timeouts and errors are transient, probe again next time
+                    if version != "Timeout" and not str(version).startswith("Error:") and check_type != "plugin":
+                        self.cache.store(command, check_type, fingerprints[index], version, status)
+                    results[index] = (name, version, status, category)
+                    if on_result:
+                        on_result(results[index])
+        except ScanCancelled:
+            self.cache.save()
+            raise ScanCancelled([r for r in results if r is not None])
+        self.cache.save()
+        if self.version_index:
+            # Only tools that were scanned, plus unlisted tools of categories scanned in full
+            names = {name for _, name, _, _ in tools}
+            scanned = {category for _, _, category, _ in tools}
+            complete = {category for category in scanned
+                        if all(name in names for _, name, tool_category, _ in TOOL_CATALOG
+                               if tool_category == category)}
+            managed = self.version_index.results(complete, names)
+            results.extend(managed)
+            if on_result:
+                for result in managed:
+                    on_result(result)
+        return results
+
+    @staticmethod
+    def alias_key(command, check_type):
+        """Canonical (binary, arguments) a version probe runs, or None if it cannot be shared
+
+        When the resolved file's name is unrelated to the invoked name (gcc -> ccache,
+        tar -> busybox) the binary may dispatch on argv[0], so the invoked name is kept
+        in the key and such entries are never merged.
+        """
+        if check_type != "version":
+            return None
+        executable, _, arguments = command.partition(' ')
+        path = shutil.which(executable)
+        if not path:
+            return None
+        real = os.path.realpath(path)
+        invoked = os.path.basename(executable)
+        if not os.path.basename(real).startswith(invoked.rstrip('0123456789.')):
+            return real, invoked, arguments.strip()
+        return real, None, arguments.strip()
+
+    def _dedupe_aliases(self, tools, pending):
+        """Keep one index per distinct probe, return it and {kept index: [alias indexes]}"""
+        unique, aliases, first = [], {}, {}
+        for index in pending:
+            command, _, _, check_type = tools[index]
+            key = self.alias_key(command, check_type)
+            if key is not None and key in first:
+                aliases.setdefault(first[key], []).append(index)
+                continue
+            if key is not None:
+                first[key] = index
+            unique.append(index)
+        return unique, aliases
+
+    def _detect_static(self, tools, pending, fingerprints, results, on_result=None):
+        """Fill in results readable without executing the tool, return the indexes still to probe"""
+        still_pending = []
+        for index in pending:
+            command, name, category, check_type = tools[index]
+            version = self.static_detector.detect(name, command) if check_type == "version" else None
+            if version:
+                self.cache.store(command, check_type, fingerprints[index], version, "installed")
+                results[index] = (name, version, "installed", category)
+                if on_result:
+                    on_result(results[index])
+            else:
+                still_pending.append(index)
+        return still_pending
+
+class BatchProbeRunner:
+    """Runs many probes from one generated /bin/sh script instead of one process launch each
+
+    Every probe is written back as a framed block (exit code, timeout marker, start/end time,
+    stdout, stderr) delimited by a random boundary, and parsed into the usual result tuples.
+    """
+    SCRIPT_HEADER = """d=$(mktemp -d) || exit 1
+# The batch runs in a session of its own: take down whatever probes left behind in its group
+trap 'rm -rf "$d"; kill -9 0' EXIT
+B=%(boundary)s
+L=%(limit)d
+# timeout(1) gives each probe a process group and kills the whole group at the deadline
+if timeout 1 true >/dev/null 2>&1; then T=1; else T=; fi
+# Records the probe's own exit code once it returns, so a status file is only missing when the
+# deadline killed the probe; a probe exiting 124 or 137 by itself is not taken for a timeout
+W='/bin/sh -c "$1"; echo $? >"$2"'
+probe() {
+    s=$(date +%%s%%N)
+    rm -f "$d/r"
+    if [ -n "$T" ]; then
+        timeout -k 1 "$2" /bin/sh -c "$W" probe "$3" "$d/r" >"$d/o" 2>"$d/e" </dev/null &
+        p=$!
+        wait $p
+        rc=$?
+        kill -9 -$p 2>/dev/null
+    else
+        # No timeout(1): a watchdog kills the probe, its children are left to the EXIT trap
+        /bin/sh -c "$W" probe "$3" "$d/r" >"$d/o" 2>"$d/e" </dev/null &
+        p=$!
+        (sleep "$2"; kill -9 $p) 2>/dev/null &
+        w=$!
+        wait $p
+        rc=$?
+        kill $w 2>/dev/null
+    fi
+    if [ -s "$d/r" ]; then read rc <"$d/r"; t=0; else t=1; fi
+    printf '%%s BEGIN %%s %%s %%s %%s %%s\\n' "$B" "$1" "$rc" "$t" "$s" "$(date +%%s%%N)"
+    head -c "$L" "$d/o"
+    printf '\\n%%s STDERR\\n' "$B"
+    head -c "$L" "$d/e"
+    printf '\\n%%s END\\n' "$B"
+}
+"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.boundary = f"@@DEVSCAN-{uuid.uuid4().hex}"
+
+    def build_script(self, tools):
+        """Generate the shell script probing every (command, name, category, check_type) entry"""
+        lines = [self.SCRIPT_HEADER % {'boundary': self.boundary, 'limit': self.engine.output_limit}]
+        for index, (command, name, category, check_type) in enumerate(tools):
+            deadline = self.engine.probe_deadline(name, check_type)
+            probe_command = self.engine.prepare_command(command, check_type)
+            lines.append(f"probe {index} {deadline:.3f} {shlex.quote(probe_command)}\n")
+        return "".join(lines)
+
+    def parse_output(self, output):
+        """Split framed script output into {index: (returncode, timed_out, stdout, stderr, elapsed)}"""
+        frames = {}
+        begin = f"{self.boundary} BEGIN "
+        for block in output.split(begin)[1:]:
+            header, _, body = block.partition("\n")
+            index, returncode, timed_out, started, finished = header.split()
+            stdout, _, rest = body.partition(f"\n{self.boundary} STDERR\n")
+            stderr = rest.split(f"\n{self.boundary} END\n", 1)[0]
+            try:
+                elapsed = (int(finished) - int(started)) / 1e9
+            except ValueError:
+                # date without %N support
+                elapsed = None
+            frames[int(index)] = (int(returncode), timed_out == "1", stdout, stderr, elapsed)
+        return frames
+
+    @traced("probe batch", "probe", lambda self, tools: {"tools": len(tools)})
+    def run(self, tools):
+        """Probe all tools in one shell and return (version, status, category) per tool"""
+        engine = self.engine
+        script = self.build_script(tools)
+        budget = sum(engine.probe_deadline(name, check_type) + 1 for _, name, _, check_type in tools)
+        proc = subprocess.Popen(["/bin/sh", "-s"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, start_new_session=True, env=engine.probe_env)
+        with engine._active_lock:
+            engine._active.add(proc)
+        try:
+            output, _ = proc.communicate(script.encode('utf-8'), timeout=budget)
+        except subprocess.TimeoutExpired:
+            engine._kill_session(proc)
+            engine._kill_group(proc)
+            # Keep the frames of the probes that finished before the budget ran out
+            output, _ = proc.communicate()
+        finally:
+            with engine._active_lock:
+                engine._active.discard(proc)
+        if engine.is_cancelled():
+            raise ScanCancelled()
+
+        frames = self.parse_output(output.decode('utf-8', errors='replace'))
+        results = []
+        timed_out, not_run = [], []
+        for index, (command, name, category, check_type) in enumerate(tools):
+            frame = frames.get(index)
+            if frame is None:
+                # The script ran out of budget before reporting this probe
+                results.append(("Timeout", "not_installed", category))
+                not_run.append(index)
+                continue
+            returncode, killed, stdout, stderr, elapsed = frame
+            if killed:
+                results.append(("Timeout", "not_installed", category))
+                timed_out.append(index)
+                continue
+            first_line = stdout.strip().split("\n")[0]
+            results.append(engine.interpret_probe(check_type, returncode, first_line, category))
+            if elapsed is not None:
+                engine.last_timings[name] = elapsed
+        for index in timed_out:
+            results[index] = self.retry(*tools[index])
+        for index in not_run:
+            results[index] = engine._timed_check(*tools[index])
+        return results
+
+    def retry(self, command, name, category, check_type):
+        """Give a probe that missed its learned deadline in the batch the single-probe retry budget"""
+        engine = self.engine
+        default = engine.default_timeout(check_type)
+        deadline = engine.probe_deadline(name, check_type)
+        if deadline >= default or not engine.retry_factor:
+            return "Timeout", "not_installed", category
+        start = time.monotonic()
+        result = engine.check_tool(command, name, category, check_type,
+                                   timeout=min(default, deadline * engine.retry_factor))
+        if result[0] != "Timeout":
+            engine.last_timings[name] = time.monotonic() - start
+        return result
+
+class SelectionModel:
+    """Bitset-backed selection over scan results, with an incremental search view"""
+    def __init__(self, results):
+        categories = {}
+        for name, version, status, category in results:
+            categories.setdefault(category, []).append((name, version, status, category))
+        self.rows = [row for rows in categories.values() for row in rows]
+        self._keys = [f"{name} {version} {category}".lower() for name, version, status, category in self.rows]
+        self.all_mask = (1 << len(self.rows)) - 1
+        self.installed_mask = self._mask(i for i, row in enumerate(self.rows) if row[2] == "installed")
+        self.bits = self.all_mask
+        self.query = ""
+        self.view = list(range(len(self.rows)))
+        self.view_mask = self.all_mask
+
+    def _mask(self, indices):
+        flags = ['0'] * len(self.rows)
+        for i in indices:
+            flags[i] = '1'
+        return int(''.join(reversed(flags)), 2) if flags else 0
+
+    def filter(self, query):
+        """Narrow the view to rows matching query; extending the previous query only rescans the current view"""
+        query = query.strip().lower()
+        candidates = self.view if self.query and query.startswith(self.query) else range(len(self.rows))
+        self.view = [i for i in candidates if query in self._keys[i]]
+        self.view_mask = self._mask(self.view) if query else self.all_mask
+        self.query = query
+        return self.view
+
+    def select_all(self):
+        self.bits |= self.view_mask
+
+    def select_none(self):
+        self.bits &= ~self.view_mask
+
+    def select_installed(self):
+        self.bits = (self.bits & ~self.view_mask) | (self.installed_mask & self.view_mask)
+
+    def toggle(self, index):
+        self.bits ^= 1 << index
+
+    def is_selected(self, index):
+        return bool(self.bits >> index & 1)
+
+    def count(self):
+        return bin(self.bits).count('1')
+
+    def selected(self):
+        bits = self.bits
+        return [row for i, row in enumerate(self.rows) if bits >> i & 1]
+
+class VirtualSelectionList:
+    """Canvas list that only draws the rows currently in view"""
+    ROW_HEIGHT = 24
+
+    def __init__(self, parent, model, on_change=None):
+        self.model = model
+        self.on_change = on_change
+        self.offset = 0
+        self.items = []
+        self.canvas = tk.Canvas(parent, bg='#1e1e1e', highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._on_scrollbar)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-4>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-5>", self._on_mouse_wheel)
+        self.refresh()
+
+    def refresh(self):
+        """Rebuild the item list (category headers plus rows) from the model's current view"""
+        self.items = []
+        current = None
+        for index in self.model.view:
+            category = self.model.rows[index][3]
+            if category != current:
+                self.items.append(('header', category))
+                current = category
+            self.items.append(('row', index))
+        self.offset = 0
+        self.redraw()
+
+    def _max_offset(self):
+        return max(0, len(self.items) * self.ROW_HEIGHT - self.canvas.winfo_height())
+
+    def redraw(self):
+        canvas = self.canvas
+        canvas.delete("all")
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        self.offset = min(self.offset, self._max_offset())
+        first = self.offset // self.ROW_HEIGHT
+        last = min(len(self.items), (self.offset + height) // self.ROW_HEIGHT + 1)
+        for position in range(first, last):
+            kind, value = self.items[position]
+            y = position * self.ROW_HEIGHT - self.offset
+            if kind == 'header':
+                canvas.create_rectangle(5, y + 2, width - 5, y + self.ROW_HEIGHT, fill='#3a3a3a', outline='')
+                canvas.create_text(15, y + 13, text=value, anchor='w', fill='#ffffff',
+                                   font=("Ubuntu", 10, "bold"))
+                continue
+            name, version, status, category = self.model.rows[value]
+            box = "☑" if self.model.is_selected(value) else "☐"
+            status_icon = "✅" if status == "installed" else "❌"
+            canvas.create_rectangle(5, y + 1, width - 5, y + self.ROW_HEIGHT - 1, fill='#2d2d2d', outline='')
+            canvas.create_text(15, y + 12, text=f"{box}  {status_icon} {name}: {version}", anchor='w',
+                               fill='#ffffff', font=("Ubuntu", 9))
+        total = len(self.items) * self.ROW_HEIGHT
+        if total <= height:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + height) / total)
+
+    def _scroll_to(self, offset):
+        self.offset = max(0, min(int(offset), self._max_offset()))
+        self.redraw()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(amount) * len(self.items) * self.ROW_HEIGHT)
+        elif unit == "pages":
+            self._scroll_to(self.offset + int(amount) * self.canvas.winfo_height())
+        else:
+            self._scroll_to(self.offset + int(amount) * self.ROW_HEIGHT)
+
+    def _on_mouse_wheel(self, event):
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        else:
+            step = int(-1 * (event.delta / 120))
+        self._scroll_to(self.offset + step * 3 * self.ROW_HEIGHT)
+
+    def _on_click(self, event):
+        position = (self.offset + event.y) // self.ROW_HEIGHT
+        if 0 <= position < len(self.items) and self.items[position][0] == 'row':
+            self.model.toggle(self.items[position][1])
+            self.redraw()
+            if self.on_change:
+                self.on_change()
+
+def process_age():
+    """Seconds since this process was started, from /proc (None if unavailable)"""
+    try:
+        with open('/proc/self/stat', 'r') as f:
+            # The command name may contain spaces, fields are counted from after it
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime', 'r') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+class StartupProfiler:
+    """Records wall-clock phases of application startup for --profile-startup"""
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.phases = []
+        self._open = {}
+
+    def record(self, name, start, end, depth=0):
+        if self.enabled:
+            self.phases.append({
+                "name": name,
+                "start_ms": round((start - _IMPORTS_STARTED) * 1000, 2),
+                "duration_ms": round((end - start) * 1000, 2),
+                "depth": depth
+            })
+
+    def begin(self, name):
+        if self.enabled:
+            self._open[name] = (time.perf_counter(), len(self._open))
+
+    def end(self, name):
+        if name in self._open:
+            start, depth = self._open.pop(name)
+            self.record(name, start, time.perf_counter(), depth)
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def report(self):
+        now = time.perf_counter()
+        age = process_age()
+        return {
+            "app": APP_NAME,
+            "version": APP_VERSION,
+            "python": platform.python_version(),
+            "hostname": platform.node(),
+            "generated": datetime.datetime.now().isoformat(),
+            # Interpreter startup before this module began importing (10 ms resolution)
+            "interpreter_ms": round((age - (now - _IMPORTS_STARTED)) * 1000, 1) if age is not None else None,
+            "total_ms": round((now - _IMPORTS_STARTED) * 1000, 2),
+            "phases": sorted(self.phases, key=lambda phase: (phase["start_ms"], phase["depth"]))
+        }
+
+class UIUpdateCoalescer:
+    """Buffers items pushed from worker threads and hands them to the Tk loop in batches
+
+    At most one flush is scheduled at a time and flushes are spaced at least interval_ms
+    apart, so a fast producer costs one after() callback per frame instead of one per item.
+    """
+    def __init__(self, root, apply_batch, interval_ms=16):
+        self.root = root
+        self.apply_batch = apply_batch
+        self.interval_ms = interval_ms
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._last_flush = 0.0
+
+    def push(self, item):
+        with self._lock:
+            self._buffer.append(item)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.root.after(self._delay(), self._flush)
+
+    def _delay(self):
+        elapsed_ms = (time.monotonic() - self._last_flush) * 1000
+        return max(0, int(self.interval_ms - elapsed_ms))
+
+    def _flush(self):
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            self._scheduled = False
+        self._last_flush = time.monotonic()
+        if batch:
+            self.apply_batch(batch)
+
+    def flush(self):
+        """Apply anything still buffered right away (call from the Tk thread)"""
+        self._flush()
+
+    def discard(self):
+        with self._lock:
+            self._buffer = []
+
 class DevScanPro:
-    def __init__(self, root):
+    def __init__(self, root, profiler=None):
+        self.profiler = profiler or StartupProfiler(enabled=False)
+        self.profiler.begin("DevScanPro.__init__")
         self.root = root
         self.root.title("DevScan Pro - Professional Development Tools Scanner")
         self.root.geometry("1000x750")
         self.root.configure(bg='#2b2b2b')
         
         # Application info
-        self.app_name = "DevScan Pro"
-        self.version = "1.0.0"
-        self.vendor = "DevScan Pro"
+        self.app_name = APP_NAME
+        self.version = APP_VERSION
+        self.vendor = APP_NAME
         
         # License management
-        self.license_file = "licenses/trial_data.json"
-        self.activation_file = "licenses/activation.json"
-        self.licenses_dir = "licenses"
+        self.license_file = APP_DATA_DIR / "trial_data.json"
+        # Older versions kept trial data relative to the working directory
+        self.legacy_license_file = "licenses/trial_data.json"
+        self.trial_store = StateStore(self.license_file)
         self.license_validator = LicenseValidator()
-        
-        # Create licenses directory if it doesn't exist
-        os.makedirs(self.licenses_dir, exist_ok=True)
+        # Revocation is detected on a timer thread - hand over to the Tk event loop
+        self.license_validator.on_revoked = lambda: self.root.after(0, self._on_license_revoked)
         
         # Initialize license system
         self.trial_days = 30
         self.max_exports = 5
-        self.initialize_license_system()
+        with self.profiler.phase("initialize_license_system"):
+            self.initialize_license_system()
         
         # Detect Ubuntu version
-        self.ubuntu_version = self.get_ubuntu_version()
+        with self.profiler.phase("get_ubuntu_version"):
+            self.ubuntu_version = self.get_ubuntu_version()
+        
+        # Probe engine, scan history and periodic refresh
+        self.scan_history = ScanHistory()
+        self.probe_engine = ProbeEngine(history=self.scan_history)
+        self.scan_in_progress = False
+        self.auto_refresh_interval = 300
+        # Created when auto-refresh is first enabled
+        self.scheduler = None
+        
+        # Streamed results are applied to the UI in batches, at most once per frame
+        self.ui_frame_interval = 16
+        self.result_updates = UIUpdateCoalescer(self.root, self._append_results, self.ui_frame_interval)
+        self.scrollregion_pending = False
+        self.live_sections = {}
+        # Rows streamed so far by a full scan, None while no full scan streams results
+        self.live_results = None
+        self.live_checked = 0
+        self.live_installed = 0
         
         # Package manager mappings
         self.package_manager_commands = {
             'apt': 'sudo apt install',
-            'snap': 'sudo snap install',
-            'pip': 'pip install',
-            'pip3': 'pip3 install',
-            'npm': 'npm install -g',
-            'cargo': 'cargo install'
-        }
-        
-        # Tool to package mappings
-        self.tool_packages = {
-            # Programming Languages
-            "Python 3": {"package": "python3", "manager": "apt"},
-            "Python": {"package": "python", "manager": "apt"},
-            "Node.js": {"package": "nodejs", "manager": "apt"},
-            "npm": {"package": "npm", "manager": "apt"},
-            "npx": {"package": "npm", "manager": "apt"},  # Comes with npm
-            "Java": {"package": "default-jdk", "manager": "apt"},
-            "PHP": {"package": "php", "manager": "apt"},
-            "Go": {"package": "golang", "manager": "apt"},
-            "Ruby": {"package": "ruby", "manager": "apt"},
-            "Perl": {"package": "perl", "manager": "apt"},
-            "Rust": {"package": "rustc", "manager": "apt"},
-            
-            # Build Tools
-            "Git": {"package": "git", "manager": "apt"},
-            "GNU Make": {"package": "make", "manager": "apt"},
-            "GCC": {"package": "gcc", "manager": "apt"},
-            "G++": {"package": "g++", "manager": "apt"},
-            "CMake": {"package": "cmake", "manager": "apt"},
-            "pip": {"package": "python3-pip", "manager": "apt"},
-            "pip3": {"package": "python3-pip", "manager": "apt"},
-           
-            # Containers & Virtualization
-            "Docker": {"package": "docker.io", "manager": "apt"},
-            "Docker Compose": {"package": "docker-compose", "manager": "apt"},
-            "Podman": {"package": "podman", "manager": "apt"},
-            "Kubernetes CLI": {"package": "kubectl", "manager": "snap"},
-            "Vagrant": {"package": "vagrant", "manager": "apt"},
-            
-            # Editors & IDEs
-            "VS Code": {"package": "code", "manager": "snap"},
-            "Vim": {"package": "vim", "manager": "apt"},
-            "Nano": {"package": "nano", "manager": "apt"},
-            "Emacs": {"package": "emacs", "manager": "apt"},
-            
-            # Databases
-            "PostgreSQL": {"package": "postgresql", "manager": "apt"},
-            "MySQL": {"package": "mysql-server", "manager": "apt"},
-            "SQLite": {"package": "sqlite3", "manager": "apt"},
-            "MongoDB": {"package": "mongodb", "manager": "apt"},
-            
-            # System Tools
-            "cURL": {"package": "curl", "manager": "apt"},
-            "Wget": {"package": "wget", "manager": "apt"},
-            "rsync": {"package": "rsync", "manager": "apt"},
-            "tar": {"package": "tar", "manager": "apt"},
-            
-            # Package Managers
-            "APT": {"package": "apt", "manager": "apt"},
-            "Snap": {"package": "snapd", "manager": "apt"},
-            "Flatpak": {"package": "flatpak", "manager": "apt"},
-            
-            # Networking
-            "netstat": {"package": "net-tools", "manager": "apt"},
-            "iproute2": {"package": "iproute2", "manager": "apt"},
-            "Nmap": {"package": "nmap", "manager": "apt"},
-            
-            # Development Tools
-            "Gitk": {"package": "git", "manager": "apt"},  # Comes with git
-            "Git GUI": {"package": "git", "manager": "apt"},  # Comes with git
-            "Meld": {"package": "meld", "manager": "apt"},
+            'snap': 'sudo snap install',
+            'pip': 'pip install',
+            'pip3': 'pip3 install',
+            'npm': 'npm install -g',
+            'cargo': 'cargo install'
         }
         
+        # Tool to package mappings
+        self.tool_packages = TOOL_PACKAGES
+        
         # Create main frame
+        self.profiler.begin("widgets")
         main_frame = ttk.Frame(root, padding="20")
         main_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -271,6 +3503,30 @@ class DevScanPro:
                                   padx=15, pady=8)
         self.check_btn.pack(side=tk.LEFT, padx=(0, 10))
 
+        # Cancel button (active only while scanning)
+        self.cancel_btn = tk.Button(button_frame, text="⏹ Cancel Scan", 
+                                   command=self.cancel_scan,
+                                   bg='#dc3545', fg='white',
+                                   font=("Ubuntu", 12, "bold"),
+                                   padx=15, pady=8, state='disabled')
+        self.cancel_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+        # Project scan button
+        self.project_btn = tk.Button(button_frame, text="📁 Scan Project", 
+                                    command=self.scan_project,
+                                    bg='#795548', fg='white',
+                                    font=("Ubuntu", 12, "bold"),
+                                    padx=15, pady=8)
+        self.project_btn.pack(side=tk.LEFT, padx=(0, 10))
+
+        # Rescan only the category selected in the filter
+        self.category_btn = tk.Button(button_frame, text="🎯 Rescan Category", 
+                                     command=self.rescan_category,
+                                     bg='#607d8b', fg='white',
+                                     font=("Ubuntu", 12, "bold"),
+                                     padx=15, pady=8)
+        self.category_btn.pack(side=tk.LEFT, padx=(0, 10))
+
         # Export button
         self.export_btn = tk.Button(button_frame, text="💾 Export Report", 
                                    command=self.export_to_file,
@@ -311,6 +3567,14 @@ class DevScanPro:
                                             padx=15, pady=8)
         self.selective_export_btn.pack(side=tk.LEFT, padx=(0, 10))
         
+        # Multi-format export button
+        self.export_all_btn = tk.Button(button_frame, text="🗂 Export All Formats", 
+                                       command=self.export_all_formats,
+                                       bg='#3f51b5', fg='white',
+                                       font=("Ubuntu", 12, "bold"),
+                                       padx=15, pady=8)
+        self.export_all_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
         # License activation text box (replaces the license button)
         license_activation_frame = tk.Frame(button_frame, bg='#2d2d2d')
         license_activation_frame.pack(side=tk.LEFT, padx=5)
@@ -343,11 +3607,19 @@ class DevScanPro:
 
         self.filter_var = tk.StringVar(value="All")
         categories = ["All", "Programming", "Build Tools", "Containers", "System", "Editors", "Databases", "Networking"]
+        categories += [category for category in PROBE_PLUGINS.categories() if category not in categories]
         for category in categories:
             tk.Radiobutton(filter_frame, text=category, variable=self.filter_var, 
                           value=category, bg='#2b2b2b', fg='#ffffff',
                           selectcolor='#2b2b2b', font=("Ubuntu", 9),
                           command=self.apply_filter).pack(side=tk.LEFT, padx=5)
+
+        # Periodic background refresh
+        self.auto_refresh_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(filter_frame, text=f"⏱ Auto-refresh ({self.auto_refresh_interval // 60} min)",
+                      variable=self.auto_refresh_var, command=self.toggle_auto_refresh,
+                      bg='#2b2b2b', fg='#ffffff', selectcolor='#2b2b2b',
+                      font=("Ubuntu", 9)).pack(side=tk.RIGHT, padx=5)
             
             # Results frame with scrollbar
         results_container = ttk.Frame(main_frame)
@@ -382,7 +3654,11 @@ class DevScanPro:
         # Store results for export/copy
         self.current_results = []
         self.all_results = []
-        self.tool_checkboxes = {}  # NEW: Store checkboxes for selective export
+        self.profiler.end("widgets")
+        
+        # Kill running probes when the window is closed
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.profiler.end("DevScanPro.__init__")
         
         # Auto-check on startup
         self.root.after(1000, self.check_tools)
@@ -462,43 +3738,68 @@ class DevScanPro:
         self.status_label.config(text="Ready to check development tools", fg='#00ff00')
 
     # LICENSE SYSTEM METHODS
+    @traced("license init", "license")
     def initialize_license_system(self):
         """Initialize or load trial data"""
-        print("DEBUG: Initializing license system...")
+        logger.debug("Initializing license system...")
         
-        # Create licenses directory if it doesn't exist
-        os.makedirs(self.licenses_dir, exist_ok=True)
+        if not self.trial_store.data and os.path.exists(self.legacy_license_file):
+            try:
+                with open(self.legacy_license_file, 'r') as f:
+                    self.trial_store.update(json.load(f))
+                self.trial_store.flush()
+                logger.info("Migrated license data from %s", self.legacy_license_file)
+            except Exception as e:
+                logger.warning("Error migrating license file: %s", e)
         
-        if os.path.exists(self.license_file):
+        if self.trial_store.data:
             try:
-                with open(self.license_file, 'r') as f:
-                    data = json.load(f)
-                    self.first_run = data.get('first_run', datetime.datetime.now().isoformat())
-                    self.export_count = data.get('export_count', 0)
-                    self.activated = data.get('activated', False)
-                    self.license_key = data.get('license_key', '')
-                print(f"DEBUG: Loaded license data - activated: {self.activated}")
+                data = self.trial_store.data
+                self.first_run = data.get('first_run', datetime.datetime.now().isoformat())
+                self.export_count = data.get('export_count', 0)
+                self.activated = data.get('activated', False)
+                self.license_key = data.get('license_key', '')
+                logger.debug("Loaded license data - activated: %s", self.activated)
             except Exception as e:
-                print(f"DEBUG: Error loading license file: {e}")
+                logger.warning("Error loading license file: %s", e)
                 self.reset_trial_data()
         else:
-            print("DEBUG: No license file found, creating new trial data")
+            logger.debug("No license file found, creating new trial data")
             self.reset_trial_data()
         
         # Check if activated via license server
         try:
             server_license_info = self.license_validator.get_license_info()
-            print(f"DEBUG: Server license info: {server_license_info}")
+            logger.debug("Server license info: %s", server_license_info)
             
             if server_license_info and server_license_info.get('license_key'):
-                print("DEBUG: Found server license, activating...")
-                self.activated = True
-                self.license_key = server_license_info['license_key']
-                self.save_license_data()
+                license_key = server_license_info['license_key']
+                validator = self.license_validator
+                if (validator.public_key and server_license_info.get('token')
+                        and not validator.verify_token(server_license_info['token'], license_key)):
+                    logger.warning("Stored license token is invalid or expired, deactivating")
+                    self.deactivate_license()
+                else:
+                    logger.debug("Found server license, activating...")
+                    self.activated = True
+                    self.license_key = license_key
+                    self.save_license_data()
+                    validator.start_background_revalidation(license_key)
         except Exception as e:
-            print(f"DEBUG: Server license check failed: {e}")
+            logger.warning("Server license check failed: %s", e)
         
-        print(f"DEBUG: License initialization complete - activated: {self.activated}")
+        logger.debug("License initialization complete - activated: %s", self.activated)
+
+    def deactivate_license(self):
+        """Fall back to the trial after the license token failed verification or was revoked"""
+        self.activated = False
+        self.license_key = None
+        self.save_license_data()
+        self.trial_store.flush()
+
+    def _on_license_revoked(self):
+        self.deactivate_license()
+        self.status_label.config(text="❌ License revoked - running as trial version", fg='#ff4444')
 
     def reset_trial_data(self):
         """Reset trial data for new installation"""
@@ -509,15 +3810,18 @@ class DevScanPro:
         self.save_license_data()
 
     def save_license_data(self):
-        """Save license data to file"""
+        """Save license data (written to disk in batches by the state store)"""
         data = {
             'first_run': self.first_run,
             'export_count': self.export_count,
             'activated': self.activated,
             'license_key': self.license_key
         }
-        with open(self.license_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        self.trial_store.update(data)
+    
+    def record_export(self):
+        """Count an export against the trial limit, also counting exports by other instances"""
+        self.export_count = self.trial_store.increment('export_count')
 
     def get_trial_status(self):
         """Get trial status message"""
@@ -686,13 +3990,7 @@ Enter your license key in the text box above."""
 
     def get_ubuntu_version(self):
         """Get Ubuntu version information"""
-        try:
-            result = subprocess.run(['lsb_release', '-d'], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.split(':')[1].strip()
-        except:
-            pass
-        return platform.version()
+        return detect_system_version()
     
         # UI SCROLLING METHODS
     def _bind_mouse_wheel(self):
@@ -714,6 +4012,13 @@ Enter your license key in the text box above."""
             self.canvas.yview_scroll(1, "units")
 
     def _on_frame_configure(self, event):
+        # Row packing fires this per widget; recompute the scroll region once per frame
+        if not self.scrollregion_pending:
+            self.scrollregion_pending = True
+            self.root.after(self.ui_frame_interval, self._update_scrollregion)
+    
+    def _update_scrollregion(self):
+        self.scrollregion_pending = False
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
     
     def _on_canvas_configure(self, event):
@@ -721,160 +4026,96 @@ Enter your license key in the text box above."""
 
     # TOOL CHECKING METHODS
     def check_tool(self, command, name, category="System", check_type="version"):
-        try:
-            if check_type == "version":
-                result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    output = result.stdout.strip().split('\n')[0]
-                    return output, "installed", category
-                else:
-                    return "Not installed", "not_installed", category
-                    
-            elif check_type == "package":
-                result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    return "Installed", "installed", category
-                else:
-                    return "Not installed", "not_installed", category
-                    
-            elif check_type == "which":
-                result = subprocess.run(f"which {command}", shell=True, capture_output=True, text=True, timeout=5)
-                if result.returncode == 0:
-                    return f"Found: {result.stdout.strip()}", "installed", category
-                else:
-                    return "Not in PATH", "not_installed", category
-                    
-            elif check_type == "service":
-                result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    return "Available", "installed", category
-                else:
-                    return "Not available", "not_installed", category
-                    
-            elif check_type == "snap":
-                result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    return "Snap installed", "installed", category
-                else:
-                    return "Snap not installed", "not_installed", category
-                    
-        except subprocess.TimeoutExpired:
-            return "Timeout", "not_installed", category
-        except Exception as e:
-            return f"Error: {str(e)}", "not_installed", category
-        
-    def check_tools(self):
+        return self.probe_engine.check_tool(command, name, category, check_type)
+
+    def check_tools(self, use_cache=False, project_root=None, categories=None, names=None):
+        self.scan_in_progress = True
         self.check_btn.config(state='disabled', text="🔄 Checking...")
+        self.cancel_btn.config(state='normal')
+        self.project_btn.config(state='disabled')
+        self.category_btn.config(state='disabled')
         self.export_btn.config(state='disabled')
         self.copy_btn.config(state='disabled')
         self.info_btn.config(state='disabled')
         self.export_script_btn.config(state='disabled')
         self.selective_export_btn.config(state='disabled')
+        self.export_all_btn.config(state='disabled')
         self.status_label.config(text="Scanning system for development tools...", fg='#ffff00')
         
-        # Clear previous results
-        for widget in self.results_frame.winfo_children():
-            widget.destroy()
-        
-        # Ubuntu-specific tools list
-        tools = [
-            # System Information
-            ("lsb_release -a", "Ubuntu Version", "System", "version"),
-            ("uname -r", "Kernel Version", "System", "version"),
-            
-            # Programming Languages
-            ("python3 --version", "Python 3", "Programming", "version"),
-            ("python --version", "Python", "Programming", "version"),
-            ("node --version", "Node.js", "Programming", "version"),
-            ("npm --version", "npm", "Programming", "version"),
-            ("npx --version", "npx", "Programming", "version"),
-            ("java -version", "Java", "Programming", "version"),
-            ("php --version", "PHP", "Programming", "version"),
-            ("go version", "Go", "Programming", "version"),
-            ("ruby --version", "Ruby", "Programming", "version"),
-            ("perl --version", "Perl", "Programming", "version"),
-            ("rustc --version", "Rust", "Programming", "version"),
-            
-            # Build Tools
-            ("git --version", "Git", "Build Tools", "version"),
-            ("make --version", "GNU Make", "Build Tools", "version"),
-            ("gcc --version", "GCC", "Build Tools", "version"),
-            ("g++ --version", "G++", "Build Tools", "version"),
-            ("cmake --version", "CMake", "Build Tools", "version"),
-            ("pip --version", "pip", "Build Tools", "version"),
-            ("pip3 --version", "pip3", "Build Tools", "version"),
-            
-            # Containers & Virtualization
-            ("docker --version", "Docker", "Containers", "version"),
-            ("docker-compose --version", "Docker Compose", "Containers", "version"),
-            ("podman --version", "Podman", "Containers", "version"),
-            ("kubectl version --client", "Kubernetes CLI", "Containers", "version"),
-            ("vagrant --version", "Vagrant", "Containers", "version"),
-            
-            # Editors & IDEs
-            ("code --version", "VS Code", "Editors", "version"),
-            ("vim --version", "Vim", "Editors", "version"),
-            ("nano --version", "Nano", "Editors", "version"),
-            ("emacs --version", "Emacs", "Editors", "version"),
-            
-            # Databases
-            ("psql --version", "PostgreSQL", "Databases", "version"),
-            ("mysql --version", "MySQL", "Databases", "version"),
-            ("sqlite3 --version", "SQLite", "Databases", "version"),
-            ("mongod --version", "MongoDB", "Databases", "version"),
-            
-            # System Tools
-            ("curl --version", "cURL", "System", "version"),
-            ("wget --version", "Wget", "System", "version"),
-            ("ssh -V", "SSH", "System", "version"),
-            ("rsync --version", "rsync", "System", "version"),
-            ("tar --version", "tar", "System", "version"),
-            
-            # Package Managers
-            ("apt --version", "APT", "System", "version"),
-            ("snap --version", "Snap", "System", "version"),
-            ("flatpak --version", "Flatpak", "System", "version"),
-            
-            # Networking
-            ("netstat --version", "netstat", "Networking", "version"),
-            ("ip --version", "iproute2", "Networking", "version"),
-            ("nmap --version", "Nmap", "Networking", "version"),
-            
-            # Development Tools
-            ("gitk --version", "Gitk", "Build Tools", "version"),
-            ("git-gui --version", "Git GUI", "Build Tools", "version"),
-            ("meld --version", "Meld", "Editors", "version"),
-        ]
+        self.result_updates.discard()
+        self.live_sections = {}
+        self.live_results = None
+        self.live_checked = 0
+        self.live_installed = 0
+        if not (categories or names):
+            # Clear previous results, new ones are streamed in as they are probed.
+            # Partial scans keep the current rows and are merged in at the end.
+            for widget in self.results_frame.winfo_children():
+                widget.destroy()
+            self.live_results = []
         
         # Run in thread to avoid freezing GUI
-        thread = threading.Thread(target=self._check_tools_thread, args=(tools,))
+        thread = threading.Thread(target=self._check_tools_thread,
+                                  args=(use_cache, project_root, categories, names))
         thread.daemon = True
         thread.start()
 
-    def _check_tools_thread(self, tools):
+    def _check_tools_thread(self, use_cache=False, project_root=None, categories=None, names=None):
         try:
-            results = []
-            
-            for command, name, category, check_type in tools:
-                version, status, cat = self.check_tool(command, name, category, check_type)
-                results.append((name, version, status, cat))
+            if project_root:
+                # Only probe what the project's manifests ask for
+                tools = ProjectScanner(project_root).required_tools()
+            elif categories or names:
+                tools = select_tools(categories, names)
+            else:
+                tools = catalog_tools()
+            if categories or names:
+                results = merge_results(self.all_results, self.probe_engine.run_scan(tools, use_cache=use_cache),
+                                        categories)
+            else:
+                results = self.probe_engine.run_scan(tools, use_cache=use_cache,
+                                                     on_result=self.result_updates.push)
+            self.scan_history.record(results, self.probe_engine.last_timings, self.probe_engine.last_usage)
             
             self.root.after(0, self._display_results, results)
             
+        except ScanCancelled:
+            self.root.after(0, self._on_scan_cancelled)
         except Exception as e:
             error_result = [("Error", f"Scan failed: {str(e)}", "not_installed", "System")]
             self.root.after(0, self._display_results, error_result)
     
+    def _append_results(self, batch):
+        """Add a batch of streamed results under their category sections"""
+        if not self.scan_in_progress:
+            return
+        filter_category = self.filter_var.get()
+        self.live_results.extend(batch)
+        for name, version, status, category in batch:
+            self.live_checked += 1
+            if status == "installed":
+                self.live_installed += 1
+            if filter_category != "All" and category != filter_category:
+                continue
+            last_widget = self.live_sections.get(category)
+            if last_widget is None and filter_category == "All":
+                last_widget = self._add_category_header(category)
+            self.live_sections[category] = self._add_result_row(name, version, status, category,
+                                                                after=last_widget)
+        self.status_label.config(
+            text=f"🔄 Scanning... {self.live_checked} checked, {self.live_installed} installed", fg='#ffff00')
+
     def _display_results(self, results):
+        self.result_updates.flush()
+        self.scan_in_progress = False
         self.all_results = results
-        self.apply_filter()
-        
-        self.check_btn.config(state='normal', text="🔄 Refresh Tools")
-        self.export_btn.config(state='normal')
-        self.copy_btn.config(state='normal')
-        self.info_btn.config(state='normal')
-        self.export_script_btn.config(state='normal')
-        self.selective_export_btn.config(state='normal')
+        if self.live_sections and self.live_checked == len(results):
+            # Every result is already on screen, skip the full rebuild
+            filter_category = self.filter_var.get()
+            self.current_results = [r for r in results if filter_category == "All" or r[3] == filter_category]
+        else:
+            self.apply_filter()
+        self._enable_scan_buttons()
         
         installed_count = sum(1 for _, _, status, _ in self.all_results if status == "installed")
         current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -884,19 +4125,89 @@ Enter your license key in the text box above."""
         else:
             self.status_label.config(text=f"❌ No development tools found • {current_time}", fg='#ff4444')
     
+    def _enable_scan_buttons(self):
+        self.check_btn.config(state='normal', text="🔄 Refresh Tools")
+        self.cancel_btn.config(state='disabled')
+        self.project_btn.config(state='normal')
+        self.category_btn.config(state='normal')
+        self.export_btn.config(state='normal')
+        self.copy_btn.config(state='normal')
+        self.info_btn.config(state='normal')
+        self.export_script_btn.config(state='normal')
+        self.selective_export_btn.config(state='normal')
+        self.export_all_btn.config(state='normal')
+
+    def scan_project(self):
+        """Scan only the tools a chosen source tree needs"""
+        project_root = filedialog.askdirectory(title="Select Project Directory")
+        if not project_root:
+            return
+        self.check_tools(use_cache=True, project_root=project_root)
+        self.status_label.config(text=f"Scanning tools required by {os.path.basename(project_root)}...", fg='#ffff00')
+
+    def rescan_category(self):
+        """Re-probe only the category selected in the filter and merge it into the results"""
+        category = self.filter_var.get()
+        if category == "All" or not self.all_results:
+            self.check_tools()
+            return
+        self.check_tools(categories=[category])
+        self.status_label.config(text=f"Rescanning {category} tools...", fg='#ffff00')
+
+    def rescan_tool(self, name):
+        """Re-probe a single tool (double-click on its row)"""
+        if self.scan_in_progress:
+            return
+        if name not in {tool[1] for tool in TOOL_CATALOG + PROBE_PLUGINS.loaded_tools()}:
+            # Version manager and error rows are not probes of their own
+            self.status_label.config(text=f"❌ {name} cannot be rescanned on its own", fg='#ff4444')
+            return
+        self.check_tools(names=[name])
+        self.status_label.config(text=f"Rescanning {name}...", fg='#ffff00')
+
+    def cancel_scan(self):
+        """Abort the running scan and kill any probes still running"""
+        self.cancel_btn.config(state='disabled')
+        self.status_label.config(text="⏹ Cancelling scan...", fg='#ffff00')
+        self.probe_engine.cancel()
+
+    def _on_scan_cancelled(self):
+        self.result_updates.discard()
+        self.scan_in_progress = False
+        # Keep showing the previous results
+        self.apply_filter()
+        self._enable_scan_buttons()
+        self.status_label.config(text="⏹ Scan cancelled", fg='#ffff00')
+
+    def on_close(self):
+        """Stop background work before closing so no probe outlives the window"""
+        if self.scheduler:
+            self.scheduler.stop()
+        self.probe_engine.cancel()
+        self.trial_store.close()
+        self.license_validator.stop_background_revalidation()
+        self.root.destroy()
+
     def apply_filter(self):
         for widget in self.results_frame.winfo_children():
             widget.destroy()
         
         filter_category = self.filter_var.get()
+        # While a full scan streams, rebuild from the rows received so far and
+        # point the live sections at the new widgets for the rows still to come
+        streaming = self.scan_in_progress and self.live_results is not None
+        results = self.live_results if streaming else self.all_results
+        self.live_sections = {}
         
         if filter_category == "All":
-            filtered_results = self.all_results
+            filtered_results = results
         else:
-            filtered_results = [r for r in self.all_results if r[3] == filter_category]
+            filtered_results = [r for r in results if r[3] == filter_category]
         
         self.current_results = filtered_results
         
+        if streaming and not filtered_results:
+            return
         if not filtered_results:
             empty_frame = tk.Frame(self.results_frame, bg='#1e1e1e')
             empty_frame.pack(fill=tk.X, pady=20)
@@ -911,39 +4222,65 @@ Enter your license key in the text box above."""
                 categories[category] = []
             categories[category].append((name, version, status))
         
-        # Clear checkboxes dictionary
-        self.tool_checkboxes = {}
-        
         for category, tools in categories.items():
-            if len(categories) > 1:
-                cat_frame = tk.Frame(self.results_frame, bg='#3a3a3a', relief='raised', bd=1)
-                cat_frame.pack(fill=tk.X, pady=(10, 5), padx=5)
-                cat_label = tk.Label(cat_frame, text=category, bg='#3a3a3a', 
-                                   font=("Ubuntu", 11, "bold"), fg='#ffffff', anchor='w')
-                cat_label.pack(fill=tk.X, padx=10, pady=5)
+            if len(categories) > 1 or (streaming and filter_category == "All"):
+                self._add_category_header(category)
             
             for name, version, status in tools:
-                frame = tk.Frame(self.results_frame, bg='#2d2d2d', relief='flat', bd=1)
-                frame.pack(fill=tk.X, pady=1, padx=5, anchor='w')
-                
-                checkbox_color = '#4CAF50' if status == "installed" else '#f44336'
-                checkbox_canvas = tk.Canvas(frame, width=20, height=20, bg='#2d2d2d', highlightthickness=0)
-                checkbox_canvas.pack(side=tk.LEFT, padx=(10, 15))
-                checkbox_canvas.create_oval(2, 2, 18, 18, fill=checkbox_color, outline='')
-                
-                tool_text = f"{name}: {version}"
-                tool_label = tk.Label(frame, text=tool_text, bg='#2d2d2d', 
-                                    font=("Ubuntu", 9), fg='#ffffff', anchor='w', justify='left')
-                tool_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
-                
-                # Store tool info for selective export
-                self.tool_checkboxes[name] = {
-                    'frame': frame,
-                    'name': name,
-                    'version': version,
-                    'status': status,
-                    'category': category
-                }
+                row = self._add_result_row(name, version, status, category)
+            if streaming:
+                self.live_sections[category] = row
+    
+    def _add_category_header(self, category):
+        cat_frame = tk.Frame(self.results_frame, bg='#3a3a3a', relief='raised', bd=1)
+        cat_frame.pack(fill=tk.X, pady=(10, 5), padx=5)
+        cat_label = tk.Label(cat_frame, text=category, bg='#3a3a3a', 
+                           font=("Ubuntu", 11, "bold"), fg='#ffffff', anchor='w')
+        cat_label.pack(fill=tk.X, padx=10, pady=5)
+        return cat_frame
+    
+    def _add_result_row(self, name, version, status, category, after=None):
+        """Add one tool row, right after the given widget when streaming into a section"""
+        frame = tk.Frame(self.results_frame, bg='#2d2d2d', relief='flat', bd=1)
+        if after is not None:
+            frame.pack(fill=tk.X, pady=1, padx=5, anchor='w', after=after)
+        else:
+            frame.pack(fill=tk.X, pady=1, padx=5, anchor='w')
+        
+        checkbox_color = '#4CAF50' if status == "installed" else '#f44336'
+        checkbox_canvas = tk.Canvas(frame, width=20, height=20, bg='#2d2d2d', highlightthickness=0)
+        checkbox_canvas.pack(side=tk.LEFT, padx=(10, 15))
+        checkbox_canvas.create_oval(2, 2, 18, 18, fill=checkbox_color, outline='')
+        
+        tool_text = f"{name}: {version}"
+        tool_label = tk.Label(frame, text=tool_text, bg='#2d2d2d', 
+                            font=("Ubuntu", 9), fg='#ffffff', anchor='w', justify='left')
+        tool_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        for widget in (frame, tool_label):
+            widget.bind("<Double-Button-1>", lambda e, tool=name: self.rescan_tool(tool))
+        return frame
+
+    # SCHEDULED SCAN METHODS
+    def toggle_auto_refresh(self):
+        """Start or stop the periodic background scan"""
+        if self.auto_refresh_var.get():
+            if self.scheduler is None:
+                from devscan_service import ScanScheduler
+                self.scheduler = ScanScheduler(self._on_scheduled_scan, interval=self.auto_refresh_interval)
+            self.scheduler.start()
+            self.status_label.config(text=f"⏱ Auto-refresh every {self.auto_refresh_interval // 60} min enabled", fg='#00ff00')
+        else:
+            if self.scheduler:
+                self.scheduler.stop()
+            self.status_label.config(text="Auto-refresh disabled", fg='#ffff00')
+
+    def _on_scheduled_scan(self):
+        # Called from the scheduler thread - hand over to the Tk event loop
+        self.root.after(0, self._run_scheduled_scan)
+
+    def _run_scheduled_scan(self):
+        if not self.scan_in_progress:
+            self.check_tools(use_cache=True)
 
         # SYSTEM INFO AND EXPORT METHODS
     def show_system_info(self):
@@ -1001,7 +4338,8 @@ License:
             filename = filedialog.asksaveasfilename(
                 title="Export Tools Report",
                 defaultextension=".txt",
-                filetypes=[("Text files", "*.txt"), ("JSON files", "*.json"), ("All files", "*.*")],
+                filetypes=[("Text files", "*.txt"), ("JSON files", "*.json"), ("HTML dashboards", "*.html"),
+                           ("DevScan snapshots", "*.dsps"), ("All files", "*.*")],
                 initialfile=default_filename
             )
             
@@ -1011,11 +4349,14 @@ License:
             
             # Increment export count for trial version
             if not self.activated:
-                self.export_count += 1
-                self.save_license_data()
+                self.record_export()
             
             if filename.endswith('.json'):
                 self.export_to_json(filename)
+            elif filename.endswith('.html'):
+                self.export_to_html(filename)
+            elif filename.endswith('.dsps'):
+                self.export_to_snapshot(filename)
             else:
                 self.export_to_txt(filename)
             
@@ -1031,79 +4372,69 @@ License:
         except Exception as e:
             self.status_label.config(text=f"❌ Export failed: {str(e)}", fg='#ff4444')
 
-    def export_to_txt(self, filename):
-        with open(filename, 'w') as f:
-            f.write(f"{self.app_name} - Development Tools Report\n")
-            f.write("=" * 60 + "\n")
-            f.write(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"System: {self.ubuntu_version}\n")
-            f.write(f"Architecture: {platform.machine()}\n")
-            f.write(f"License: {self.get_trial_status()}\n")
-            f.write("=" * 60 + "\n\n")
-            
-            categories = {}
-            for name, version, status, category in self.all_results:
-                if category not in categories:
-                    categories[category] = []
-                categories[category].append((name, version, status))
-            
-            for category, tools in categories.items():
-                f.write(f"\n{category.upper()}:\n")
-                f.write("-" * 40 + "\n")
-                for name, version, status in tools:
-                    status_icon = "✅" if status == "installed" else "❌"
-                    f.write(f"{status_icon} {name}: {version}\n")
-            
-            installed_count = sum(1 for _, _, status, _ in self.all_results if status == "installed")
-            f.write(f"\n\nSUMMARY:\n")
-            f.write("-" * 40 + "\n")
-            f.write(f"Total tools checked: {len(self.all_results)}\n")
-            f.write(f"Installed: {installed_count}\n")
-            f.write(f"Missing: {len(self.all_results) - installed_count}\n")
-            if self.all_results:
-                f.write(f"Installation rate: {(installed_count/len(self.all_results))*100:.1f}%\n")
-    
-    def export_to_json(self, filename):
-        report = {
-            "app": self.app_name,
+    def export_context(self):
+        """Report metadata shared by all export formats"""
+        return {
+            "app_name": self.app_name,
             "version": self.version,
             "vendor": self.vendor,
-            "generated": datetime.datetime.now().isoformat(),
-            "system": {
-                "ubuntu": self.ubuntu_version,
-                "architecture": platform.machine(),
-                "python_version": platform.python_version()
-            },
-            "license": {
+            "system_version": self.ubuntu_version,
+            "license_status": self.get_trial_status(),
+            "license_info": {
                 "status": "activated" if self.activated else "trial",
                 "trial_days_remaining": self.get_trial_days_remaining(),
                 "exports_used": self.export_count,
                 "max_exports": self.max_exports
-            },
-            "tools": [],
-            "summary": {}
+            }
         }
+
+    def export_to_txt(self, filename):
+        ExportPipeline([TextReportSink(filename, self.export_context())]).run(self.all_results)
+    
+    def export_to_json(self, filename):
+        ExportPipeline([JsonReportSink(filename, self.export_context())]).run(self.all_results)
+    
+    def export_to_html(self, filename):
+        ExportPipeline([HtmlReportSink(filename, self.export_context())]).run(self.all_results)
+    
+    def export_all_formats(self):
+        """Write TXT, JSON, CSV, NDJSON and the installation script in one pass over the results"""
+        if not self.check_trial_limits():
+            return
         
-        installed_count = 0
-        for name, version, status, category in self.all_results:
-            report["tools"].append({
-                "name": name,
-                "version": str(version),
-                "status": status,
-                "category": category
-            })
-            if status == "installed":
-                installed_count += 1
-        
-        report["summary"] = {
-            "total": len(self.all_results),
-            "installed": installed_count,
-            "missing": len(self.all_results) - installed_count,
-            "installation_rate": round((installed_count/len(self.all_results))*100, 1) if self.all_results else 0
-        }
+        if not self.all_results:
+            self.status_label.config(text="❌ No results to export!", fg='#ff4444')
+            return
         
-        with open(filename, 'w') as f:
-            json.dump(report, f, indent=2)
+        try:
+            directory = filedialog.askdirectory(title="Export All Formats To")
+            if not directory:
+                self.status_label.config(text="Export cancelled", fg='#ffff00')
+                return
+            
+            # One export against the trial limit, however many formats
+            if not self.activated:
+                self.record_export()
+            
+            basename = f"devscan_pro_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            pipeline = ExportPipeline.for_formats(directory, basename, list(ExportPipeline.SINKS),
+                                                  self.export_context())
+            written = pipeline.run(self.all_results)
+            
+            status_msg = f"✅ Exported {len(written)} formats to: {os.path.basename(directory)}"
+            if not self.activated:
+                status_msg += f" ({self.max_exports - self.export_count} exports left)"
+            
+            self.status_label.config(text=status_msg, fg='#00ff00')
+            
+            # Open file manager
+            subprocess.run(["xdg-open", directory])
+            
+        except Exception as e:
+            self.status_label.config(text=f"❌ Export failed: {str(e)}", fg='#ff4444')
+    
+    def export_to_snapshot(self, filename):
+        write_snapshot(filename, self.all_results, snapshot_metadata(self.ubuntu_version))
     
     def copy_to_clipboard(self):
         if not self.all_results:
@@ -1158,7 +4489,7 @@ License:
         
         # Instructions
         instr_label = tk.Label(main_frame, 
-                              text="Select individual tools or use the buttons below to select all/none",
+                              text="Click tools to toggle them; the buttons apply to the tools matching the filter",
                               font=("Ubuntu", 10), 
                               bg='#2b2b2b', fg='#cccccc')
         instr_label.pack(pady=(0, 10))
@@ -1167,6 +4498,8 @@ License:
         selection_buttons_frame = tk.Frame(main_frame, bg='#2b2b2b')
         selection_buttons_frame.pack(fill=tk.X, pady=(0, 10))
         
+        self.export_selection = SelectionModel(self.all_results)
+        
         select_all_btn = tk.Button(selection_buttons_frame, text="Select All",
                                   command=lambda: self._toggle_all_checkboxes(select_window, True),
                                   bg='#4CAF50', fg='white',
@@ -1185,65 +4518,27 @@ License:
                                        font=("Ubuntu", 9, "bold"))
         select_installed_btn.pack(side=tk.LEFT)
         
-        # Scrollable frame for checkboxes
-        canvas = tk.Canvas(main_frame, bg='#1e1e1e', highlightthickness=0)
-        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Store checkboxes
-        self.export_checkboxes = {}
+        self.export_selection_label = tk.Label(selection_buttons_frame, bg='#2b2b2b', fg='#cccccc',
+                                               font=("Ubuntu", 9))
+        self.export_selection_label.pack(side=tk.RIGHT)
         
-        # Group tools by category
-        categories = {}
-        for name, version, status, category in self.all_results:
-            if category not in categories:
-                categories[category] = []
-            categories[category].append((name, version, status))
+        # Search box, filtered as you type
+        search_frame = tk.Frame(main_frame, bg='#2b2b2b')
+        search_frame.pack(fill=tk.X, pady=(0, 10))
+        tk.Label(search_frame, text="🔍 Filter:", bg='#2b2b2b', fg='#ffffff',
+                 font=("Ubuntu", 9)).pack(side=tk.LEFT, padx=(0, 5))
+        search_var = tk.StringVar()
+        search_entry = tk.Entry(search_frame, textvariable=search_var, bg='#1e1e1e', fg='#ffffff',
+                                insertbackground='#ffffff', font=("Ubuntu", 9))
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
-        # Create checkboxes for each tool
-        for category, tools in categories.items():
-            # Category label
-            cat_frame = tk.Frame(scrollable_frame, bg='#3a3a3a', relief='raised', bd=1)
-            cat_frame.pack(fill=tk.X, pady=(5, 2), padx=5)
-            cat_label = tk.Label(cat_frame, text=category, bg='#3a3a3a', 
-                               font=("Ubuntu", 10, "bold"), fg='#ffffff', anchor='w')
-            cat_label.pack(fill=tk.X, padx=10, pady=2)
-            
-            for name, version, status in tools:
-                frame = tk.Frame(scrollable_frame, bg='#2d2d2d', relief='flat', bd=1)
-                frame.pack(fill=tk.X, pady=1, padx=5)
-                
-                # Checkbox
-                var = tk.BooleanVar(value=True)  # Default to selected
-                checkbox = tk.Checkbutton(frame, variable=var, bg='#2d2d2d', 
-                                        activebackground='#2d2d2d', selectcolor='#2d2d2d')
-                checkbox.pack(side=tk.LEFT, padx=(10, 5))
-                
-                # Tool info
-                status_icon = "✅" if status == "installed" else "❌"
-                tool_text = f"{status_icon} {name}: {version}"
-                tool_label = tk.Label(frame, text=tool_text, bg='#2d2d2d', 
-                                    font=("Ubuntu", 9), fg='#ffffff', anchor='w')
-                tool_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
-                
-                self.export_checkboxes[name] = {
-                    'var': var,
-                    'name': name,
-                    'version': version,
-                    'status': status,
-                    'category': category
-                }
+        # Virtualized tool list; only visible rows are drawn
+        list_frame = tk.Frame(main_frame, bg='#1e1e1e')
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        self.export_list = VirtualSelectionList(list_frame, self.export_selection,
+                                                on_change=self._update_export_selection_label)
+        search_var.trace_add("write", lambda *args: self._filter_export_list(search_var.get()))
+        self._update_export_selection_label()
         
         # Export buttons frame
         export_buttons_frame = tk.Frame(main_frame, bg='#2b2b2b')
@@ -1261,6 +4556,12 @@ License:
                                    font=("Ubuntu", 10, "bold"))
         export_json_btn.pack(side=tk.LEFT, padx=(0, 5))
         
+        rescan_btn = tk.Button(export_buttons_frame, text="Rescan Selected",
+                               command=lambda: self._rescan_selected_tools(select_window),
+                               bg='#ff9800', fg='white',
+                               font=("Ubuntu", 10, "bold"))
+        rescan_btn.pack(side=tk.LEFT, padx=(0, 5))
+        
         cancel_btn = tk.Button(export_buttons_frame, text="Cancel",
                               command=select_window.destroy,
                               bg='#666', fg='white',
@@ -1268,14 +4569,43 @@ License:
         cancel_btn.pack(side=tk.RIGHT)
     
     def _toggle_all_checkboxes(self, window, state):
-        """Toggle all checkboxes to selected or unselected"""
-        for tool_data in self.export_checkboxes.values():
-            tool_data['var'].set(state)
+        """Select or deselect every tool in the current filter"""
+        if state:
+            self.export_selection.select_all()
+        else:
+            self.export_selection.select_none()
+        self.export_list.redraw()
+        self._update_export_selection_label()
     
     def _select_installed_only(self, window):
-        """Select only installed tools"""
-        for tool_data in self.export_checkboxes.values():
-            tool_data['var'].set(tool_data['status'] == 'installed')
+        """Select only installed tools in the current filter"""
+        self.export_selection.select_installed()
+        self.export_list.redraw()
+        self._update_export_selection_label()
+    
+    def _filter_export_list(self, query):
+        self.export_selection.filter(query)
+        self.export_list.refresh()
+        self._update_export_selection_label()
+    
+    def _update_export_selection_label(self):
+        model = self.export_selection
+        self.export_selection_label.config(
+            text=f"{model.count()} of {len(model.rows)} selected, {len(model.view)} shown")
+    
+    def _rescan_selected_tools(self, window):
+        """Re-probe the tools selected in the dialog and merge them into the results"""
+        if self.scan_in_progress:
+            return
+        probes = {tool[1] for tool in TOOL_CATALOG + PROBE_PLUGINS.loaded_tools()}
+        # Version manager and error rows are not probes of their own
+        names = [row[0] for row in self.export_selection.selected() if row[0] in probes]
+        if not names:
+            messagebox.showwarning("No Selection", "Please select at least one tool that can be rescanned.")
+            return
+        window.destroy()
+        self.check_tools(names=names)
+        self.status_label.config(text=f"Rescanning {len(names)} selected tools...", fg='#ffff00')
     
     def _export_selected_tools(self, window, export_format):
         """Export selected tools to file"""
@@ -1283,15 +4613,7 @@ License:
             return
         
         # Get selected tools
-        selected_tools = []
-        for tool_data in self.export_checkboxes.values():
-            if tool_data['var'].get():
-                selected_tools.append((
-                    tool_data['name'],
-                    tool_data['version'],
-                    tool_data['status'],
-                    tool_data['category']
-                ))
+        selected_tools = self.export_selection.selected()
         
         if not selected_tools:
             messagebox.showwarning("No Selection", "Please select at least one tool to export.")
@@ -1320,13 +4642,11 @@ License:
             
             # Increment export count for trial version
             if not self.activated:
-                self.export_count += 1
-                self.save_license_data()
+                self.record_export()
             
-            if export_format == 'json':
-                self._export_selected_to_json(filename, selected_tools)
-            else:
-                self._export_selected_to_txt(filename, selected_tools)
+            context = dict(self.export_context(), title="Selected Tools Report", export_type="selective")
+            sink = JsonReportSink if export_format == 'json' else TextReportSink
+            ExportPipeline([sink(filename, context)]).run(selected_tools)
             
             status_msg = f"✅ Selected tools exported to: {os.path.basename(filename)}"
             if not self.activated:
@@ -1341,83 +4661,6 @@ License:
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export: {str(e)}")
     
-    def _export_selected_to_txt(self, filename, selected_tools):
-        """Export selected tools to TXT file"""
-        with open(filename, 'w') as f:
-            f.write(f"{self.app_name} - Selected Tools Report\n")
-            f.write("=" * 60 + "\n")
-            f.write(f"Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"System: {self.ubuntu_version}\n")
-            f.write(f"Tools Selected: {len(selected_tools)}\n")
-            f.write("=" * 60 + "\n\n")
-            
-            categories = {}
-            for name, version, status, category in selected_tools:
-                if category not in categories:
-                    categories[category] = []
-                categories[category].append((name, version, status))
-            
-            for category, tools in categories.items():
-                f.write(f"\n{category.upper()}:\n")
-                f.write("-" * 40 + "\n")
-                for name, version, status in tools:
-                    status_icon = "✅" if status == "installed" else "❌"
-                    f.write(f"{status_icon} {name}: {version}\n")
-            
-            installed_count = sum(1 for _, _, status, _ in selected_tools if status == "installed")
-            f.write(f"\n\nSUMMARY:\n")
-            f.write("-" * 40 + "\n")
-            f.write(f"Total tools selected: {len(selected_tools)}\n")
-            f.write(f"Installed: {installed_count}\n")
-            f.write(f"Missing: {len(selected_tools) - installed_count}\n")
-            if selected_tools:
-                f.write(f"Installation rate: {(installed_count/len(selected_tools))*100:.1f}%\n")
-    
-    def _export_selected_to_json(self, filename, selected_tools):
-        """Export selected tools to JSON file"""
-        report = {
-            "app": self.app_name,
-            "version": self.version,
-            "vendor": self.vendor,
-            "generated": datetime.datetime.now().isoformat(),
-            "system": {
-                "ubuntu": self.ubuntu_version,
-                "architecture": platform.machine(),
-                "python_version": platform.python_version()
-            },
-            "export_type": "selective",
-            "tools_selected": len(selected_tools),
-            "license": {
-                "status": "activated" if self.activated else "trial",
-                "trial_days_remaining": self.get_trial_days_remaining(),
-                "exports_used": self.export_count,
-                "max_exports": self.max_exports
-            },
-            "tools": [],
-            "summary": {}
-        }
-        
-        installed_count = 0
-        for name, version, status, category in selected_tools:
-            report["tools"].append({
-                "name": name,
-                "version": str(version),
-                "status": status,
-                "category": category
-            })
-            if status == "installed":
-                installed_count += 1
-        
-        report["summary"] = {
-            "total": len(selected_tools),
-            "installed": installed_count,
-            "missing": len(selected_tools) - installed_count,
-            "installation_rate": round((installed_count/len(selected_tools))*100, 1) if selected_tools else 0
-        }
-        
-        with open(filename, 'w') as f:
-            json.dump(report, f, indent=2)
-
     # INSTALLATION SCRIPT METHODS
     def export_installation_script(self):
         """Export installation script for missing tools"""
@@ -1456,8 +4699,7 @@ License:
             
             # Increment export count for trial version
             if not self.activated:
-                self.export_count += 1
-                self.save_license_data()
+                self.record_export()
             
             self._generate_installation_script(filename, missing_tools)
             
@@ -1475,108 +4717,7 @@ License:
 
     def _generate_installation_script(self, filename, missing_tools):
         """Generate bash installation script"""
-        with open(filename, 'w') as f:
-            f.write("#!/bin/bash\n")
-            f.write(f"# DevScan Pro - Installation Script\n")
-            f.write(f"# Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"# Tools to install: {len(missing_tools)}\n")
-            f.write("#\n")
-            f.write("# WARNING: This script will install software on your system.\n")
-            f.write("# Review the commands below before running.\n")
-            f.write("# Run with: bash " + os.path.basename(filename) + "\n")
-            f.write("\n")
-            f.write("set -e  # Exit on any error\n")
-            f.write("\n")
-            f.write('echo "🔧 DevScan Pro - Automated Tool Installation"\n')
-            f.write('echo "==========================================="\n')
-            f.write('echo ""\n')
-            f.write("\n")
-            
-            # Group tools by package manager
-            tools_by_manager = {}
-            for tool_name in missing_tools:
-                if tool_name in self.tool_packages:
-                    package_info = self.tool_packages[tool_name]
-                    manager = package_info["manager"]
-                    package = package_info["package"]
-                    
-                    if manager not in tools_by_manager:
-                        tools_by_manager[manager] = []
-                    tools_by_manager[manager].append((tool_name, package))
-            
-            # Update package lists first
-            f.write('# Update package lists\n')
-            f.write('echo "Updating package lists..."\n')
-            f.write('sudo apt update\n')
-            f.write('echo ""\n')
-            f.write("\n")
-            
-            # Install tools by package manager
-            for manager, tools in tools_by_manager.items():
-                if manager == "apt":
-                    f.write(f'# Install APT packages\n')
-                    f.write(f'echo "Installing APT packages..."\n')
-                    packages = " ".join([pkg for _, pkg in tools])
-                    f.write(f'sudo apt install -y {packages}\n')
-                    f.write('echo ""\n')
-                    f.write("\n")
-                    
-                elif manager == "snap":
-                    f.write(f'# Install Snap packages\n')
-                    f.write(f'echo "Installing Snap packages..."\n')
-                    for tool_name, package in tools:
-                        f.write(f'sudo snap install {package}\n')
-                    f.write('echo ""\n')
-                    f.write("\n")
-                    
-                elif manager in ["pip", "pip3"]:
-                    f.write(f'# Install Python packages via {manager}\n')
-                    f.write(f'echo "Installing Python packages..."\n')
-                    for tool_name, package in tools:
-                        f.write(f'{manager} install {package}\n')
-                    f.write('echo ""\n')
-                    f.write("\n")
-            
-            # Special cases and post-installation steps
-            f.write('# Special installation steps\n')
-            f.write('echo "Running special installation steps..."\n')
-            f.write("\n")
-            
-            # Node.js special handling (often needs setup)
-            if "Node.js" in missing_tools:
-                f.write('# Install Node.js (alternative method if needed)\n')
-                f.write('if ! command -v node &> /dev/null; then\n')
-                f.write('    echo "Installing Node.js via NodeSource..."\n')
-                f.write('    curl -fsSL https://deb.nodesource.com/setup_lts.x | sudo -E bash -\n')
-                f.write('    sudo apt-get install -y nodejs\n')
-                f.write('fi\n')
-                f.write("\n")
-            
-            # Docker special handling
-            if "Docker" in missing_tools:
-                f.write('# Install Docker (official method)\n')
-                f.write('if ! command -v docker &> /dev/null; then\n')
-                f.write('    echo "Installing Docker..."\n')
-                f.write('    # Add Docker\'s official GPG key\n')
-                f.write('    sudo apt-get install -y ca-certificates curl\n')
-                f.write('    sudo install -m 0755 -d /etc/apt/keyrings\n')
-                f.write('    sudo curl -fsSL https://download.docker.com/linux/ubuntu/gpg -o /etc/apt/keyrings/docker.asc\n')
-                f.write('    sudo chmod a+r /etc/apt/keyrings/docker.asc\n')
-                f.write('    \n')
-                f.write('    # Add the repository to Apt sources\n')
-                f.write('    echo "deb [arch=$(dpkg --print-architecture) signed-by=/etc/apt/keyrings/docker.asc] https://download.docker.com/linux/ubuntu $(. /etc/os-release && echo "$VERSION_CODENAME") stable" | \\\n')
-                f.write('    sudo tee /etc/apt/sources.list.d/docker.list > /dev/null\n')
-                f.write('    sudo apt-get update\n')
-                f.write('    sudo apt-get install -y docker-ce docker-ce-cli containerd.io docker-buildx-plugin docker-compose-plugin\n')
-                f.write('fi\n')
-                f.write("\n")
-            
-            f.write('echo ""\n')
-            f.write('echo "✅ Installation completed!"\n')
-            f.write('echo "Run \\\"devscan_pro.py\\\" to verify all installations."\n')
-            
-        # Make the script executable
-        os.chmod(filename, 0o755)
+        write_installation_script(filename, missing_tools, self.tool_packages)
 
     def _show_installation_instructions(self, filename, missing_tools):
         """Show instructions for using the installation script"""
@@ -1609,11 +4750,403 @@ Tools that will be installed:
         if messagebox.askyesno("Open Location", "Do you want to open the script location in file manager?"):
             subprocess.run(["xdg-open", os.path.dirname(filename)])
 
-def main():
+def snapshot_metadata(system_version):
+    return {
+        "app": APP_NAME,
+        "version": APP_VERSION,
+        "generated": datetime.datetime.now().isoformat(),
+        "hostname": platform.node(),
+        "system": system_version,
+        "architecture": platform.machine(),
+    }
+
+def write_headless_report(results, output=None):
+    """Write a JSON scan report to a file, or to stdout when no file is given"""
+    if output and output.endswith('.dsps'):
+        write_snapshot(output, results, snapshot_metadata(detect_system_version()))
+        return
+    if output and output.endswith('.html'):
+        context = {"app_name": APP_NAME, "version": APP_VERSION, "vendor": APP_NAME,
+                   "system_version": detect_system_version()}
+        ExportPipeline([HtmlReportSink(output, context)]).run(results)
+        return
+    report = build_json_report(results, APP_NAME, APP_VERSION, APP_NAME, detect_system_version())
+    if output and output.endswith(('.ndjson', '.jsonl')):
+        # One compact report per line, ready for --aggregate
+        with open(output, 'a') as f:
+            f.write(json.dumps(report, separators=(',', ':')) + "\n")
+    elif output:
+        tmp_file = f"{output}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_file, output)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+def format_slow_probe_report(engine, history, limit=15):
+    """Table of the slowest probes by recorded p99 duration, their learned deadlines and the
+    CPU time, peak memory and page faults of their last run
+
+    Covers every probe with recorded timings, plugin probes included; plugins are only
+    imported when a recorded name is not in the built-in catalog.
+    """
+    check_types = {name: check_type for _, name, _, check_type in TOOL_CATALOG}
+    if any(name not in check_types for name in history.timings):
+        check_types.update((name, check_type) for _, name, _, check_type in PROBE_PLUGINS.tools())
+    rows = []
+    for name in history.timings:
+        p99 = history.timing_percentile(name, 99, min_samples=1)
+        if p99 is None:
+            continue
+        p50 = history.timing_percentile(name, 50, min_samples=1)
+        samples = len(history.timings[name])
+        rows.append((p99, name, p50, engine.probe_deadline(name, check_types.get(name, "version")), samples))
+    rows.sort(reverse=True)
+
+    lines = [f"{'Tool':<20} {'p50':>8} {'p99':>8} {'deadline':>9} {'samples':>8} {'cpu':>8} {'max RSS':>11} "
+             f"{'maj/min faults':>15}", "-" * 94]
+    for p99, name, p50, deadline, samples in rows[:limit]:
+        line = f"{name:<20} {p50 * 1000:>6.0f}ms {p99 * 1000:>6.0f}ms {deadline:>8.2f}s {samples:>8}"
+        usage = history.usage.get(name)
+        if usage:
+            faults = f"{usage['major_faults']}/{usage['minor_faults']}"
+            # "<=" marks peaks that cannot be told apart from the scanner's own RSS (see _record_usage)
+            if usage.get('max_rss_kb'):
+                rss = ("<=" if usage.get('rss_upper_bound') else "") + f"{usage['max_rss_kb'] / 1024:.1f}MB"
+            else:
+                rss = "-"
+            line += f" {usage['cpu'] * 1000:>6.0f}ms {rss:>11} {faults:>15}"
+        lines.append(line)
+    if not rows:
+        lines.append("No probe timings recorded yet - run a scan first")
+    return "\n".join(lines)
+
+def install_signal_handlers(handler):
+    """Route SIGINT/SIGTERM to handler so probes are killed instead of orphaned"""
+    signal.signal(signal.SIGINT, handler)
+    signal.signal(signal.SIGTERM, handler)
+
+def run_service(args):
+    """Long-running daemon serving scan results over local HTTP"""
+    from devscan_service import ScanScheduler, ScanService
+
+    history = ScanHistory()
+    engine = ProbeEngine(history=history, batch=args.batch, static=args.static,
+                         version_managers=not args.no_version_managers, isolated=args.isolated)
+    service = ScanService(engine, history, host=args.bind, port=args.port,
+                          socket_path=args.socket, verbose=args.verbose)
+    if args.socket:
+        try:
+            service.check_socket_path()
+        except FileExistsError as e:
+            print(e, file=sys.stderr)
+            return 2
+    scheduler = None
+
+    def stop(signum, frame):
+        if scheduler:
+            scheduler.stop()
+        service.engine.cancel()
+        # shutdown() blocks until serve_forever() returns, which runs in this thread
+        threading.Thread(target=service.shutdown, daemon=True).start()
+
+    install_signal_handlers(stop)
+    try:
+        service.rescan(use_cache=True)
+    except ScanCancelled:
+        print("Scan cancelled", file=sys.stderr)
+        return 130
+    if args.interval:
+        scheduler = ScanScheduler(lambda: service.rescan(use_cache=True), interval=args.interval,
+                                  jitter=args.jitter, max_load=args.max_load)
+        scheduler.start()
+    where = args.socket or f"http://{args.bind}:{args.port}"
+    print(f"Serving scan results on {where}", file=sys.stderr)
+    if service.token:
+        try:
+            service.write_token()
+            print(f"POST /rescan requires the {ScanService.TOKEN_HEADER} header from {service.token_file}",
+                  file=sys.stderr)
+        except OSError as e:
+            print(f"Could not write {service.token_file}, /rescan is disabled: {e}", file=sys.stderr)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def run_headless(args):
+    """Scan without the GUI, once or periodically"""
+    history = ScanHistory()
+    engine = ProbeEngine(history=history, batch=args.batch, static=args.static,
+                         version_managers=not args.no_version_managers, isolated=args.isolated)
+    formats = [fmt.strip() for fmt in args.formats.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in ExportPipeline.SINKS]
+    if unknown:
+        print(f"Unknown export format(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    selected = None
+    if (args.category or args.tool) and not args.project:
+        try:
+            selected = select_tools(args.category, args.tool)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+    if args.export_dir:
+        try:
+            os.makedirs(args.export_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Cannot create export directory {args.export_dir}: {e}", file=sys.stderr)
+            return 2
+
+    def scan():
+        """Run one scan and write its outputs, return the exit status"""
+        partial = args.category or args.tool
+        if args.project:
+            tools = ProjectScanner(args.project).required_tools()
+        elif partial:
+            tools = selected
+        else:
+            tools = catalog_tools()
+        results = engine.run_scan(tools)
+        previous = history.latest() if partial else None
+        if previous:
+            # Merge into the last full picture instead of reporting only the subset
+            results = merge_results(previous[1], results, args.category)
+        history.record(results, engine.last_timings, engine.last_usage)
+        try:
+            write_headless_report(results, args.output)
+            if args.export_dir:
+                basename = f"devscan_pro_report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                context = {"app_name": APP_NAME, "version": APP_VERSION, "vendor": APP_NAME,
+                           "system_version": detect_system_version()}
+                ExportPipeline.for_formats(args.export_dir, basename, formats, context).run(results)
+            if args.install_script:
+                missing_tools = [name for name, _, status, _ in results
+                                 if status == "not_installed" and name in TOOL_PACKAGES]
+                write_installation_script(args.install_script, missing_tools)
+        except OSError as e:
+            print(f"Export failed: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    scheduler = None
+    if args.interval:
+        from devscan_service import ScanScheduler
+        scheduler = ScanScheduler(scan, interval=args.interval, jitter=args.jitter, max_load=args.max_load)
+
+    def stop(signum, frame):
+        if scheduler:
+            scheduler.stop()
+        engine.cancel()
+
+    install_signal_handlers(stop)
+    try:
+        status = scan()
+    except ScanCancelled:
+        print("Scan cancelled", file=sys.stderr)
+        return 130
+    if scheduler:
+        scheduler.run_forever()
+    return status
+
+def run_integrity_check(args):
+    """--verify / --save-baseline"""
+    verifier = IntegrityVerifier()
+    try:
+        tools = select_tools(args.category, args.tool) if args.category or args.tool else catalog_tools()
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.save_baseline:
+        baseline = verifier.save_baseline(tools)
+        print(f"Saved baseline for {len(baseline)} binaries to {verifier.baseline_file}", file=sys.stderr)
+        if not args.verify:
+            return 0
+    report = verifier.verify(tools)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    modified = [entry["name"] for entry in report if entry["status"] == "modified"]
+    if modified:
+        print(f"Modified binaries: {', '.join(modified)}", file=sys.stderr)
+        return 1
+    return 0
+
+def run_render(args):
+    """--render: export existing snapshots or reports through the export pipeline"""
+    missing = [path for path in args.render if not os.path.exists(path)]
+    if missing:
+        print(f"No such report: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    formats = [fmt.strip() for fmt in args.formats.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in ExportPipeline.SINKS]
+    if unknown:
+        print(f"Unknown export format(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    directory = args.export_dir or "."
+    basename = os.path.splitext(os.path.basename(args.render[0].rstrip(os.sep)))[0] or "report"
+    context = {"app_name": APP_NAME, "version": APP_VERSION, "vendor": APP_NAME,
+               "system_version": f"Rendered from {', '.join(args.render)}", "export_type": "render"}
+    pipeline = ExportPipeline.for_formats(directory, basename, formats, context)
+    sources = {os.path.realpath(path) for path in args.render}
+    clobbered = [sink.filename for sink in pipeline.sinks if os.path.realpath(sink.filename) in sources]
+    if clobbered:
+        print(f"Refusing to overwrite the input {', '.join(clobbered)}, choose another --export-dir",
+              file=sys.stderr)
+        return 2
+    try:
+        os.makedirs(directory, exist_ok=True)
+        files = pipeline.run(iter_report_results(args.render))
+    except (OSError, ValueError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    for filename in files:
+        print(filename)
+    return 0
+
+def _non_negative_int(value):
+    """argparse type for counts where 0 is meaningful"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {value}")
+    return number
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="devscan-pro",
+                                     description="Professional Development Tools Scanner")
+    parser.add_argument("--headless", action="store_true",
+                        help="scan without the GUI and write a JSON report")
+    parser.add_argument("--output", "-o", metavar="FILE",
+                        help="report file for headless mode: .json, .html dashboard, .dsps snapshot, or .ndjson to append one line per scan (default: stdout)")
+    parser.add_argument("--interval", type=float, default=0, metavar="SECONDS",
+                        help="scan at startup, then again every SECONDS (headless and service mode)")
+    parser.add_argument("--jitter", type=float, default=0.1, metavar="FRACTION",
+                        help="random spread applied to the interval (default: 0.1)")
+    parser.add_argument("--max-load", type=float, default=None, metavar="LOAD",
+                        help="postpone scheduled scans while the load average per CPU is above LOAD (default: 1.0)")
+    parser.add_argument("--batch", action="store_true",
+                        help="run all probes from one generated shell script instead of one process each")
+    parser.add_argument("--static", action="store_true",
+                        help="read Python, Java, Go and Rust versions from their files instead of running them")
+    parser.add_argument("--isolated", action="store_true",
+                        help="run probes with a minimal environment (system PATH, C locale) instead of yours")
+    parser.add_argument("--no-version-managers", action="store_true",
+                        help="do not list versions installed by pyenv, nvm, sdkman, rustup or asdf")
+    parser.add_argument("--category", action="append", metavar="NAME",
+                        help="only probe tools in this category, merged into the last scan (repeatable, headless mode)")
+    parser.add_argument("--tool", action="append", metavar="NAME",
+                        help="only probe this tool, merged into the last scan (repeatable, headless mode)")
+    parser.add_argument("--project", metavar="PATH",
+                        help="only probe the tools required by the manifests in this source tree (headless mode)")
+    parser.add_argument("--install-script", metavar="FILE",
+                        help="also write an installation script for the missing tools (headless mode)")
+    parser.add_argument("--export-dir", metavar="DIR",
+                        help="also write the report in every format of --formats into DIR, in one pass (headless mode)")
+    parser.add_argument("--formats", default="txt,json,csv,ndjson,html,sh", metavar="LIST",
+                        help="comma-separated formats for --export-dir (default: txt,json,csv,ndjson,html,sh)")
+    parser.add_argument("--verify", action="store_true",
+                        help="hash the tools' binaries and check them against dpkg md5sums and the saved baseline; "
+                             "exits with 1 if any were modified")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="record the current binary hashes as the baseline for --verify")
+    parser.add_argument("--aggregate", nargs="+", metavar="REPORT",
+                        help="merge per-host JSON/NDJSON reports (files or directories) into fleet statistics")
+    parser.add_argument("--render", nargs="+", metavar="REPORT",
+                        help="export existing .dsps snapshots or JSON/NDJSON reports (files or directories) "
+                             "to --formats in --export-dir (default: current directory)")
+    parser.add_argument("--diff", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two reports or snapshots (.json/.dsps) and print the changes")
+    parser.add_argument("--slow-probes", nargs="?", type=_non_negative_int, const=15, metavar="N",
+                        help="print the N slowest probes from the recorded timings and exit")
+    parser.add_argument("--serve", action="store_true",
+                        help="run as a daemon serving results, history diffs and rescans over HTTP")
+    parser.add_argument("--bind", default="127.0.0.1", metavar="ADDRESS",
+                        help="address for --serve (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765,
+                        help="port for --serve (default: 8765)")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="serve on a Unix domain socket instead of TCP")
+    parser.add_argument("--verbose", action="store_true",
+                        help="log HTTP requests in --serve mode")
+    parser.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="log messages at this level and above to stderr (default: WARNING)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record scan, probe, export and license spans and write them as Chrome trace JSON on exit")
+    parser.add_argument("--profile-startup", nargs="?", const="-", metavar="FILE",
+                        help="start the GUI, time imports, initialization and first paint, write them as JSON and exit")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main entry point for package"""
-    root = tk.Tk()
-    app = DevScanPro(root)
+    args = parse_args(argv)
+    # --serve --verbose logs requests at INFO
+    level = logging.INFO if args.verbose and args.log_level == "WARNING" else getattr(logging, args.log_level)
+    logging.basicConfig(level=level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.trace:
+        TRACER.enabled = True
+        atexit.register(TRACER.save, args.trace)
+    if args.diff:
+        try:
+            diff = diff_results(load_results(args.diff[0]), load_results(args.diff[1]))
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 2
+        json.dump(diff, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    if args.render:
+        return run_render(args)
+    if args.aggregate:
+        summary = ReportAggregator().aggregate(args.aggregate)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(summary, f, indent=2)
+        else:
+            json.dump(summary, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        return 0
+    if args.verify or args.save_baseline:
+        return run_integrity_check(args)
+    if args.slow_probes is not None:
+        history = ScanHistory()
+        print(format_slow_probe_report(ProbeEngine(history=history), history, args.slow_probes))
+        return 0
+    if args.serve:
+        return run_service(args)
+    if args.headless:
+        return run_headless(args)
+    
+    profiler = StartupProfiler(enabled=bool(args.profile_startup))
+    profiler.record("imports", _IMPORTS_STARTED, _IMPORTS_FINISHED)
+    with profiler.phase("tk.Tk"):
+        root = tk.Tk()
+    app = DevScanPro(root, profiler)
+    if args.profile_startup:
+        # Process pending map/expose/idle events so the window is drawn once
+        with profiler.phase("first_paint"):
+            root.update()
+        root.destroy()
+        report = profiler.report()
+        if args.profile_startup == "-":
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        else:
+            with open(args.profile_startup, 'w') as f:
+                json.dump(report, f, indent=2)
+        return 0
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # devscan_service imports this module by name, make that the running script
+    sys.modules.setdefault("devscan_pro", sys.modules[__name__])
+    sys.exit(main())
\ No newline at end of file
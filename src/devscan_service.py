@@ -0,0 +1,235 @@
+"""Periodic scan scheduling and the local HTTP/JSON scan service
+
+Only imported by the modes that use them (--serve, --interval, GUI auto-refresh),
+so plain GUI and headless startups do not load http.server.
+"""
+import hashlib
+import hmac
+import json
+import os
+import random
+import secrets
+import socketserver
+import stat
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import devscan_pro
+from devscan_pro import (APP_NAME, APP_VERSION, ScanCancelled, build_json_report, catalog_tools,
+                         detect_system_version, logger)
+
+class ScanScheduler:
+    """Re-runs a scan at a fixed interval with jitter, backing off while the machine is busy
+
+    The first run happens one interval after start; callers scan once up front themselves.
+    """
+    def __init__(self, scan_func, interval=300, jitter=0.1, max_load=None, max_backoff=8):
+        self.scan_func = scan_func
+        self.interval = interval
+        self.jitter = jitter
+        # 1-minute load average per CPU above which a run is postponed
+        self.max_load = max_load if max_load is not None else 1.0
+        self.max_backoff = max_backoff
+        self.backoff = 1
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Run the schedule in a background thread"""
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def is_busy(self):
+        load = devscan_pro.read_load_average()
+        return load is not None and load / (os.cpu_count() or 1) > self.max_load
+
+    def next_delay(self):
+        """Interval scaled by the current backoff, randomised by +/- jitter"""
+        delay = self.interval * self.backoff
+        spread = delay * self.jitter
+        return max(1.0, delay + random.uniform(-spread, spread))
+
+    def run_forever(self):
+        """Run the schedule in the calling thread until stop() is called"""
+        while not self._stop_event.wait(self.next_delay()):
+            if self.is_busy():
+                self.backoff = min(self.backoff * 2, self.max_backoff)
+                continue
+            self.backoff = 1
+            try:
+                self.scan_func()
+            except ScanCancelled:
+                pass
+            except Exception as e:
+                logger.error("Scheduled scan failed: %s", e)
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class ScanRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for ScanService, answers conditional GETs with ETags"""
+    service = None
+
+    def address_string(self):
+        # Unix socket clients have no address tuple
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "local"
+
+    def log_message(self, format, *args):
+        if self.service.verbose:
+            logger.info("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status, etag, body):
+        if_none_match = self.headers.get('If-None-Match', '')
+        if etag and etag in [tag.strip() for tag in if_none_match.split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0].rstrip('/') or '/'
+        response = self.service.get_response(path)
+        if response is None:
+            self._send_json(404, None, b'{"error": "not found"}')
+        else:
+            self._send_json(200, *response)
+
+    def do_POST(self):
+        path = self.path.split('?', 1)[0].rstrip('/')
+        if path != '/rescan':
+            self._send_json(404, None, b'{"error": "not found"}')
+            return
+        # A custom header cannot be sent by a plain cross-origin form or fetch, and the
+        # token keeps other local users (and DNS-rebound pages) from triggering scans
+        if not self.service.authorized(self.headers.get(ScanService.TOKEN_HEADER)):
+            self._send_json(403, None, b'{"error": "missing or invalid token"}')
+            return
+        try:
+            started = self.service.rescan(wait=False)
+        except ScanCancelled:
+            self._send_json(503, None, b'{"error": "scan cancelled"}')
+            return
+        if not started:
+            self._send_json(409, None, b'{"error": "scan already running"}')
+            return
+        self._send_json(200, *self.service.get_response('/results'))
+
+class ScanService:
+    """Serves the latest scan, history diffs and on-demand rescans from memory over a local socket
+
+    Over TCP, POST /rescan needs the token written to token_file in the TOKEN_HEADER header;
+    on a Unix socket the socket's file permissions are the access control.
+    """
+    TOKEN_HEADER = "X-DevScan-Token"
+
+    def __init__(self, engine, history, tools=None, host='127.0.0.1', port=8765, socket_path=None, verbose=False,
+                 token_file=None):
+        self.engine = engine
+        self.history = history
+        self.tools = tools if tools is not None else catalog_tools()
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.verbose = verbose
+        self.system_version = detect_system_version()
+        # path -> (etag, encoded JSON body), rebuilt once per scan
+        self._responses = {}
+        self._scan_lock = threading.Lock()
+        self.server = None
+        self.token_file = Path(token_file) if token_file else devscan_pro.APP_DATA_DIR / "service_token"
+        self.token = None if socket_path else secrets.token_urlsafe(32)
+
+    def write_token(self):
+        """Store the rescan token where only this user can read it"""
+        self.token_file.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(self.token + "\n")
+
+    def authorized(self, token):
+        if self.token is None:
+            return True
+        return bool(token) and hmac.compare_digest(token.strip(), self.token)
+
+    @staticmethod
+    def _encode(document, etag_source=None):
+        body = json.dumps(document).encode('utf-8')
+        if etag_source is None:
+            return f'"{hashlib.sha1(body).hexdigest()}"', body
+        # Weak validator: unchanged tool results keep their ETag across rescans
+        digest = hashlib.sha1(json.dumps(etag_source).encode('utf-8')).hexdigest()
+        return f'W/"{digest}"', body
+
+    def publish(self, results):
+        """Record a scan and rebuild the cached responses"""
+        self.history.record(results, self.engine.last_timings, self.engine.last_usage)
+        report = build_json_report(results, APP_NAME, APP_VERSION, APP_NAME, self.system_version)
+        diff = self.history.diff_latest() or {"added": [], "removed": [], "changed": []}
+        self._responses = {
+            '/results': self._encode(report, etag_source=report['tools']),
+            '/history/diff': self._encode(diff),
+            '/health': self._encode({"status": "ok", "last_scan": self.history.latest()[0]}),
+        }
+
+    def get_response(self, path):
+        return self._responses.get(path)
+
+    def rescan(self, use_cache=False, wait=True):
+        """Scan and publish; with wait=False, return False instead of queueing behind a running scan"""
+        if not self._scan_lock.acquire(blocking=wait):
+            return False
+        try:
+            self.publish(self.engine.run_scan(self.tools, use_cache=use_cache))
+        finally:
+            self._scan_lock.release()
+        return True
+
+    def serve_forever(self):
+        """Serve until shutdown(); raises FileExistsError if socket_path exists and is not a socket"""
+        handler = type('ScanRequestHandler', (ScanRequestHandler,), {'service': self})
+        if self.socket_path:
+            if self.check_socket_path():
+                os.unlink(self.socket_path)
+            self.server = ThreadingUnixHTTPServer(self.socket_path, handler)
+        else:
+            self.server = ThreadingHTTPServer((self.host, self.port), handler)
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            try:
+                if self.socket_path and stat.S_ISSOCK(os.lstat(self.socket_path).st_mode):
+                    os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+    def check_socket_path(self):
+        """Whether a (stale) socket is left at socket_path; raises FileExistsError for any other file"""
+        try:
+            mode = os.lstat(self.socket_path).st_mode
+        except FileNotFoundError:
+            return False
+        if not stat.S_ISSOCK(mode):
+            raise FileExistsError(f"{self.socket_path} exists and is not a socket")
+        return True
+
+    def shutdown(self):
+        if self.server:
+            self.server.shutdown()
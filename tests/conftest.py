@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import devscan_pro  # noqa: E402
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    """ProbeEngine factory with a throwaway probe cache and no version manager rows"""
+    def make(**kwargs):
+        kwargs.setdefault("cache", devscan_pro.ProbeCache(tmp_path / "cache.json"))
+        kwargs.setdefault("version_managers", False)
+        return devscan_pro.ProbeEngine(**kwargs)
+
+    return make
+
+
+@pytest.fixture
+def engine(make_engine):
+    return make_engine()
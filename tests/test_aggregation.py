@@ -0,0 +1,102 @@
+"""Fleet aggregation of per-host reports in bounded memory"""
+import json
+import random
+
+import devscan_pro
+
+TOOLS = [("Git", "Version Control"), ("Python 3", "Programming"), ("Docker", "Containers"), ("Go", "Programming")]
+
+
+def host_results(rng):
+    results = []
+    for name, category in TOOLS:
+        if rng.random() < 0.7:
+            results.append((name, f"{name} {rng.randint(1, 3)}.{rng.randint(0, 9)}", "installed", category))
+        else:
+            results.append((name, "Not installed", "not_installed", category))
+    return results
+
+
+def report(results, hostname):
+    document = devscan_pro.build_json_report(results, "App", "1", "Vendor", "System")
+    document["system"]["hostname"] = hostname
+    return document
+
+
+def write_fleet(directory):
+    rng = random.Random(7)
+    (directory / "hosts").mkdir()
+    for i in range(40):
+        (directory / "hosts" / f"host-{i}.json").write_text(json.dumps(report(host_results(rng), f"json-{i}")))
+    with open(directory / "hosts" / "more.ndjson", "w") as f:
+        for i in range(150):
+            f.write(json.dumps(report(host_results(rng), f"ndjson-{i}")) + "\n")
+    devscan_pro.write_snapshot(str(directory / "hosts" / "host.dsps"), host_results(rng), {"hostname": "dsps-0"})
+    # One host with nothing installed, to produce an outlier
+    empty = [(name, "Not installed", "not_installed", category) for name, category in TOOLS]
+    (directory / "hosts" / "bare.json").write_text(json.dumps(report(empty, "bare")))
+    return [str(directory / "hosts")]
+
+
+def without_timestamp(summary):
+    summary.pop("generated")
+    return summary
+
+
+def test_spilled_aggregation_matches_in_memory(tmp_path, monkeypatch):
+    paths = write_fleet(tmp_path)
+    in_memory = without_timestamp(devscan_pro.ReportAggregator().aggregate(paths))
+
+    spills = []
+    original = devscan_pro.ExternalCounter._spill
+    monkeypatch.setattr(devscan_pro.ExternalCounter, "_spill", lambda self: spills.append(1) or original(self))
+    spilled = without_timestamp(devscan_pro.ReportAggregator(max_keys=3).aggregate(paths))
+
+    assert len(spills) > 10
+    assert spilled == in_memory
+    assert in_memory["hosts"] == 40 + 150 + 1 + 1
+    assert in_memory["outliers"][0]["host"] == "bare"
+
+
+def test_counts(tmp_path):
+    results = [("Git", "git 2.39", "installed", "Version Control"), ("Go", "Not installed", "not_installed", "Programming")]
+    for i in range(4):
+        (tmp_path / f"{i}.json").write_text(json.dumps(report(results if i else results[:1], f"h{i}")))
+    summary = devscan_pro.ReportAggregator().aggregate([str(tmp_path)])
+    assert summary["hosts"] == 4
+    assert {tool["name"]: tool["coverage"] for tool in summary["tools"]} == {"Git": 100.0, "Go": 0.0}
+    assert summary["versions"] == {"Git": [{"version": "git 2.39", "hosts": 4}]}
+
+
+def test_broken_ndjson_line_is_skipped(tmp_path, caplog):
+    rng = random.Random(3)
+    path = tmp_path / "fleet.ndjson"
+    path.write_text(json.dumps(report(host_results(rng), "a")) + "\n"
+                    + '{"system": {"hostname": "b"}, "tools": [\n'
+                    + json.dumps(report(host_results(rng), "c")) + "\n")
+    summary = devscan_pro.ReportAggregator().aggregate([str(path)])
+    assert summary["hosts"] == 2
+    assert f"{path}:2" in caplog.text
+
+
+def test_tool_without_name_skips_its_report(tmp_path, caplog):
+    rng = random.Random(5)
+    broken = report(host_results(rng), "b")
+    del broken["tools"][1]["name"]
+    path = tmp_path / "fleet.ndjson"
+    path.write_text("\n".join(json.dumps(document) for document in
+                              [report(host_results(rng), "a"), broken, ["not", "a", "report"],
+                               report(host_results(rng), "c")]) + "\n")
+    summary = devscan_pro.ReportAggregator().aggregate([str(path)])
+    assert summary["hosts"] == 2
+    assert f"{path}:2" in caplog.text and f"{path}:3" in caplog.text
+
+
+def test_corrupt_snapshot_is_skipped(tmp_path):
+    rng = random.Random(9)
+    good, bad = tmp_path / "good.dsps", tmp_path / "bad.dsps"
+    devscan_pro.write_snapshot(str(good), host_results(rng), {"hostname": "good"})
+    devscan_pro.write_snapshot(str(bad), host_results(rng) * 20, {"hostname": "bad"}, compression="none")
+    bad.write_bytes(bad.read_bytes()[:-10])
+    summary = devscan_pro.ReportAggregator().aggregate([str(good), str(bad)])
+    assert summary["hosts"] == 1
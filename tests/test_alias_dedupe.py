@@ -0,0 +1,59 @@
+"""Tools that resolve to the same binary are probed once"""
+import os
+import shutil
+
+import pytest
+
+import devscan_pro
+
+
+@pytest.fixture
+def bin_dir(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "runs.log"
+
+    def script(name, body):
+        path = bin_dir / name
+        path.write_text(f"#!/bin/sh\necho \"$0 $*\" >> {log}\n{body}\n")
+        path.chmod(0o755)
+
+    script("python3.11", 'echo "Python 3.11.7"')
+    (bin_dir / "python3").symlink_to("python3.11")
+    (bin_dir / "python").symlink_to("python3")
+    # Multi-call binary: the output depends on the name it is invoked as
+    script("busybox", 'echo "$(basename "$0") (BusyBox v1.36.1)"')
+    (bin_dir / "tar").symlink_to("busybox")
+    (bin_dir / "gzip").symlink_to("busybox")
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return lambda: log.read_text().splitlines() if log.exists() else []
+
+
+def scan(engine, tools):
+    return engine.run_scan(tools, use_cache=False)
+
+
+def test_symlinked_aliases_share_one_probe(engine, bin_dir):
+    results = scan(engine, [("python3 --version", "Python 3", "Programming", "version"),
+                              ("python --version", "Python", "Programming", "version"),
+                              ("python3.11 -V", "Python 3.11", "Programming", "version")])
+    assert results == [("Python 3", "Python 3.11.7", "installed", "Programming"),
+                       ("Python", "Python 3.11.7", "installed", "Programming"),
+                       ("Python 3.11", "Python 3.11.7", "installed", "Programming")]
+    # Same binary and arguments once; different arguments are a probe of their own
+    assert len(bin_dir()) == 2
+
+
+def test_multi_call_binaries_are_not_merged(engine, bin_dir):
+    results = scan(engine, [("tar --version", "tar", "System", "version"),
+                              ("gzip --version", "gzip", "System", "version")])
+    assert [row[1] for row in results] == ["tar (BusyBox v1.36.1)", "gzip (BusyBox v1.36.1)"]
+    assert len(bin_dir()) == 2
+
+
+def test_alias_key(bin_dir):
+    real = os.path.realpath(shutil.which("python3.11"))
+    assert devscan_pro.ProbeEngine.alias_key("python --version", "version") == (real, None, "--version")
+    assert devscan_pro.ProbeEngine.alias_key("tar --version", "version")[1] == "tar"
+    assert devscan_pro.ProbeEngine.alias_key("python", "which") is None
+    assert devscan_pro.ProbeEngine.alias_key("no-such-tool --version", "version") is None
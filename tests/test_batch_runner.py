@@ -0,0 +1,140 @@
+"""Single-shell batch probing: cancellation and retries"""
+import os
+import threading
+import shutil
+import subprocess
+import time
+
+import devscan_pro
+
+
+class LearnedHistory:
+    """Every tool has a recorded p99 of 100 ms, giving the 300 ms minimum deadline"""
+
+    def timing_percentile(self, name, percentile=99, min_samples=5):
+        return 0.1
+
+
+def test_batch_results(make_engine):
+    runner = devscan_pro.BatchProbeRunner(make_engine(batch=True))
+    results = runner.run([("echo v1.2", "Echo", "System", "version"),
+                          ("exit 1", "Missing", "System", "version"),
+                          ("sh", "Shell", "System", "which")])
+    assert results[0] == ("v1.2", "installed", "System")
+    assert results[1] == ("Not installed", "not_installed", "System")
+    assert results[2][1] == "installed" and results[2][0].startswith("Found: /")
+
+
+def test_exit_codes_of_timeout_are_not_timeouts(make_engine):
+    engine = make_engine(batch=True)
+    engine.check_tool = None  # no single-probe retry either
+    results = devscan_pro.BatchProbeRunner(engine).run([("echo v1; exit 124", "Exit124", "System", "version"),
+                                                        ("kill -KILL $$", "Killed", "System", "version")])
+    assert results == [("Not installed", "not_installed", "System")] * 2
+
+
+def test_batch_timeout_is_retried_with_longer_budget(make_engine):
+    engine = make_engine(history=LearnedHistory(), batch=True)
+    results = devscan_pro.BatchProbeRunner(engine).run([("sleep 0.6; echo slow 1.0", "Slow", "System", "version")])
+    assert results == [("slow 1.0", "installed", "System")]
+    assert engine.last_timings["Slow"] >= 0.6
+
+
+def _running(marker):
+    """Whether a process whose exact command line is marker is alive"""
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                if f.read().split(b"\0")[:-1] == marker.encode().split():
+                    with open(f"/proc/{pid}/stat") as stat:
+                        if stat.read().rsplit(")", 1)[1].split()[0] != "Z":
+                            return True
+        except OSError:
+            continue
+    return False
+
+
+def _gone(marker, timeout=1.0):
+    """Whether the process with command line marker is gone, allowing a moment for SIGKILL delivery"""
+    deadline = time.monotonic() + timeout
+    while _running(marker):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_cancel_kills_running_batch_probe(make_engine):
+    engine = make_engine(batch=True)
+    marker = "sleep 31.25"
+    outcome = {}
+
+    def run():
+        try:
+            devscan_pro.BatchProbeRunner(engine).run([(marker, "Sleeper", "System", "version")])
+        except devscan_pro.ScanCancelled:
+            outcome["cancelled"] = time.monotonic()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not _running(marker) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert _running(marker)
+    cancelled_at = time.monotonic()
+    engine.cancel()
+    thread.join(5)
+    assert outcome["cancelled"] - cancelled_at < 2
+    time.sleep(0.2)
+    assert not _running(marker)
+
+
+def test_timed_out_batch_probe_leaves_no_orphans(make_engine):
+    engine = make_engine(history=LearnedHistory(), batch=True)
+    engine.retry_factor = 0
+    marker = "sleep 7.77"
+    results = devscan_pro.BatchProbeRunner(engine).run([(f"{marker}; echo 1.0", "Sleeper", "System", "version"),
+                                                        ("echo v2", "Echo", "System", "version")])
+    assert results == [("Timeout", "not_installed", "System"), ("v2", "installed", "System")]
+    assert _gone(marker)
+
+
+def test_watchdog_without_timeout_command(make_engine, tmp_path, monkeypatch):
+    # A PATH with the script's helpers but no timeout(1)
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for tool in ("mktemp", "date", "head", "rm", "sleep"):
+        (bin_dir / tool).symlink_to(shutil.which(tool))
+    engine = make_engine(history=LearnedHistory(), batch=True)
+    engine.retry_factor = 0
+    engine.probe_env = {"PATH": str(bin_dir)}
+    # Both probes must be answered by the batch itself, not by the single-probe fallback
+    monkeypatch.setattr(engine, "_timed_check", None)
+    marker = "sleep 6.66"
+    start = time.monotonic()
+    results = devscan_pro.BatchProbeRunner(engine).run([(f"{marker}; echo 1.0", "Sleeper", "System", "version"),
+                                                        ("echo v2", "Echo", "System", "version"),
+                                                        ("exit 124", "Exit124", "System", "version")])
+    assert time.monotonic() - start < 3
+    assert results == [("Timeout", "not_installed", "System"), ("v2", "installed", "System"),
+                       ("Not installed", "not_installed", "System")]
+    assert _gone(marker)
+
+
+def test_batch_budget_keeps_completed_probes(make_engine, monkeypatch):
+    engine = make_engine(batch=True)
+    monkeypatch.setattr(engine, "probe_deadline", lambda name, check_type: 30)
+    # Run out of the whole batch's budget while the second probe is still running
+    communicate = subprocess.Popen.communicate
+    monkeypatch.setattr(subprocess.Popen, "communicate", lambda self, input=None, timeout=None:
+                        communicate(self, input, timeout=timeout and 0.5))
+    fallback = []
+    monkeypatch.setattr(engine, "_timed_check", lambda command, name, category, check_type:
+                        fallback.append(name) or ("Timeout", "not_installed", category))
+    start = time.monotonic()
+    results = devscan_pro.BatchProbeRunner(engine).run([("echo v1", "Echo", "System", "version"),
+                                                        ("sleep 5.55", "Sleeper", "System", "version")])
+    assert time.monotonic() - start < 3
+    assert results[0] == ("v1", "installed", "System")
+    assert fallback == ["Sleeper"]
+    assert _gone("sleep 5.55")
@@ -0,0 +1,149 @@
+"""Single-pass export to several formats"""
+import datetime
+import json
+
+import pytest
+
+import devscan_pro
+
+RESULTS = [
+    ("Git", "git version 2.39.5", "installed", "Version Control"),
+    ("Python 3", "Python 3.11.7", "installed", "Programming"),
+    ("Docker", "Not installed", "not_installed", "Containers"),
+    ("Quotes", 'openjdk version "21" </script>', "installed", "Programming"),
+]
+CONTEXT = {"app_name": "DevScan Pro", "version": "1.0.0", "vendor": "DevScan Pro", "system_version": "Ubuntu 24.04"}
+
+
+class FrozenDatetime(datetime.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 1, 2, 3, 4, 5, 678901)
+
+
+@pytest.fixture(autouse=True)
+def frozen_clock(monkeypatch):
+    monkeypatch.setattr(devscan_pro.datetime, "datetime", FrozenDatetime)
+
+
+@pytest.mark.parametrize("results", [RESULTS, [], RESULTS * 300], ids=["small", "empty", "chunked"])
+@pytest.mark.parametrize("extra", [{}, {"license_info": {"status": "trial", "exports_used": 1}},
+                                   {"export_type": "selective"}], ids=["plain", "license", "selective"])
+def test_json_sink_is_byte_identical(tmp_path, results, extra):
+    context = dict(CONTEXT, **extra)
+    path = tmp_path / "report.json"
+    devscan_pro.ExportPipeline([devscan_pro.JsonReportSink(str(path), context)]).run(results)
+    expected = devscan_pro.build_json_report(results, context["app_name"], context["version"], context["vendor"],
+                                             context["system_version"], context.get("license_info"),
+                                             context.get("export_type"))
+    assert path.read_text() == json.dumps(expected, indent=2)
+
+
+def test_ndjson_sink_appends_compact_report(tmp_path):
+    path = tmp_path / "reports.ndjson"
+    for _ in range(2):
+        devscan_pro.ExportPipeline([devscan_pro.NdjsonReportSink(str(path), CONTEXT)]).run(RESULTS)
+    expected = devscan_pro.build_json_report(RESULTS, "DevScan Pro", "1.0.0", "DevScan Pro", "Ubuntu 24.04")
+    assert path.read_text().splitlines() == [json.dumps(expected, separators=(",", ":"))] * 2
+
+
+def test_all_formats_in_one_pass(tmp_path):
+    pipeline = devscan_pro.ExportPipeline.for_formats(str(tmp_path), "report", ["txt", "json", "csv", "html"], CONTEXT)
+    files = pipeline.run(RESULTS)
+    assert sorted(p.rsplit("/", 1)[1] for p in files) == ["report.csv", "report.html", "report.json", "report.txt"]
+    text = (tmp_path / "report.txt").read_text()
+    assert "DevScan Pro - Development Tools Report" in text and "✅ Git: git version 2.39.5" in text
+    assert "Installation rate: 75.0%" in text
+    assert (tmp_path / "report.csv").read_text().count("\n") == len(RESULTS) + 1
+    html = (tmp_path / "report.html").read_text()
+    # A version containing </script> must not close the embedded data block
+    assert '"openjdk version \\"21\\" <\\/script>"' in html
+    assert html.count("<script") == html.count("</script>")
+
+
+def test_title_reaches_text_report(tmp_path):
+    path = tmp_path / "selected.txt"
+    context = dict(CONTEXT, title="Selected Tools Report")
+    devscan_pro.ExportPipeline([devscan_pro.TextReportSink(str(path), context)]).run(RESULTS[:1])
+    assert path.read_text().startswith("DevScan Pro - Selected Tools Report\n")
+
+
+def test_sink_errors_are_raised(tmp_path):
+    sink = devscan_pro.JsonReportSink(str(tmp_path / "missing" / "report.json"), CONTEXT)
+    with pytest.raises(OSError):
+        devscan_pro.ExportPipeline([sink]).run(RESULTS)
+
+
+def html_blocks(html):
+    """The embedded rows and summary of an HTML dashboard"""
+    data = html.split('<script id="data" type="application/json">', 1)[1].split("</script>", 1)[0]
+    summary = html.split('<script id="summary-data" type="application/json">', 1)[1].split("</script>", 1)[0]
+    return json.loads(data), json.loads(summary)
+
+
+@pytest.mark.parametrize("results", [RESULTS, [], RESULTS * 300], ids=["small", "empty", "chunked"])
+def test_html_dashboard_embeds_all_rows(tmp_path, results):
+    path = tmp_path / "report.html"
+    devscan_pro.ExportPipeline([devscan_pro.HtmlReportSink(str(path), CONTEXT)]).run(results)
+    rows, summary = html_blocks(path.read_text())
+    assert rows == [[name, version, 1 if status == "installed" else 0, category]
+                    for name, version, status, category in results]
+    assert summary["total"] == len(results)
+    assert summary["installed"] == sum(1 for row in results if row[2] == "installed")
+
+
+def test_html_dashboard_escapes_metadata(tmp_path):
+    path = tmp_path / "report.html"
+    context = dict(CONTEXT, system_version="<b>Ubuntu</b>", license_status="Trial & co")
+    devscan_pro.ExportPipeline([devscan_pro.HtmlReportSink(str(path), context)]).run(RESULTS[:1])
+    html = path.read_text()
+    assert "&lt;b&gt;Ubuntu&lt;/b&gt;" in html and "Trial &amp; co" in html and "<b>" not in html
+    assert "Generated 2026-01-02 03:04:05" in html
+
+
+def test_render_large_snapshot(tmp_path, capsys):
+    rows = [(f"tool-{i}", f"{i % 7}.{i % 13}.{i}", "installed" if i % 3 else "not_installed", f"Category {i % 20}")
+            for i in range(100000)]
+    snapshot = tmp_path / "fleet.dsps"
+    devscan_pro.write_snapshot(str(snapshot), rows, compression="none")
+    out = tmp_path / "out"
+    assert devscan_pro.main(["--render", str(snapshot), "--export-dir", str(out), "--formats", "html,csv,json"]) == 0
+    assert sorted(p.name for p in out.iterdir()) == ["fleet.csv", "fleet.html", "fleet.json"]
+    report = json.loads((out / "fleet.json").read_text())
+    assert report["export_type"] == "render"
+    assert [tuple(t.values()) for t in report["tools"]] == rows
+    assert report["summary"]["installed"] == sum(1 for row in rows if row[2] == "installed")
+    assert (out / "fleet.csv").read_text().count("\n") == len(rows) + 1
+    assert (out / "fleet.html").read_text().count('["tool-') == len(rows)
+
+
+def test_render_fleet_groups_rows_by_host(tmp_path):
+    reports = tmp_path / "reports.ndjson"
+    for host in ("alpha", "beta"):
+        report = devscan_pro.build_json_report(RESULTS, "DevScan Pro", "1.0.0", "DevScan Pro", "Ubuntu 24.04")
+        report["system"]["hostname"] = host
+        with open(reports, "a") as f:
+            f.write(json.dumps(report) + "\n")
+    rows = list(devscan_pro.iter_report_results([str(reports)]))
+    assert len(rows) == 2 * len(RESULTS)
+    assert rows[0] == ("Git", "git version 2.39.5", "installed", "alpha / Version Control")
+    assert rows[-1][3] == "beta / Programming"
+
+
+def test_render_refuses_to_overwrite_its_input(tmp_path, capsys):
+    source = tmp_path / "report.json"
+    source.write_text(json.dumps(devscan_pro.build_json_report(RESULTS, "DevScan Pro", "1.0.0", "DevScan Pro", "x")))
+    assert devscan_pro.main(["--render", str(source), "--export-dir", str(tmp_path), "--formats", "json"]) == 2
+    assert "Refusing to overwrite" in capsys.readouterr().err
+    assert len(json.loads(source.read_text())["tools"]) == len(RESULTS)
+
+
+def test_install_script_only_when_tools_are_missing(tmp_path):
+    installed = [row for row in RESULTS if row[2] == "installed"]
+    files = devscan_pro.ExportPipeline.for_formats(str(tmp_path), "report", ["txt", "sh"], CONTEXT).run(installed)
+    assert [p.rsplit("/", 1)[1] for p in files] == ["report.txt"]
+    assert not (tmp_path / "report.sh").exists()
+
+    files = devscan_pro.ExportPipeline.for_formats(str(tmp_path), "report", ["txt", "sh"], CONTEXT).run(RESULTS)
+    assert [p.rsplit("/", 1)[1] for p in files] == ["report.txt", "report.sh"]
+    assert "Docker" in (tmp_path / "report.sh").read_text()
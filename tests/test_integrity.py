@@ -0,0 +1,89 @@
+"""Binary integrity checks against dpkg md5sums and a saved baseline"""
+import os
+
+import pytest
+
+import devscan_pro
+
+
+@pytest.fixture
+def tool(tmp_path, monkeypatch):
+    """A tool binary on PATH, reached through a symlink like /usr/bin/x -> /etc/alternatives/x"""
+    real = tmp_path / "opt" / "mytool-1.0"
+    real.parent.mkdir()
+    real.write_bytes(b"\x7fELF fake binary\n" * 1000)
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "mytool").symlink_to(real)
+    real.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return real
+
+
+@pytest.fixture
+def verifier(tmp_path, monkeypatch):
+    monkeypatch.setattr(devscan_pro.IntegrityVerifier, "DPKG_INFO_DIR", str(tmp_path / "dpkg"))
+    return devscan_pro.IntegrityVerifier(cache_file=tmp_path / "cache.json", baseline_file=tmp_path / "baseline.json")
+
+
+TOOLS = [("mytool --version", "MyTool", "System", "version"),
+         ("no-such-tool --version", "Missing", "System", "version"),
+         ("dpkg -l mytool", "MyTool package", "System", "package")]
+
+
+def status(verifier, tools=TOOLS):
+    return {entry["name"]: (entry["status"], entry["checked_against"]) for entry in verifier.verify(tools)}
+
+
+def write_md5sums(tmp_path, path, md5):
+    (tmp_path / "dpkg").mkdir(exist_ok=True)
+    (tmp_path / "dpkg" / "mytool:amd64.md5sums").write_text(f"{md5}  {str(path).lstrip('/')}\n")
+
+
+def test_resolves_symlinks_and_skips_non_binaries(verifier, tool):
+    assert devscan_pro.IntegrityVerifier.resolve(TOOLS) == {"MyTool": str(tool)}
+
+
+def test_unverified_without_dpkg_or_baseline(verifier, tool):
+    assert status(verifier) == {"MyTool": ("unverified", None)}
+
+
+def test_baseline(verifier, tool):
+    verifier.save_baseline(TOOLS)
+    assert status(verifier) == {"MyTool": ("ok", "baseline")}
+    tool.write_bytes(b"\x7fELF tampered\n")
+    assert status(verifier) == {"MyTool": ("modified", "baseline")}
+
+
+def test_dpkg_md5sums(verifier, tool, tmp_path):
+    _, md5 = verifier._hash_file(tool)
+    write_md5sums(tmp_path, tool, md5)
+    entry = verifier.verify(TOOLS)[0]
+    assert (entry["status"], entry["checked_against"], entry["package"]) == ("ok", "dpkg", "mytool")
+    verifier.save_baseline(TOOLS)
+    assert status(verifier) == {"MyTool": ("ok", "dpkg+baseline")}
+    write_md5sums(tmp_path, tool, "0" * 32)
+    # A dpkg mismatch is not overruled by the baseline
+    assert status(verifier) == {"MyTool": ("modified", "dpkg")}
+
+
+def test_unchanged_files_are_not_rehashed(verifier, tool, monkeypatch):
+    verifier.hash_files([str(tool)])
+    reloaded = devscan_pro.IntegrityVerifier(cache_file=verifier.cache_file)
+    monkeypatch.setattr(reloaded, "_hash_file", None)
+    assert reloaded.hash_files([str(tool)]) == verifier.hash_files([str(tool)])
+
+
+def test_only_path_plugins_are_resolved(verifier, tool, tmp_path, monkeypatch):
+    probe_dir = tmp_path / "probes" / "Custom"
+    probe_dir.mkdir(parents=True)
+    # "mytool" is on PATH, but only the path strategy actually runs it
+    (probe_dir / "probes.py").write_text(
+        "PROBES = [{'name': 'Path', 'strategy': 'path', 'command': 'mytool --version'},\n"
+        "          {'name': 'Env', 'strategy': 'env', 'env': 'mytool'},\n"
+        "          {'name': 'Package', 'strategy': 'package', 'package': 'mytool'},\n"
+        "          {'name': 'File', 'strategy': 'file', 'path': 'mytool'}]\n")
+    registry = devscan_pro.ProbePluginRegistry(tmp_path / "probes")
+    registry._entry_points = []
+    monkeypatch.setattr(devscan_pro, "PROBE_PLUGINS", registry)
+    assert devscan_pro.IntegrityVerifier.resolve(registry.tools()) == {"Path": str(tool)}
@@ -0,0 +1,48 @@
+"""Isolated probes: fixed environment, but tools still run as installed by the user"""
+import os
+
+import pytest
+
+import devscan_pro
+
+
+@pytest.fixture
+def nvm_bin(tmp_path, monkeypatch):
+    """An nvm-style bin directory outside the isolated PATH: npm is a #!/usr/bin/env node script"""
+    bin_dir = tmp_path / "nvm" / "bin"
+    bin_dir.mkdir(parents=True)
+    node = bin_dir / "node"
+    node.write_text('#!/bin/sh\necho "10.2.4$NODE_OPTIONS"\n')
+    npm = bin_dir / "npm"
+    npm.write_text("#!/usr/bin/env node\nrequire('npm')\n")
+    for script in (node, npm):
+        script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("NODE_OPTIONS", " --bogus")
+    return bin_dir
+
+
+def test_environment_is_minimal(monkeypatch):
+    monkeypatch.setenv("BASH_ENV", "/tmp/hook.sh")
+    env = devscan_pro.ProbeEngine.probe_environment()
+    assert env["PATH"] == devscan_pro.ProbeEngine.ISOLATED_PATH
+    assert env["LC_ALL"] == "C" and "BASH_ENV" not in env and "NODE_OPTIONS" not in env
+
+
+def test_shebang_tool_finds_its_interpreter(make_engine, nvm_bin):
+    engine = make_engine(isolated=True)
+    assert engine.check_tool("npm --version", "npm", "Build Tools") == ("10.2.4", "installed", "Build Tools")
+
+
+def test_shebang_tool_in_batch(make_engine, nvm_bin):
+    engine = make_engine(isolated=True, batch=True)
+    results = devscan_pro.BatchProbeRunner(engine).run([("npm --version", "npm", "Build Tools", "version"),
+                                                        ("node", "Node.js", "Programming", "which")])
+    assert results == [("10.2.4", "installed", "Build Tools"),
+                       (f"Found: {nvm_bin / 'node'}", "installed", "Programming")]
+
+
+def test_unresolved_tool_runs_under_isolated_path(make_engine):
+    engine = make_engine(isolated=True)
+    assert engine.prepare_command("no-such-tool --version", "version") == "no-such-tool --version"
+    assert engine.check_tool("no-such-tool --version", "Missing")[1] == "not_installed"
@@ -0,0 +1,304 @@
+"""Offline license tokens, checked against a local stub issuer"""
+import base64
+import datetime
+import hashlib
+import json
+import random
+
+import pytest
+
+import devscan_pro
+
+SYSTEM_ID = "test-machine"
+LICENSE_KEY = "ABCD-1234-EFGH-5678"
+
+
+def _is_probable_prime(n, rng, rounds=20):
+    if n < 2:
+        return False
+    for p in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29):
+        if n % p == 0:
+            return n == p
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d, r = d // 2, r + 1
+    for _ in range(rounds):
+        x = pow(rng.randrange(2, n - 1), d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def generate_rsa_key(bits=1024, seed=0):
+    """((n, e), d) for a throwaway RSA key"""
+    rng = random.Random(seed)
+    e = 65537
+    while True:
+        primes = []
+        while len(primes) < 2:
+            candidate = rng.getrandbits(bits // 2) | (1 << (bits // 2 - 1)) | 1
+            if _is_probable_prime(candidate, rng) and (candidate - 1) % e:
+                primes.append(candidate)
+        p, q = primes
+        n = p * q
+        if p != q and n.bit_length() == bits:
+            return (n, e), pow(e, -1, (p - 1) * (q - 1))
+
+
+def utcnow():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+class StubIssuer:
+    """Signs tokens the way the license server does"""
+
+    def __init__(self, seed=0):
+        self.public_key, self.private_exponent = generate_rsa_key(seed=seed)
+
+    def sign(self, message):
+        n, _ = self.public_key
+        size = (n.bit_length() + 7) // 8
+        digest_info = devscan_pro._SHA256_DIGEST_INFO + hashlib.sha256(message).digest()
+        encoded = b"\x00\x01" + b"\xff" * (size - len(digest_info) - 3) + b"\x00" + digest_info
+        return pow(int.from_bytes(encoded, "big"), self.private_exponent, n).to_bytes(size, "big")
+
+    def token(self, license_key=LICENSE_KEY, system_id=SYSTEM_ID, issued=None, expires=None):
+        payload = {
+            "key": devscan_pro.license_key_digest(license_key),
+            "system_id": system_id,
+            "customer": "Test Customer",
+            "issued": (issued or utcnow()).isoformat(),
+            "expires": expires.isoformat() if expires else "",
+        }
+        payload_part = _b64url(json.dumps(payload).encode("utf-8"))
+        return payload_part + "." + _b64url(self.sign(payload_part.encode("ascii")))
+
+
+class FakeResponse:
+    def __init__(self, result, status_code=200):
+        self.result = result
+        self.status_code = status_code
+
+    def json(self):
+        return self.result
+
+
+@pytest.fixture
+def issuer():
+    return StubIssuer()
+
+
+@pytest.fixture
+def make_validator(tmp_path, monkeypatch):
+    monkeypatch.setattr(devscan_pro, "APP_DATA_DIR", tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    def make(public_key, responses=None):
+        validator = devscan_pro.LicenseValidator(public_key=public_key)
+        validator.get_system_fingerprint = lambda: SYSTEM_ID
+        calls = []
+
+        def request_validation(license_key):
+            calls.append(license_key)
+            if not responses:
+                raise ConnectionError("offline")
+            return responses.pop(0)
+
+        validator._request_validation = request_validation
+        validator.calls = calls
+        return validator
+
+    return make
+
+
+def test_rsa_verify_rejects_tampered_message(issuer):
+    signature = issuer.sign(b"payload")
+    assert devscan_pro.rsa_verify_sha256(b"payload", signature, issuer.public_key)
+    assert not devscan_pro.rsa_verify_sha256(b"payloaD", signature, issuer.public_key)
+    assert not devscan_pro.rsa_verify_sha256(b"payload", signature[:-1] + b"\x00", issuer.public_key)
+
+
+def test_online_activation_then_offline_reuse(issuer, make_validator):
+    validator = make_validator(issuer.public_key, [FakeResponse(
+        {"valid": True, "customer": "Test Customer", "token": issuer.token()})])
+    valid, _, customer = validator.validate_license(LICENSE_KEY)
+    validator.stop_background_revalidation()
+    assert valid and customer == "Test Customer"
+    assert validator.calls == [LICENSE_KEY]
+
+    # A fresh process with no network accepts the cached token without asking the server
+    offline = make_validator(issuer.public_key)
+    valid, message, customer = offline.validate_license(LICENSE_KEY)
+    offline.stop_background_revalidation()
+    assert valid and "offline" in message
+    assert customer == "Test Customer"
+    assert offline.calls == []
+
+
+def test_token_rejections(issuer, make_validator):
+    validator = make_validator(issuer.public_key)
+    assert validator.verify_token(issuer.token(), LICENSE_KEY)
+
+    payload_part, signature_part = issuer.token().split(".")
+    tampered = _b64url(base64.urlsafe_b64decode(payload_part + "==").replace(b"Test", b"Evil"))
+    assert validator.verify_token(tampered + "." + signature_part, LICENSE_KEY) is None
+    assert validator.verify_token(StubIssuer(seed=1).token(), LICENSE_KEY) is None
+    assert validator.verify_token(issuer.token(), "OTHER-KEY") is None
+    assert validator.verify_token(issuer.token(system_id="another-machine"), LICENSE_KEY) is None
+    stale = utcnow() - datetime.timedelta(days=validator.max_offline_days + 1)
+    assert validator.verify_token(issuer.token(issued=stale), LICENSE_KEY) is None
+    expired = utcnow() - datetime.timedelta(minutes=1)
+    assert validator.verify_token(issuer.token(expires=expired), LICENSE_KEY) is None
+    assert validator.verify_token("garbage", LICENSE_KEY) is None
+
+
+def test_revocation_clears_store(issuer, make_validator):
+    validator = make_validator(issuer.public_key, [
+        FakeResponse({"valid": True, "customer": "Test Customer", "token": issuer.token()}),
+        FakeResponse({"valid": False, "message": "revoked"}),
+    ])
+    assert validator.validate_license(LICENSE_KEY)[0]
+    validator.stop_background_revalidation()
+    assert validator.verify_cached_token(LICENSE_KEY)
+
+    validator._revalidate(LICENSE_KEY)
+    assert validator.get_license_info() is None
+    assert validator.verify_cached_token(LICENSE_KEY) is None
+    assert validator._revalidation_timer is None
+
+
+def test_token_times_are_compared_in_utc(issuer, make_validator):
+    validator = make_validator(issuer.public_key)
+    now = utcnow()
+    # Naive timestamps are UTC, "Z" and explicit offsets are honoured
+    naive = (now - datetime.timedelta(minutes=5)).replace(tzinfo=None)
+    assert validator.verify_token(issuer.token(issued=naive), LICENSE_KEY)
+    zulu = issuer.token()
+    payload = json.loads(base64.urlsafe_b64decode(zulu.split(".")[0] + "=="))
+    payload["expires"] = (now + datetime.timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    payload_part = _b64url(json.dumps(payload).encode("utf-8"))
+    signed = payload_part + "." + _b64url(issuer.sign(payload_part.encode("ascii")))
+    assert validator.verify_token(signed, LICENSE_KEY)
+    # One minute past expiry, written as a local time five hours ahead of UTC
+    plus_five = datetime.timezone(datetime.timedelta(hours=5))
+    expired = (now - datetime.timedelta(minutes=1)).astimezone(plus_five)
+    assert validator.verify_token(issuer.token(expires=expired), LICENSE_KEY) is None
+    assert validator.verify_token(issuer.token(expires=expired + datetime.timedelta(minutes=2)), LICENSE_KEY)
+
+
+def test_no_key_disables_tokens_and_revalidation(issuer, make_validator):
+    validator = make_validator(None, [FakeResponse(
+        {"valid": True, "customer": "Test Customer", "token": issuer.token()})])
+    assert validator.public_key is None
+    assert validator.validate_license(LICENSE_KEY)[0]
+    assert validator._revalidation_timer is None
+    assert validator.verify_cached_token(LICENSE_KEY) is None
+
+
+def _der(tag, contents):
+    length = len(contents)
+    if length < 0x80:
+        header = bytes([tag, length])
+    else:
+        size = (length.bit_length() + 7) // 8
+        header = bytes([tag, 0x80 | size]) + length.to_bytes(size, "big")
+    return header + contents
+
+
+def _der_int(value):
+    return _der(0x02, value.to_bytes(value.bit_length() // 8 + 1, "big"))
+
+
+def spki_pem(public_key):
+    n, e = public_key
+    rsa_key = _der(0x30, _der_int(n) + _der_int(e))
+    algorithm = _der(0x30, bytes.fromhex("06092a864886f70d010101") + b"\x05\x00")
+    der = _der(0x30, algorithm + _der(0x03, b"\x00" + rsa_key))
+    body = base64.b64encode(der).decode("ascii")
+    lines = [body[i:i + 64] for i in range(0, len(body), 64)]
+    return "\n".join(["-----BEGIN PUBLIC KEY-----"] + lines + ["-----END PUBLIC KEY-----"]) + "\n"
+
+
+def test_parse_public_key_pem(issuer):
+    assert devscan_pro.parse_rsa_public_key(spki_pem(issuer.public_key)) == issuer.public_key
+
+
+def make_app(tmp_path, validator):
+    """DevScanPro license state without the Tk widgets"""
+    app = devscan_pro.DevScanPro.__new__(devscan_pro.DevScanPro)
+    app.license_file = tmp_path / "trial_data.json"
+    app.legacy_license_file = str(tmp_path / "legacy.json")
+    app.trial_store = devscan_pro.StateStore(app.license_file)
+    app.license_validator = validator
+    app.trial_store.update({"first_run": datetime.datetime.now().isoformat(), "export_count": 0,
+                            "activated": True, "license_key": LICENSE_KEY})
+    app.trial_store.flush()
+    return app
+
+
+def stored_trial_data(app):
+    return json.loads(app.license_file.read_text())
+
+
+def test_startup_with_expired_token_deactivates(issuer, make_validator, tmp_path):
+    validator = make_validator(issuer.public_key)
+    expired = utcnow() - datetime.timedelta(days=1)
+    validator._save_license_info(LICENSE_KEY, {"customer": "Test Customer", "token": issuer.token(expires=expired)})
+    app = make_app(tmp_path, validator)
+
+    app.initialize_license_system()
+    assert app.activated is False and app.license_key is None
+    assert stored_trial_data(app)["activated"] is False
+    assert validator._revalidation_timer is None
+
+
+def test_startup_with_tampered_token_deactivates(issuer, make_validator, tmp_path):
+    validator = make_validator(issuer.public_key)
+    validator._save_license_info(LICENSE_KEY, {"customer": "Test Customer", "token": StubIssuer(seed=1).token()})
+    app = make_app(tmp_path, validator)
+
+    app.initialize_license_system()
+    assert app.activated is False
+    assert stored_trial_data(app)["license_key"] is None
+
+
+def test_startup_with_valid_token_activates(issuer, make_validator, tmp_path):
+    validator = make_validator(issuer.public_key)
+    validator._save_license_info(LICENSE_KEY, {"customer": "Test Customer", "token": issuer.token()})
+    app = make_app(tmp_path, validator)
+
+    app.initialize_license_system()
+    validator.stop_background_revalidation()
+    assert app.activated is True and app.license_key == LICENSE_KEY
+
+
+def test_revocation_deactivates_running_app(issuer, make_validator, tmp_path):
+    validator = make_validator(issuer.public_key, [FakeResponse({"valid": False, "message": "revoked"})])
+    validator._save_license_info(LICENSE_KEY, {"customer": "Test Customer", "token": issuer.token()})
+    app = make_app(tmp_path, validator)
+    app.initialize_license_system()
+    validator.stop_background_revalidation()
+    assert app.activated is True
+
+    validator.on_revoked = app.deactivate_license
+    validator._revalidate(LICENSE_KEY)
+    assert app.activated is False and app.license_key is None
+    assert stored_trial_data(app)["activated"] is False
+
+    # The next start stays on the trial: nothing cached, nothing activated on disk
+    restarted = devscan_pro.DevScanPro.__new__(devscan_pro.DevScanPro)
+    restarted.trial_store = devscan_pro.StateStore(app.license_file)
+    restarted.legacy_license_file = app.legacy_license_file
+    restarted.license_validator = make_validator(issuer.public_key)
+    restarted.initialize_license_system()
+    assert restarted.activated is False
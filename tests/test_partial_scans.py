@@ -0,0 +1,104 @@
+"""Category- and tool-scoped scans merged into the previous results"""
+import pytest
+
+import devscan_pro
+
+PREVIOUS = [
+    ("Git", "git version 2.39.5", "installed", "Version Control"),
+    ("Python 3", "Python 3.11.7", "installed", "Programming"),
+    ("Python (pyenv)", "3.11.7, 3.12.1", "installed", "Programming"),
+    ("Docker", "Not installed", "not_installed", "Containers"),
+]
+
+
+def test_merge_updates_rows_in_place():
+    updates = [("Python 3", "Python 3.12.1", "installed", "Programming")]
+    merged = devscan_pro.merge_results(PREVIOUS, updates)
+    assert [row[0] for row in merged] == [row[0] for row in PREVIOUS]
+    assert merged[1] == updates[0]
+    assert merged[2] == PREVIOUS[2]
+
+
+def test_merge_appends_new_tools():
+    updates = [("Podman", "podman version 4.3.1", "installed", "Containers")]
+    merged = devscan_pro.merge_results(PREVIOUS, updates)
+    assert merged[:-1] == PREVIOUS and merged[-1] == updates[0]
+
+
+def test_merge_drops_rows_gone_from_rescanned_category():
+    updates = [("Python 3", "Python 3.11.7", "installed", "Programming")]
+    merged = devscan_pro.merge_results(PREVIOUS, updates, categories=["Programming"])
+    assert [row[0] for row in merged] == ["Git", "Python 3", "Docker"]
+    # Without a category, a tool rescan never drops other rows
+    assert len(devscan_pro.merge_results(PREVIOUS, updates)) == len(PREVIOUS)
+
+
+def test_merge_does_not_mutate_input():
+    previous = list(PREVIOUS)
+    devscan_pro.merge_results(previous, [("Git", "git version 2.45.0", "installed", "Version Control")])
+    assert previous == PREVIOUS
+
+
+def test_select_tools_is_case_insensitive():
+    assert [tool[1] for tool in devscan_pro.select_tools(names=["git", "PYTHON 3"])] == ["Python 3", "Git"]
+    assert all(tool[2] == "Programming" for tool in devscan_pro.select_tools(["Programming"]))
+
+
+@pytest.mark.parametrize("categories, names, message", [
+    (["Programing"], None, "Unknown category: Programing"),
+    (None, ["gti"], "Unknown tool: gti"),
+    (["Programming"], ["Git"], "No tool named Git in Programming"),
+])
+def test_select_tools_rejects_unknown_names(categories, names, message):
+    with pytest.raises(ValueError, match=message):
+        devscan_pro.select_tools(categories, names)
+
+
+def test_headless_exits_2_on_typo(capsys):
+    assert devscan_pro.main(["--headless", "--tool", "gti", "--output", "/dev/null"]) == 2
+    assert "Valid tools:" in capsys.readouterr().err
+
+
+@pytest.fixture
+def plugins(tmp_path, monkeypatch):
+    """Plugin registry with Custom and Extra categories that record when they are imported"""
+    for category, name in (("Custom", "Widget"), ("Extra", "Gadget")):
+        (tmp_path / category).mkdir()
+        (tmp_path / category / "probes.py").write_text(
+            f"import pathlib\n"
+            f"pathlib.Path({str(tmp_path)!r}, 'imported-{category}').touch()\n"
+            f"PROBES = [{{'name': {name!r}, 'strategy': 'env', 'env': 'DEVSCAN_TEST_{name.upper()}'}}]\n")
+    registry = devscan_pro.ProbePluginRegistry(tmp_path)
+    registry._entry_points = []
+    monkeypatch.setattr(devscan_pro, "PROBE_PLUGINS", registry)
+    return lambda: sorted(path.name.split("-", 1)[1] for path in tmp_path.glob("imported-*"))
+
+
+def test_select_tools_only_imports_requested_plugin_categories(plugins):
+    assert [tool[1] for tool in devscan_pro.select_tools(["Custom"])] == ["Widget"]
+    assert plugins() == ["Custom"]
+    with pytest.raises(ValueError, match="Valid categories: .*Custom, .*Extra"):
+        devscan_pro.select_tools(["Cusotm"])
+    assert plugins() == ["Custom"]
+
+
+def test_select_tools_by_builtin_name_imports_no_plugins(plugins):
+    assert [tool[1] for tool in devscan_pro.select_tools(names=["git"])] == ["Git"]
+    assert plugins() == []
+
+
+def test_select_tools_by_plugin_name_imports_plugins(plugins):
+    assert [tool[1] for tool in devscan_pro.select_tools(names=["gadget"])] == ["Gadget"]
+    assert plugins() == ["Custom", "Extra"]
+    with pytest.raises(ValueError, match="Valid tools: .*Widget"):
+        devscan_pro.select_tools(names=["gizmo"])
+
+
+def test_select_tools_reports_empty_category(monkeypatch):
+    # A valid category without tools, e.g. a plugin category whose probes all failed to load
+    registry = devscan_pro.ProbePluginRegistry()
+    monkeypatch.setattr(registry, "categories", lambda: ["Internal"])
+    monkeypatch.setattr(registry, "tools", lambda categories=None: [])
+    monkeypatch.setattr(devscan_pro, "PROBE_PLUGINS", registry)
+    with pytest.raises(ValueError, match="No tools in Internal"):
+        devscan_pro.select_tools(["Internal"])
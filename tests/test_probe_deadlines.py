@@ -0,0 +1,75 @@
+"""Probe deadlines learned from the p99 of recorded probe durations"""
+import pytest
+
+import devscan_pro
+
+
+@pytest.fixture
+def history(tmp_path):
+    return devscan_pro.ScanHistory(tmp_path / "scan_history.json", max_samples=10)
+
+
+def record(history, name, durations):
+    for elapsed in durations:
+        history.record([], timings={name: elapsed})
+
+
+def test_percentile_needs_enough_samples(history):
+    record(history, "Git", [0.01] * 4)
+    assert history.timing_percentile("Git") is None
+    record(history, "Git", [0.5])
+    assert history.timing_percentile("Git") == 0.5
+    assert history.timing_percentile("Git", 50) == 0.01
+
+
+def test_percentile_uses_only_recent_samples(history):
+    record(history, "Git", [2.0] + [0.02] * 10)
+    assert history.timing_percentile("Git") == 0.02
+    # Timings survive a reload
+    assert devscan_pro.ScanHistory(history.history_file).timing_percentile("Git") == 0.02
+
+
+def test_deadline_learned_from_p99(history):
+    engine = devscan_pro.ProbeEngine(history=history, version_managers=False)
+    default = engine.default_timeout("version")
+    # No samples yet: the default timeout
+    assert engine.probe_deadline("Git") == default
+    record(history, "Git", [0.2] * 5)
+    assert engine.probe_deadline("Git") == pytest.approx(0.2 * engine.deadline_factor)
+    # Never below the minimum deadline, never above the default timeout
+    record(history, "Fast", [0.001] * 5)
+    assert engine.probe_deadline("Fast") == engine.min_deadline
+    record(history, "Slow", [60.0] * 5)
+    assert engine.probe_deadline("Slow") == default
+
+
+def test_learned_deadline_times_out_then_retries(history, make_engine):
+    record(history, "Sleeper", [0.05] * 5)
+    engine = make_engine(history=history)
+    # 0.5 s is past the 0.3 s learned deadline but within the 1.2 s retry budget
+    result = engine._timed_check("sleep 0.5; echo 1.0", "Sleeper", "System", "version")
+    assert result == ("1.0", "installed", "System")
+    assert engine.last_timings["Sleeper"] >= 0.5
+    engine.retry_factor = 0
+    assert engine._timed_check("sleep 0.5; echo 1.0", "Sleeper", "System", "version")[0] == "Timeout"
+
+
+def test_slow_probes_zero_is_not_ignored(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(devscan_pro, "APP_DATA_DIR", tmp_path)
+    assert devscan_pro.main(["--slow-probes", "0"]) == 0
+    assert capsys.readouterr().out.startswith("Tool")
+
+
+def test_slow_probes_rejects_negative(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        devscan_pro.parse_args(["--slow-probes", "-1"])
+    assert exit_info.value.code == 2
+    assert "must not be negative" in capsys.readouterr().err
+
+
+def test_slow_probe_report_includes_plugin_probes(history, make_engine):
+    record(history, "Git", [0.01] * 3)
+    record(history, "Plugin Tool", [0.4] * 3)
+    report = devscan_pro.format_slow_probe_report(make_engine(history=history), history)
+    rows = [line.split()[0:2] for line in report.splitlines()[2:]]
+    assert rows == [["Plugin", "Tool"], ["Git", "10ms"]]
@@ -0,0 +1,36 @@
+"""Probe output is read up to the first line and capped, chatty tools are stopped early"""
+import time
+
+import pytest
+
+import devscan_pro
+
+
+@pytest.fixture
+def engine(make_engine):
+    return make_engine(output_limit=1024, exit_grace=0.2)
+
+
+def test_first_non_empty_line(engine):
+    assert engine.run_probe("printf '\\n\\n  v2.0  \\nsecond\\n'", 5) == (0, "v2.0")
+
+
+def test_endless_output_is_cut_off(engine):
+    start = time.monotonic()
+    assert engine.run_probe("yes v1.0", 5) == (0, "v1.0")
+    assert time.monotonic() - start < 2
+
+
+def test_output_without_line_break_is_capped(engine):
+    returncode, line = engine.run_probe("head -c 1000000 /dev/zero | tr '\\0' a", 5)
+    assert returncode == 0 and line == "a" * 1024
+
+
+def test_tool_lingering_after_its_version_line(engine):
+    start = time.monotonic()
+    assert engine.run_probe("echo v3.0; sleep 30", 5) == (0, "v3.0")
+    assert time.monotonic() - start < engine.exit_grace + 1
+
+
+def test_failure_exit_code_is_kept(engine):
+    assert engine.run_probe("echo oops; exit 2", 5) == (2, "oops")
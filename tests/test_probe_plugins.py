@@ -0,0 +1,104 @@
+"""Custom probes from plugin modules, imported only when their category is scanned"""
+import logging
+
+import pytest
+
+import devscan_pro
+
+
+def write_plugin(probe_dir, category, module, probes):
+    directory = probe_dir / category
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{module}.py").write_text(
+        f"import pathlib\n"
+        f"pathlib.Path({str(probe_dir)!r}, 'imported-{category}-{module}').touch()\n"
+        f"PROBES = {probes!r}\n")
+
+
+def imported(probe_dir):
+    return sorted(path.name.split("-", 1)[1] for path in probe_dir.glob("imported-*"))
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setenv("DEVSCAN_TEST_WIDGET", "widget 2.5.1 (build 7)")
+    write_plugin(tmp_path, "Custom", "widgets", [
+        {"name": "Widget", "strategy": "env", "env": "DEVSCAN_TEST_WIDGET", "version_regex": r"(\d+\.\d+\.\d+)"},
+        {"name": "Shell", "strategy": "path", "command": "echo shell 1.0"},
+        {"name": "Broken"},
+        {"name": "Bad regex", "strategy": "env", "env": "HOME", "version_regex": "("},
+    ])
+    write_plugin(tmp_path, "Extra", "gadgets", [{"name": "Widget", "strategy": "file", "path": str(tmp_path / "v")}])
+    (tmp_path / "v").write_text("gadget widget 9\n")
+    registry = devscan_pro.ProbePluginRegistry(tmp_path)
+    registry._entry_points = []
+    return registry
+
+
+def test_categories_without_importing(registry, tmp_path):
+    assert registry.categories() == ["Custom", "Extra"]
+    assert imported(tmp_path) == []
+
+
+def test_only_requested_category_is_imported(registry, tmp_path):
+    tools = registry.tools(["Custom"])
+    assert [tool[1] for tool in tools] == ["Widget", "Shell"]
+    assert imported(tmp_path) == ["Custom-widgets"]
+    # A second request does not import the module again
+    (tmp_path / "imported-Custom-widgets").unlink()
+    assert registry.tools(["Custom"]) == tools
+    assert imported(tmp_path) == []
+    assert registry.loaded_tools() == tools
+
+
+def test_invalid_probes_are_skipped(registry, caplog):
+    with caplog.at_level(logging.WARNING, logger="devscan_pro"):
+        registry.tools(["Custom"])
+    assert "Broken" in caplog.text and "bad version_regex" in caplog.text
+
+
+def test_same_name_in_two_categories_is_rejected(registry, make_engine, caplog):
+    engine = make_engine(plugins=registry)
+    with caplog.at_level(logging.WARNING, logger="devscan_pro"):
+        tools = registry.tools()
+    assert [(tool[1], tool[2]) for tool in tools] == [("Widget", "Custom"), ("Shell", "Custom")]
+    assert "already defined in Custom" in caplog.text
+    results = engine.run_scan(tools, use_cache=False)
+    assert ("Widget", "2.5.1", "installed", "Custom") in results
+    assert ("Shell", "shell 1.0", "installed", "Custom") in results
+    # Rescanning the category cannot clobber another category's row of the same name
+    rescan = engine.run_scan(registry.tools(["Extra"]), use_cache=False)
+    merged = devscan_pro.merge_results(results, rescan, ["Extra"])
+    assert [row for row in merged if row[0] == "Widget"] == [("Widget", "2.5.1", "installed", "Custom")]
+
+
+def test_builtin_name_is_rejected(registry, tmp_path, caplog):
+    write_plugin(tmp_path, "Custom", "zz_git", [{"name": "Git", "strategy": "env", "env": "PATH"}])
+    with caplog.at_level(logging.WARNING, logger="devscan_pro"):
+        tools = registry.tools(["Custom"])
+    assert "Git" not in [tool[1] for tool in tools]
+    assert "already defined in the built-in catalog" in caplog.text
+
+
+def test_duplicate_name_in_one_category(registry, tmp_path, caplog):
+    write_plugin(tmp_path, "Custom", "zz_more", [{"name": "Widget", "strategy": "env", "env": "PATH"}])
+    with caplog.at_level(logging.WARNING, logger="devscan_pro"):
+        tools = registry.tools(["Custom"])
+    assert [tool[1] for tool in tools].count("Widget") == 1
+    assert "already defined" in caplog.text
+    assert registry.probe("Widget", "Custom", None, 5) == ("2.5.1", "installed", "Custom")
+
+
+def test_plugin_probe_uses_learned_deadline_and_usage(registry, tmp_path, make_engine):
+    write_plugin(tmp_path, "Slow", "sleepy", [{"name": "Sleepy", "strategy": "path",
+                                               "command": "sleep 0.5; echo sleepy 1.0"}])
+    history = devscan_pro.ScanHistory(tmp_path / "scan_history.json")
+    for _ in range(5):
+        history.record([], timings={"Sleepy": 0.05})
+    engine = make_engine(plugins=registry, history=history)
+    assert engine.probe_deadline("Sleepy") < 0.5
+    # Times out under the learned deadline, then succeeds on the longer retry
+    assert engine.run_scan(registry.tools(["Slow"]), use_cache=False) == [
+        ("Sleepy", "sleepy 1.0", "installed", "Slow")]
+    assert engine.last_timings["Sleepy"] >= 0.5
+    assert "Sleepy" in engine.last_usage
@@ -0,0 +1,86 @@
+"""Timeouts and cancellation take down a probe's whole process tree"""
+import threading
+import time
+
+import pytest
+
+import devscan_pro
+
+
+def alive(pid):
+    """Whether pid is running (zombies waiting for their reaper count as gone)"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
+
+
+def wait_gone(pid, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while alive(pid):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def tree_command(pid_file):
+    """A probe that starts a background child and then blocks"""
+    return f"sleep 30 & echo $! > {pid_file}; sleep 30"
+
+
+def read_pid(pid_file, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pid_file.exists() and pid_file.read_text().strip():
+            return int(pid_file.read_text())
+        time.sleep(0.02)
+    raise AssertionError("probe did not start")
+
+
+def test_timeout_kills_process_group(engine, tmp_path):
+    pid_file = tmp_path / "child.pid"
+    start = time.monotonic()
+    assert engine.check_tool(tree_command(pid_file), "Tree", timeout=0.3)[0] == "Timeout"
+    assert time.monotonic() - start < 2
+    assert wait_gone(read_pid(pid_file))
+    assert not engine._active
+
+
+def test_cancel_kills_running_probe(engine, tmp_path):
+    pid_file = tmp_path / "child.pid"
+    outcome = {}
+
+    def run():
+        try:
+            engine.run_probe(tree_command(pid_file), 30)
+        except devscan_pro.ScanCancelled:
+            outcome["cancelled"] = True
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    child = read_pid(pid_file)
+    engine.cancel()
+    thread.join(5)
+    assert not thread.is_alive() and outcome == {"cancelled": True}
+    assert wait_gone(child)
+
+
+def test_cancelled_engine_runs_no_more_probes(engine):
+    engine.cancel()
+    with pytest.raises(devscan_pro.ScanCancelled):
+        engine.run_probe("echo 1", 5)
+
+
+def test_cancel_while_lock_is_held_by_same_thread(engine):
+    # A signal handler calling cancel() interrupts the main thread, which may hold the lock
+    def interrupted():
+        with engine._active_lock:
+            engine.cancel()
+
+    thread = threading.Thread(target=interrupted, daemon=True)
+    thread.start()
+    thread.join(2)
+    assert not thread.is_alive()
+    assert engine.is_cancelled()
@@ -0,0 +1,39 @@
+"""Probe exit codes, deadlines and rusage accounting"""
+import os
+
+import pytest
+
+import devscan_pro
+
+
+@pytest.fixture(params=["pidfd", "polling"])
+def engine(request, make_engine, monkeypatch):
+    if request.param == "polling":
+        monkeypatch.delattr(os, "pidfd_open", raising=False)
+    return make_engine()
+
+
+def test_exit_code_and_usage(engine):
+    assert engine.run_probe("echo hello; exit 3", 5, usage_key="tool") == (3, "hello")
+    usage = engine.last_usage["tool"]
+    assert usage["cpu"] >= 0 and usage["max_rss_kb"] > 0 and usage["minor_faults"] > 0
+
+
+def test_timeout_kills_and_still_records_usage(engine):
+    assert engine.check_tool("sleep 5", "Sleeper", timeout=0.2)[0] == "Timeout"
+    assert "Sleeper" in engine.last_usage
+
+
+def test_peak_below_scanner_rss_is_an_upper_bound(engine):
+    engine.run_probe("true", 5, capture=False, usage_key="small")
+    assert engine.last_usage["small"]["rss_upper_bound"] is True
+
+    script = "x = bytearray(256 * 1024 * 1024)\nfor i in range(0, len(x), 4096): x[i] = 1\nprint('big 1.0')"
+    engine.run_probe(f"python3 -c \"{script}\"", 30, usage_key="big")
+    usage = engine.last_usage["big"]
+    assert usage["rss_upper_bound"] is False and usage["max_rss_kb"] >= 256 * 1024
+
+
+def test_probe_killed_by_signal(engine):
+    returncode, _ = engine.run_probe("kill -TERM $$", 5, capture=False)
+    assert returncode == -15
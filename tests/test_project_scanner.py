@@ -0,0 +1,73 @@
+"""Tools a source tree needs, inferred from its manifest files"""
+import json
+
+import pytest
+
+import devscan_pro
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    files = {
+        "package.json": "{}",
+        "backend/pyproject.toml": "[project]\n",
+        "backend/Dockerfile.dev": "FROM python\n",
+        "services/api/go.mod": "module api\n",
+        ".tool-versions": "rust 1.75.0\nnodejs 20.11.0 # pinned\nunknown 1\n",
+        # Ignored directories are not descended into
+        "node_modules/left-pad/package.json": "{}",
+        "build/Cargo.toml": "",
+    }
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    (root / ".git").mkdir()
+    return root
+
+
+def scan(root, cache_file):
+    # The tree is walked in parallel, so manifests come back in no particular order
+    required = devscan_pro.ProjectScanner(root, cache_file=cache_file).scan()
+    return {tool: sorted(paths) for tool, paths in required.items()}
+
+
+def test_required_tools_by_manifest(project, tmp_path):
+    assert scan(project, tmp_path / "cache.json") == {
+        "Node.js": [".tool-versions", "package.json"],
+        "npm": ["package.json"],
+        "Python 3": ["backend/pyproject.toml"],
+        "pip3": ["backend/pyproject.toml"],
+        "Docker": ["backend/Dockerfile.dev"],
+        "Go": ["services/api/go.mod"],
+        "Rust": [".tool-versions"],
+        "Git": [".git"],
+    }
+
+
+def test_required_tools_are_catalog_entries(project, tmp_path):
+    tools = devscan_pro.ProjectScanner(project, cache_file=tmp_path / "cache.json").required_tools()
+    assert all(tool in devscan_pro.TOOL_CATALOG for tool in tools)
+    assert {"Go", "Rust", "Git", "Docker"} <= {tool[1] for tool in tools}
+
+
+def test_manifest_cache_is_refreshed_on_change(project, tmp_path):
+    cache_file = tmp_path / "cache.json"
+    scan(project, cache_file)
+    cached = json.loads(cache_file.read_text())
+    assert cached[str(project / ".tool-versions")][2] == ["Rust", "Node.js"]
+
+    (project / ".tool-versions").write_text("golang 1.22.0\n")
+    assert scan(project, cache_file)["Go"] == [".tool-versions", "services/api/go.mod"]
+    assert "Rust" not in scan(project, cache_file)
+
+
+def test_cache_keeps_other_trees(project, tmp_path):
+    cache_file = tmp_path / "cache.json"
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "Gemfile").write_text("")
+    scan(other, cache_file)
+    scan(project, cache_file)
+    assert str(other / "Gemfile") in json.loads(cache_file.read_text())
@@ -0,0 +1,132 @@
+"""Local HTTP scan service: ETags and guarded rescans"""
+import http.client
+import socket
+import threading
+import time
+
+import pytest
+
+import devscan_pro
+import devscan_service
+
+RESULTS = [("Git", "git version 2.39.5", "installed", "Version Control"),
+           ("Docker", "Not installed", "not_installed", "Containers")]
+
+
+class FakeEngine:
+    def __init__(self):
+        self.last_timings = {}
+        self.last_usage = {}
+        self.scans = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def run_scan(self, tools, use_cache=True):
+        self.scans += 1
+        self.release.wait(5)
+        return list(RESULTS)
+
+
+@pytest.fixture
+def service(tmp_path):
+    history = devscan_pro.ScanHistory(tmp_path / "history.json")
+    service = devscan_service.ScanService(FakeEngine(), history, tools=[], port=0,
+                                          token_file=tmp_path / "token")
+    service.rescan(use_cache=True)
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    while service.server is None:
+        time.sleep(0.01)
+    yield service
+    service.shutdown()
+    thread.join(5)
+
+
+def request(service, method, path, headers=None):
+    connection = http.client.HTTPConnection("127.0.0.1", service.server.server_address[1], timeout=10)
+    connection.request(method, path, headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def test_conditional_get_returns_304(service):
+    response, body = request(service, "GET", "/results")
+    assert response.status == 200
+    etag = response.getheader("ETag")
+    assert etag.startswith('W/"') and b'"Git"' in body
+
+    response, body = request(service, "GET", "/results", {"If-None-Match": etag})
+    assert response.status == 304 and body == b""
+    assert response.getheader("ETag") == etag
+
+    # Unchanged tool results keep the same weak ETag across a rescan
+    service.rescan()
+    response, _ = request(service, "GET", "/results", {"If-None-Match": f'"other", {etag}'})
+    assert response.status == 304
+
+
+def test_rescan_requires_token(service):
+    scans = service.engine.scans
+    response, _ = request(service, "POST", "/rescan")
+    assert response.status == 403
+    response, _ = request(service, "POST", "/rescan", {devscan_service.ScanService.TOKEN_HEADER: "wrong"})
+    assert response.status == 403
+    assert service.engine.scans == scans
+
+    response, body = request(service, "POST", "/rescan", {devscan_service.ScanService.TOKEN_HEADER: service.token})
+    assert response.status == 200 and b'"tools"' in body
+    assert service.engine.scans == scans + 1
+
+
+def test_rescan_rejected_while_scanning(service):
+    service.engine.release.clear()
+    background = threading.Thread(target=service.rescan)
+    background.start()
+    while not service._scan_lock.locked():
+        time.sleep(0.01)
+    response, _ = request(service, "POST", "/rescan", {devscan_service.ScanService.TOKEN_HEADER: service.token})
+    assert response.status == 409
+    service.engine.release.set()
+    background.join(5)
+
+
+def test_token_file_is_private(service):
+    service.write_token()
+    assert service.token_file.read_text().strip() == service.token
+    assert service.token_file.stat().st_mode & 0o077 == 0
+
+
+def test_unix_socket_needs_no_token(tmp_path):
+    service = devscan_service.ScanService(FakeEngine(), devscan_pro.ScanHistory(tmp_path / "h.json"), tools=[],
+                                          socket_path=str(tmp_path / "scan.sock"))
+    assert service.token is None
+    assert service.authorized(None)
+
+
+def test_socket_path_must_not_be_a_regular_file(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+    service = devscan_service.ScanService(FakeEngine(), devscan_pro.ScanHistory(tmp_path / "h.json"), tools=[],
+                                          socket_path=str(path))
+    with pytest.raises(FileExistsError):
+        service.serve_forever()
+    assert path.read_text() == "keep me"
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    path = tmp_path / "scan.sock"
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(str(path))
+    stale.close()
+    service = devscan_service.ScanService(FakeEngine(), devscan_pro.ScanHistory(tmp_path / "h.json"), tools=[],
+                                          socket_path=str(path))
+    assert service.check_socket_path()
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    while service.server is None:
+        time.sleep(0.01)
+    service.shutdown()
+    thread.join(5)
+    assert not path.exists()
@@ -0,0 +1,26 @@
+"""Background scan scheduling with load back-off"""
+import devscan_pro
+import devscan_service
+
+
+def test_max_load_is_per_cpu(monkeypatch):
+    monkeypatch.setattr(devscan_pro.os, "cpu_count", lambda: 8)
+    scheduler = devscan_service.ScanScheduler(lambda: None, max_load=1.0)
+    monkeypatch.setattr(devscan_pro, "read_load_average", lambda: 6.0)
+    assert not scheduler.is_busy()
+    monkeypatch.setattr(devscan_pro, "read_load_average", lambda: 9.0)
+    assert scheduler.is_busy()
+    monkeypatch.setattr(devscan_pro, "read_load_average", lambda: None)
+    assert not scheduler.is_busy()
+
+
+def test_busy_machine_backs_off(monkeypatch):
+    delays = []
+    scheduler = devscan_service.ScanScheduler(lambda: scheduler.stop(), interval=10, jitter=0, max_backoff=4)
+    busy = iter([True, True, True, False])
+    monkeypatch.setattr(scheduler, "is_busy", lambda: next(busy))
+    monkeypatch.setattr(scheduler._stop_event, "wait", lambda delay: delays.append(delay) or scheduler._stop_event.is_set())
+    scheduler.run_forever()
+    # Doubling up to max_backoff while busy, back to the plain interval after a scan
+    assert delays == [10, 20, 40, 40, 10]
+    assert scheduler.backoff == 1
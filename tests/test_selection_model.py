@@ -0,0 +1,68 @@
+"""Selection state of the selective export dialog"""
+import devscan_pro
+
+RESULTS = [
+    ("Git", "git version 2.39.5", "installed", "Version Control"),
+    ("Python 3", "Python 3.11.7", "installed", "Programming"),
+    ("Docker", "Not installed", "not_installed", "Containers"),
+    ("Go", "Not installed", "not_installed", "Programming"),
+]
+
+
+def names(rows):
+    return [row[0] for row in rows]
+
+
+def test_rows_grouped_by_category_and_all_selected():
+    model = devscan_pro.SelectionModel(RESULTS)
+    assert names(model.rows) == ["Git", "Python 3", "Go", "Docker"]
+    assert model.count() == 4 and names(model.selected()) == names(model.rows)
+
+
+def test_filter_narrows_and_widens():
+    model = devscan_pro.SelectionModel(RESULTS)
+    assert [model.rows[i][0] for i in model.filter("pro")] == ["Python 3", "Go"]
+    assert [model.rows[i][0] for i in model.filter("PROGRAMMING go")] == []
+    assert [model.rows[i][0] for i in model.filter("pyth")] == ["Python 3"]
+    assert len(model.filter("")) == 4
+
+
+def test_bulk_actions_only_touch_the_view():
+    model = devscan_pro.SelectionModel(RESULTS)
+    model.filter("programming")
+    model.select_none()
+    assert names(model.selected()) == ["Git", "Docker"]
+    model.select_installed()
+    assert names(model.selected()) == ["Git", "Python 3", "Docker"]
+    model.filter("")
+    model.select_none()
+    assert model.count() == 0
+    model.select_all()
+    assert model.count() == 4
+
+
+def test_toggle():
+    model = devscan_pro.SelectionModel(RESULTS)
+    model.toggle(0)
+    assert not model.is_selected(0) and model.count() == 3
+    model.toggle(0)
+    assert model.is_selected(0)
+
+
+def test_thousands_of_rows():
+    results = [(f"tool-{i}", "1.0", "installed" if i % 2 else "not_installed", f"Category {i % 7}")
+               for i in range(5000)]
+    model = devscan_pro.SelectionModel(results)
+    model.filter("tool-49")
+    model.select_none()
+    # tool-49, tool-490..499 and tool-4900..4999
+    assert model.count() == 5000 - 111
+    model.filter("")
+    model.select_none()
+    model.select_installed()
+    assert model.count() == 2500
+
+
+def test_empty_results():
+    model = devscan_pro.SelectionModel([])
+    assert model.selected() == [] and model.count() == 0 and model.filter("x") == []
@@ -0,0 +1,74 @@
+"""Binary .dsps snapshots"""
+import pytest
+
+import devscan_pro
+
+RESULTS = [
+    ("Python 3", "Python 3.11.7", "installed", "Programming"),
+    ("Git", "git version 2.39.5", "installed", "Version Control"),
+    ("Java", 'openjdk version "21.0.2" 2024-01-16', "installed", "Programming"),
+    ("Docker", "Not installed", "not_installed", "Containers"),
+    ("Kernel Version", "6.1.0-18-amd64", "installed", "System"),
+    ("Leading zeros", "1.02.003", "installed", "System"),
+    ("Big number", "v99999999999999999999.1", "installed", "System"),
+    ("Unicode ✅", "версия 1.0 — ok", "installed", "Misc"),
+    ("Empty", "", "not_installed", "Misc"),
+]
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "lzma"])
+def test_round_trip(tmp_path, compression):
+    path = str(tmp_path / f"scan-{compression}.dsps")
+    metadata = {"hostname": "build-01", "system": "Ubuntu 24.04"}
+    devscan_pro.write_snapshot(path, RESULTS, metadata, compression=compression)
+    with devscan_pro.SnapshotReader(path) as reader:
+        assert reader.metadata == metadata
+        assert list(reader) == RESULTS
+    assert devscan_pro.load_results(path) == RESULTS
+
+
+def test_snapshot_is_smaller_than_json(tmp_path):
+    results = [(f"tool-{i}", f"tool-{i} version 1.{i % 7}.{i % 13}", "installed", f"Category {i % 5}")
+               for i in range(2000)]
+    path = tmp_path / "scan.dsps"
+    devscan_pro.write_snapshot(str(path), results, compression="none")
+    report = devscan_pro.build_json_report(results, "App", "1", "Vendor", "System")
+    assert path.stat().st_size < len(devscan_pro.json.dumps(report)) / 2
+    assert devscan_pro.load_results(str(path)) == results
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not.dsps"
+    path.write_bytes(b"{}")
+    with pytest.raises(ValueError):
+        devscan_pro.SnapshotReader(str(path))
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "lzma"])
+@pytest.mark.parametrize("keep", [7, 0.5], ids=["header", "half"])
+def test_truncated_snapshot_is_a_value_error(tmp_path, compression, keep):
+    path = tmp_path / "scan.dsps"
+    devscan_pro.write_snapshot(str(path), RESULTS * 50, {"hostname": "build-01"}, compression=compression)
+    data = path.read_bytes()
+    path.write_bytes(data[:keep if isinstance(keep, int) else int(len(data) * keep)])
+    with pytest.raises(ValueError, match="corrupt snapshot"):
+        devscan_pro.load_results(str(path))
+
+
+def test_garbled_strings_are_a_value_error(tmp_path):
+    path = tmp_path / "scan.dsps"
+    devscan_pro.write_snapshot(str(path), RESULTS, compression="none")
+    data = bytearray(path.read_bytes())
+    start = data.index("версия".encode("utf-8"))
+    data[start:start + 2] = b"\xff\xfe"
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="corrupt snapshot"):
+        devscan_pro.SnapshotReader(str(path))
+
+
+def test_diff_of_corrupt_snapshot_exits_2(tmp_path, capsys):
+    path = tmp_path / "scan.dsps"
+    devscan_pro.write_snapshot(str(path), RESULTS)
+    path.write_bytes(path.read_bytes()[:20])
+    assert devscan_pro.main(["--diff", str(path), str(path)]) == 2
+    assert "corrupt snapshot" in capsys.readouterr().err
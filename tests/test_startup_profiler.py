@@ -0,0 +1,53 @@
+"""Startup phase timings for --profile-startup"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import devscan_pro
+
+
+def test_nested_phases_and_report():
+    profiler = devscan_pro.StartupProfiler()
+    profiler.record("imports", devscan_pro._IMPORTS_STARTED, devscan_pro._IMPORTS_FINISHED)
+    with profiler.phase("init"):
+        with profiler.phase("widgets"):
+            time.sleep(0.01)
+    report = profiler.report()
+    phases = {phase["name"]: phase for phase in report["phases"]}
+    assert [phase["name"] for phase in report["phases"]] == ["imports", "init", "widgets"]
+    assert phases["init"]["depth"] == 0 and phases["widgets"]["depth"] == 1
+    assert phases["init"]["duration_ms"] >= phases["widgets"]["duration_ms"] >= 10
+    assert phases["imports"]["start_ms"] == 0
+    # Values are rounded to 0.01 ms
+    assert report["total_ms"] >= phases["init"]["start_ms"] + phases["init"]["duration_ms"] - 0.02
+    json.dumps(report)
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = devscan_pro.StartupProfiler(enabled=False)
+    with profiler.phase("init"):
+        pass
+    profiler.record("imports", 0, 1)
+    assert profiler.report()["phases"] == []
+
+
+def test_unmatched_end_is_ignored():
+    profiler = devscan_pro.StartupProfiler()
+    profiler.end("never started")
+    assert profiler.phases == []
+
+
+def test_process_age():
+    age = devscan_pro.process_age()
+    assert age is None or 0 <= age < 24 * 3600
+
+
+def test_service_and_network_modules_are_not_imported_at_startup():
+    code = ("import sys, devscan_pro; "
+            "print(sorted(m for m in ('requests', 'devscan_service', 'http.server', 'socketserver')"
+            " if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            env=dict(os.environ, PYTHONPATH=os.path.dirname(devscan_pro.__file__))).stdout
+    assert output.strip() == "[]"
@@ -0,0 +1,70 @@
+"""Crash-safe JSON state shared between processes"""
+import json
+import multiprocessing
+
+import devscan_pro
+
+INCREMENTS = 200
+
+
+def _count(path, barrier):
+    store = devscan_pro.StateStore(path, flush_delay=0)
+    barrier.wait()
+    for _ in range(INCREMENTS):
+        store.increment("export_count")
+    store.close()
+
+
+def test_increments_from_two_processes(tmp_path):
+    path = tmp_path / "state.json"
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(2)
+    workers = [context.Process(target=_count, args=(path, barrier)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(30)
+        assert worker.exitcode == 0
+    assert json.loads(path.read_text())["export_count"] == 2 * INCREMENTS
+
+
+def test_batched_writes_keep_other_processes_keys(tmp_path):
+    path = tmp_path / "state.json"
+    first = devscan_pro.StateStore(path, flush_delay=60)
+    second = devscan_pro.StateStore(path, flush_delay=0)
+    first.update({"activated": True})
+    first.increment("export_count", 2)
+    second.update({"license_key": "KEY"})
+    second.increment("export_count")
+    first.flush()
+    assert json.loads(path.read_text()) == {"activated": True, "license_key": "KEY", "export_count": 3}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_clear_removes_file(tmp_path):
+    path = tmp_path / "state.json"
+    store = devscan_pro.StateStore(path, flush_delay=0)
+    store.update({"a": 1})
+    store.clear()
+    assert not path.exists()
+    assert store.get("a") is None
+
+
+def test_close_drops_exit_hook(tmp_path, monkeypatch):
+    hooks = []
+    monkeypatch.setattr(devscan_pro.atexit, "register", hooks.append)
+    monkeypatch.setattr(devscan_pro.atexit, "unregister", hooks.remove)
+    stores = [devscan_pro.StateStore(tmp_path / f"state-{i}.json") for i in range(3)]
+    assert len(hooks) == 3
+    for store in stores:
+        store.close()
+    assert hooks == []
+
+
+def test_clear_survives_unwritable_lock(tmp_path, caplog):
+    store = devscan_pro.StateStore(tmp_path / "state.json", flush_delay=0)
+    store.update({"key": 1})
+    (tmp_path / "blocker").write_text("")
+    store.lock_path = tmp_path / "blocker" / "state.lock"
+    store.clear()
+    assert store.data == {} and "Could not remove" in caplog.text
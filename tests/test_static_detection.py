@@ -0,0 +1,69 @@
+"""Versions read from files must match what running the tool reports"""
+import os
+import shutil
+
+import pytest
+
+import devscan_pro
+
+
+def scan(make_engine, tools, static):
+    return make_engine(static=static).run_scan(tools, use_cache=False)
+
+
+def make_jdk(root, version):
+    """A JDK whose java prints the version like the real one, on stderr"""
+    (root / "bin").mkdir(parents=True)
+    (root / "release").write_text(f'IMPLEMENTOR="Test"\nJAVA_VERSION="{version}"\n')
+    java = root / "bin" / "java"
+    java.write_text(f'#!/bin/sh\necho \'java version "{version}"\' >&2\n')
+    java.chmod(0o755)
+    return root
+
+
+@pytest.fixture
+def java_on_path(tmp_path, monkeypatch):
+    jdk = make_jdk(tmp_path / "jdk-17", "17.0.2")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    # Like /usr/bin/java -> /etc/alternatives/java -> the JDK
+    (bin_dir / "java").symlink_to(jdk / "bin" / "java")
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}/usr/bin{os.pathsep}/bin")
+    return jdk
+
+
+JAVA = [tool for tool in devscan_pro.TOOL_CATALOG if tool[1] == "Java"]
+
+
+def test_java_static_matches_probe(make_engine, java_on_path):
+    assert scan(make_engine, JAVA, static=True) == scan(make_engine, JAVA, static=False)
+    assert devscan_pro.StaticVersionDetector().detect("Java", JAVA[0][0]) == 'java version "17.0.2"'
+
+
+def test_java_ignores_java_home_of_another_jdk(make_engine, tmp_path, java_on_path, monkeypatch):
+    monkeypatch.setenv("JAVA_HOME", str(make_jdk(tmp_path / "jdk-11", "11.0.20")))
+    assert scan(make_engine, JAVA, static=True) == scan(make_engine, JAVA, static=False)
+
+
+def test_java_without_release_falls_back_to_probe(tmp_path, java_on_path, monkeypatch):
+    (java_on_path / "release").unlink()
+    monkeypatch.setenv("JAVA_HOME", str(make_jdk(tmp_path / "jdk-11", "11.0.20")))
+    assert devscan_pro.StaticVersionDetector().detect("Java", JAVA[0][0]) is None
+
+
+def test_java_home_used_when_it_is_the_java_on_path(tmp_path, monkeypatch):
+    # A JDK 8 layout: java under jre/bin, release file in the JDK root
+    jdk = tmp_path / "jdk8"
+    make_jdk(jdk / "jre", "1.8.0_392")
+    (jdk / "jre" / "release").rename(jdk / "release")
+    monkeypatch.setenv("PATH", f"{jdk / 'jre' / 'bin'}{os.pathsep}/usr/bin{os.pathsep}/bin")
+    monkeypatch.setenv("JAVA_HOME", str(jdk))
+    assert devscan_pro.StaticVersionDetector().detect("Java", JAVA[0][0]) == 'java version "1.8.0_392"'
+
+
+@pytest.mark.skipif(not shutil.which("python3"), reason="no python3 on PATH")
+def test_python_static_matches_probe(make_engine):
+    tools = [("python3 --version", "Python 3", "Programming", "version")]
+    static = scan(make_engine, tools, static=True)
+    assert static == scan(make_engine, tools, static=False)
+    assert devscan_pro.StaticVersionDetector().detect("Python 3", "python3 --version") == static[0][1]
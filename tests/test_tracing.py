@@ -0,0 +1,57 @@
+"""Chrome trace spans and per-probe resource usage"""
+import json
+
+import pytest
+
+import devscan_pro
+
+TOOLS = [("echo v1.0", "Echo", "System", "version"), ("sh", "Shell", "System", "which")]
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = devscan_pro.Tracer()
+    tracer.enabled = True
+    monkeypatch.setattr(devscan_pro, "TRACER", tracer)
+    return tracer
+
+
+def test_scan_and_probe_spans(make_engine, tracer):
+    make_engine().run_scan(TOOLS, use_cache=False)
+    scan = next(event for event in tracer.events if event["name"] == "scan")
+    probes = [event for event in tracer.events if event["name"] == "probe"]
+    assert scan["args"] == {"tools": 2}
+    assert sorted(probe["args"]["tool"] for probe in probes) == ["Echo", "Shell"]
+    for probe in probes:
+        assert scan["ts"] <= probe["ts"] and probe["ts"] + probe["dur"] <= scan["ts"] + scan["dur"] + 1
+
+
+def test_trace_file_format(tmp_path, tracer):
+    with tracer.span("export", "export", rows=3):
+        pass
+    path = tmp_path / "trace.json"
+    tracer.save(str(path))
+    trace = json.loads(path.read_text())
+    events = trace["traceEvents"]
+    assert {event["ph"] for event in events} == {"M", "X"}
+    span = [event for event in events if event["ph"] == "X"][0]
+    assert (span["name"], span["cat"], span["args"]) == ("export", "export", {"rows": 3})
+    assert any(event["ph"] == "M" and event["tid"] == span["tid"] for event in events)
+
+
+def test_disabled_tracer_records_nothing(make_engine, monkeypatch):
+    tracer = devscan_pro.Tracer()
+    monkeypatch.setattr(devscan_pro, "TRACER", tracer)
+    assert tracer.span("anything") is devscan_pro._NO_SPAN
+    make_engine().run_scan(TOOLS, use_cache=False)
+    assert tracer.events == []
+
+
+def test_probe_usage_is_kept_in_history(make_engine, tmp_path):
+    engine = make_engine()
+    results = engine.run_scan(TOOLS, use_cache=False)
+    assert set(engine.last_usage) == {"Echo", "Shell"}
+    history = devscan_pro.ScanHistory(tmp_path / "history.json")
+    history.record(results, engine.last_timings, engine.last_usage)
+    usage = devscan_pro.ScanHistory(tmp_path / "history.json").usage
+    assert usage["Echo"]["minor_faults"] > 0 and usage["Echo"]["cpu"] >= 0
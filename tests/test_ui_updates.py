@@ -0,0 +1,65 @@
+"""Scan results pushed from worker threads reach the Tk loop in frame-limited batches"""
+import threading
+
+import devscan_pro
+
+
+class FakeRoot:
+    """Records after() callbacks instead of running a Tk event loop"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append((delay, callback))
+
+    def run_pending(self):
+        pending, self.scheduled = self.scheduled, []
+        for _, callback in pending:
+            callback()
+
+
+def test_pushes_are_coalesced_into_one_callback():
+    root, batches = FakeRoot(), []
+    updates = devscan_pro.UIUpdateCoalescer(root, batches.append)
+    for i in range(100):
+        updates.push(i)
+    assert len(root.scheduled) == 1
+    root.run_pending()
+    assert batches == [list(range(100))]
+
+
+def test_next_flush_waits_for_the_frame_interval():
+    root, batches = FakeRoot(), []
+    updates = devscan_pro.UIUpdateCoalescer(root, batches.append, interval_ms=1000)
+    updates.push("a")
+    root.run_pending()
+    updates.push("b")
+    delay, _ = root.scheduled[0]
+    assert 900 < delay <= 1000
+    root.run_pending()
+    assert batches == [["a"], ["b"]]
+
+
+def test_pushes_from_many_threads():
+    root, batches = FakeRoot(), []
+    updates = devscan_pro.UIUpdateCoalescer(root, batches.append)
+    threads = [threading.Thread(target=lambda n=n: [updates.push((n, i)) for i in range(500)]) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    root.run_pending()
+    assert sorted(item for batch in batches for item in batch) == sorted((n, i) for n in range(8) for i in range(500))
+
+
+def test_discard_and_flush():
+    root, batches = FakeRoot(), []
+    updates = devscan_pro.UIUpdateCoalescer(root, batches.append)
+    updates.push("stale")
+    updates.discard()
+    root.run_pending()
+    assert batches == []
+    updates.push("now")
+    updates.flush()
+    assert batches == [["now"]]
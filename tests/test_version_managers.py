@@ -0,0 +1,37 @@
+"""Side-by-side toolchain versions from pyenv, sdkman and friends"""
+import pytest
+
+import devscan_pro
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    for _, env_var, default_root, _, _ in devscan_pro.VersionManagerIndex.MANAGERS:
+        monkeypatch.setenv(env_var, str(tmp_path / default_root))
+    versions = tmp_path / ".pyenv" / "versions"
+    (versions / "3.11.7" / "envs" / "project").mkdir(parents=True)
+    (versions / "3.12.1").mkdir()
+    # pyenv-virtualenv links each virtualenv next to the interpreters
+    (versions / "project").symlink_to(versions / "3.11.7" / "envs" / "project")
+    (tmp_path / ".sdkman" / "candidates" / "maven" / "3.9.6").mkdir(parents=True)
+    (tmp_path / ".sdkman" / "candidates" / "java" / "21.0.2").mkdir(parents=True)
+    return devscan_pro.VersionManagerIndex(tmp_path / "cache.json")
+
+
+def test_virtualenv_symlinks_are_not_versions(index):
+    assert index.index()["Python"] == [("pyenv", ["3.11.7", "3.12.1"])]
+
+
+def test_rows_limited_to_scanned_tools(index):
+    # Java was not scanned; maven has no catalog entry and follows its (complete) category
+    names = {row[0] for row in index.results({"Programming"}, {"Python 3"})}
+    assert names == {"Python (pyenv)", "maven (sdkman)"}
+
+    names = [row[0] for row in index.results(set(), {"Python 3"})]
+    assert names == ["Python (pyenv)"]
+    assert index.results(set(), {"Git"}) == []
+
+
+def test_full_scan_keeps_unlisted_tools(index):
+    names = {row[0] for row in index.results({"Programming"}, {"Python", "Java"})}
+    assert names == {"Python (pyenv)", "Java (sdkman)", "maven (sdkman)"}